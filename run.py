@@ -10,6 +10,11 @@ load_dotenv()
 SCRIPTS = [
     "scripts/boot.py",
     "scripts/init_database.py",
+    "src/analysis/coefficients.py",
+    "src/modeling/batch_glm.py",
+    "src/modeling/features.py",
+    "src/modeling/forecast.py",
+    "src/analysis/dashboard_panel.py",
 ]
 
 def run_all():
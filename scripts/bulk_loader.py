@@ -0,0 +1,196 @@
+# scripts/bulk_loader.py
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+from sqlalchemy import inspect, text
+
+"""
+DataFrame → DB 테이블 대량 적재 유틸리티
+- 'multi'  : chunk 단위 DBAPI executemany (모든 DB)
+             PyMySQL은 이를 multi-row INSERT ... VALUES (...), (...) 문으로 묶어 전송하고,
+             SQLite/DuckDB는 준비된 문장 하나를 재사용하므로 SQLAlchemy 문장 컴파일 비용이 없음
+- 'infile' : 임시 CSV 파일을 만든 뒤 LOAD DATA LOCAL INFILE (MySQL/MariaDB 전용,
+             엔진 생성 시 connect_args={'local_infile': True} 및 서버 local_infile=ON 필요)
+- 'register': DataFrame을 DuckDB에 뷰로 등록(Arrow, 복사 없음)하고 INSERT ... SELECT (DuckDB 전용)
+- method를 주지 않으면 DuckDB는 'register', 그 외는 'multi'
+- 테이블마다 한 트랜잭션 안에서 DELETE + 적재를 수행하고,
+  FK/UNIQUE 검사는 적재가 끝날 때까지 미루며, 보조 인덱스는 적재 후 다시 생성
+"""
+
+# executemany 한 번에 넘길 행 수 (PyMySQL은 이 안에서 max_allowed_packet에 맞게 다시 나눔)
+DEFAULT_CHUNKSIZE = 50000
+
+_PLACEHOLDERS = {
+    'qmark':    lambda i: "?",
+    'format':   lambda i: "%s",
+    'pyformat': lambda i: "%s",
+    'numeric':  lambda i: f":{i + 1}",
+    'numeric_dollar': lambda i: f"${i + 1}",
+}
+
+
+def _insert_executemany(pd_table, conn, keys, data_iter):
+    """
+    DataFrame.to_sql(method=...)용 콜백: chunk 하나를 DBAPI executemany로 한 번에 INSERT합니다.
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    placeholder = _PLACEHOLDERS[conn.dialect.paramstyle]
+    sql = (
+        f"INSERT INTO {quote(pd_table.name)} ({', '.join(quote(k) for k in keys)}) "
+        f"VALUES ({', '.join(placeholder(i) for i in range(len(keys)))})"
+    )
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        cursor.executemany(sql, list(data_iter))
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def _deferred_checks(conn):
+    """
+    트랜잭션 안에서 FK/UNIQUE 검사를 적재가 끝날 때까지 미룹니다.
+    """
+    dialect = conn.dialect.name
+    if dialect == 'mysql':
+        conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
+        conn.execute(text("SET UNIQUE_CHECKS=0;"))
+        try:
+            yield
+        finally:
+            conn.execute(text("SET UNIQUE_CHECKS=1;"))
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
+    elif dialect == 'sqlite':
+        # 커밋 시점에만 FK 검사
+        conn.execute(text("PRAGMA defer_foreign_keys=ON;"))
+        yield
+    else:
+        yield
+
+
+def _droppable_indexes(engine, table):
+    """
+    적재 전에 지웠다가 다시 만들 보조 인덱스 목록을 반환합니다.
+    - PK와 FK가 사용하는 인덱스(MySQL은 FK 컬럼에 인덱스가 필수)는 제외
+    - 인덱스 반영 비용이 큰 MySQL/SQLite만 대상 (DuckDB 등은 reflection 지원이 제한적)
+    """
+    if engine.dialect.name not in ('mysql', 'sqlite'):
+        return []
+    insp = inspect(engine)
+    fk_cols = [tuple(fk['constrained_columns']) for fk in insp.get_foreign_keys(table)]
+    indexes = []
+    for idx in insp.get_indexes(table):
+        cols = tuple(idx['column_names'])
+        # 이름 없는 인덱스나 표현식 인덱스는 다시 만들 수 없으므로 그대로 둠
+        if not idx.get('name') or None in cols:
+            continue
+        if any(cols[:len(fk)] == fk for fk in fk_cols):
+            continue
+        indexes.append(idx)
+    return indexes
+
+
+def _drop_indexes(engine, table, indexes):
+    with engine.begin() as conn:
+        for idx in indexes:
+            if engine.dialect.name == 'mysql':
+                conn.execute(text(f"ALTER TABLE {table} DROP INDEX {idx['name']};"))
+            else:
+                conn.execute(text(f"DROP INDEX IF EXISTS {idx['name']};"))
+
+
+def _create_indexes(engine, table, indexes):
+    # SQLite는 여러 커넥션이 동시에 DDL을 실행하면 스키마 변경이 늦게 보일 수 있어 IF NOT EXISTS 사용
+    if_not_exists = "" if engine.dialect.name == 'mysql' else "IF NOT EXISTS "
+    with engine.begin() as conn:
+        for idx in indexes:
+            unique = "UNIQUE " if idx.get('unique') else ""
+            cols = ", ".join(idx['column_names'])
+            conn.execute(text(f"CREATE {unique}INDEX {if_not_exists}{idx['name']} ON {table} ({cols});"))
+
+
+def _load_infile(conn, df, table):
+    """
+    DataFrame을 임시 CSV로 쓰고 LOAD DATA LOCAL INFILE로 적재합니다 (MySQL/MariaDB).
+    """
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        df.to_csv(path, index=False, header=False, na_rep="\\N", lineterminator="\n")
+        cols = ", ".join(f"`{c}`" for c in df.columns)
+        conn.execute(text(
+            f"LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}' INTO TABLE {table} "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '\\n' ({cols});"
+        ))
+    finally:
+        os.remove(path)
+
+
+def _load_registered(conn, df, table):
+    """
+    DataFrame을 DuckDB 커넥션에 등록하고 INSERT ... SELECT로 한 번에 적재합니다.
+    """
+    duck = conn.connection.driver_connection
+    view = f"__bulk_{table}"
+    cols = ", ".join(f'"{c}"' for c in df.columns)
+    duck.register(view, df)
+    try:
+        duck.execute(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {view}")
+    finally:
+        duck.unregister(view)
+
+
+def default_method(dialect):
+    return 'register' if dialect == 'duckdb' else 'multi'
+
+
+def bulk_load(df, table, engine, method=None, chunksize=None, replace=True, defer_indexes=True):
+    """
+    DataFrame을 테이블에 대량 적재하고 적재한 행 수를 반환합니다.
+    - method: 'multi'(chunk 단위 executemany), 'infile'(LOAD DATA LOCAL INFILE, MySQL 전용),
+      'register'(DataFrame 등록 후 INSERT ... SELECT, DuckDB 전용), None이면 DB별 기본값
+    - chunksize: executemany 한 번에 보낼 행 수 (기본: DEFAULT_CHUNKSIZE)
+    - replace: True면 같은 트랜잭션 안에서 기존 행을 DELETE 후 적재
+    - defer_indexes: True면 보조 인덱스를 적재 전에 지우고 적재 후 다시 생성
+      (MySQL에서 인덱스 DDL은 암묵적 커밋이 일어나므로 데이터 트랜잭션 바깥에서 수행)
+    """
+    dialect = engine.dialect.name
+    method = method or default_method(dialect)
+    if method == 'infile' and dialect != 'mysql':
+        raise ValueError(f"method='infile' is only supported for MySQL/MariaDB, not {dialect}")
+    if method == 'register' and dialect != 'duckdb':
+        raise ValueError(f"method='register' is only supported for DuckDB, not {dialect}")
+    if method not in ('multi', 'infile', 'register'):
+        raise ValueError(f"Unknown bulk load method: {method}")
+
+    indexes = _droppable_indexes(engine, table) if defer_indexes else []
+    if indexes:
+        _drop_indexes(engine, table, indexes)
+    try:
+        with engine.begin() as conn:
+            with _deferred_checks(conn):
+                if replace:
+                    conn.execute(text(f"DELETE FROM {table};"))
+                if len(df) == 0:
+                    pass
+                elif method == 'infile':
+                    _load_infile(conn, df, table)
+                elif method == 'register':
+                    _load_registered(conn, df, table)
+                else:
+                    df.to_sql(
+                        table, conn,
+                        if_exists="append",
+                        index=False,
+                        method=_insert_executemany,
+                        chunksize=chunksize or DEFAULT_CHUNKSIZE,
+                    )
+    finally:
+        if indexes:
+            _create_indexes(engine, table, indexes)
+    return len(df)
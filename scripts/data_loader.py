@@ -1,10 +1,18 @@
 # scripts/data_loader.py
 
 import os
+import re
 import sys
+import hashlib
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from glob import escape as glob_escape
 import yaml
 import pandas as pd
 from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
 
 # boot.py를 import하여, init_project_path()가 자동 실행되도록 한다
 import scripts.boot
@@ -14,6 +22,23 @@ from scripts.boot import find_project_root
 BASE_DIR = find_project_root()
 CONFIG_PATH = BASE_DIR / "config" / "data_paths.yaml"
 
+# 원본 파일 옆에 생성되는 캐시 폴더 이름 (예: data/raw/.cache/)
+CACHE_DIRNAME = ".cache"
+
+# 프로세스 내 메모리 캐시 상한 (바이트). 환경변수 DUST_MEMO_MAX_MB로 조정 가능
+MEMO_MAX_BYTES = int(os.getenv("DUST_MEMO_MAX_MB", "512")) * 1024 * 1024
+
+# load_schema()가 xlsx/csv에서 dtype 추정에 사용하는 앞부분 표본 행 수
+SCHEMA_SAMPLE_ROWS = 200
+
+# pyarrow가 없으면 Parquet 캐시 대신 pickle 캐시만 사용
+try:
+    import pyarrow  # noqa: F401
+    import pyarrow.parquet
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
 # YAML config 로드
 def _load_config() -> dict:
     if not CONFIG_PATH.exists():
@@ -23,11 +48,10 @@ def _load_config() -> dict:
 
 _cfg = _load_config()
 
-def load_data(name: str, section: str = "raw") -> pd.DataFrame:
+
+def _resolve_path(name: str, section: str) -> Path:
     """
-    config/data_paths.yaml에서 data.<section>.<name> 키로 지정된 경로를 읽어서 DataFrame으로 반환합니다.
-    - name: data.<section>에 정의된 키 (예: 'pm10_processed_v1', 'reference_date_mapping' 등)
-    - section: 'raw', 'processed', 'reference' 중 하나
+    data.<section>.<name> 키를 실제 파일 경로로 변환합니다.
     """
     try:
         path_str = _cfg["data"][section][name]
@@ -40,16 +64,420 @@ def load_data(name: str, section: str = "raw") -> pd.DataFrame:
     if not os.path.splitext(full_path.name)[1]:
         full_path = full_path.with_suffix(".csv")
 
-    suffix = full_path.suffix.lower()
     if not full_path.exists():
         raise FileNotFoundError(f"Data file not found: {full_path}")
+    return full_path
 
-    # 확장자별로 읽기
+
+def _fingerprint(path: Path) -> str:
+    """
+    원본 파일의 (경로, 수정시각, 크기)로 캐시 키를 만듭니다.
+    - 파일이 바뀌면 mtime/size가 달라지므로 새 키가 생성되어 캐시가 자동으로 재생성됩니다.
+    """
+    stat = path.stat()
+    raw = f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_source(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    확장자별로 원본 파일을 읽습니다.
+    """
+    suffix = path.suffix.lower()
     if suffix in (".xls", ".xlsx"):
-        return pd.read_excel(full_path)
+        df = pd.read_excel(path)
     elif suffix == ".csv":
-        return pd.read_csv(full_path)
+        df = pd.read_csv(path)
     elif suffix == ".parquet":
-        return pd.read_parquet(full_path)
+        return pd.read_parquet(path, columns=columns)
+    else:
+        raise ValueError(f"Unsupported file extension: {suffix}")
+    return df[columns] if columns is not None else df
+
+
+def _cache_paths(path: Path, key: str) -> List[Path]:
+    # 확장자까지 포함한 원본 이름 사용 (foo.xlsx와 foo.csv가 서로의 캐시를 지우지 않도록)
+    cache_dir = path.parent / CACHE_DIRNAME
+    return [
+        cache_dir / f"{path.name}.{key}.parquet",
+        cache_dir / f"{path.name}.{key}.pkl",
+    ]
+
+
+def _stale_cache_files(path: Path, keep: List[Path]) -> List[Path]:
+    """
+    같은 원본의 이전 캐시 파일 목록 (<파일 이름>.<16자리 키>.parquet|pkl 형식만, 작성 중인 .tmp 제외)
+    - 확장자 없이 <stem>.<키>로 저장하던 이전 형식의 캐시도 함께 정리
+    """
+    pattern = re.compile(
+        rf"{re.escape(path.stem)}(?:{re.escape(path.suffix)})?\.[0-9a-f]{{16}}\.(parquet|pkl)"
+    )
+    cache_dir = path.parent / CACHE_DIRNAME
+    return [
+        p for p in cache_dir.glob(f"{glob_escape(path.stem)}.*")
+        if pattern.fullmatch(p.name) and p not in keep
+    ]
+
+
+def _read_cache(path: Path, key: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    유효한 캐시가 있으면 읽어서 반환하고, 없으면 None을 반환합니다.
+    - Parquet 캐시는 columns= 로 필요한 컬럼만 읽습니다 (column projection).
+    """
+    parquet_path, pickle_path = _cache_paths(path, key)
+    if _HAS_PYARROW and parquet_path.exists():
+        return pd.read_parquet(parquet_path, columns=columns)
+    if pickle_path.exists():
+        df = pd.read_pickle(pickle_path)
+        return df[columns] if columns is not None else df
+    return None
+
+
+def _write_cache(path: Path, key: str, df: pd.DataFrame) -> None:
+    """
+    원본을 읽은 결과를 캐시에 저장하고, 같은 원본의 오래된 캐시 파일은 삭제합니다.
+    - 혼합 타입 object 컬럼처럼 Arrow로 표현할 수 없는 경우 pickle로 대신 저장합니다.
+    - 캐시 저장 실패는 경고만 남기고 무시합니다 (원본 읽기 결과는 그대로 사용).
+    """
+    parquet_path, pickle_path = _cache_paths(path, key)
+    cache_dir = parquet_path.parent
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in _stale_cache_files(path, [parquet_path, pickle_path]):
+            stale.unlink(missing_ok=True)
+
+        if _HAS_PYARROW:
+            tmp = parquet_path.with_suffix(".parquet.tmp")
+            try:
+                df.to_parquet(tmp, index=False)
+                os.replace(tmp, parquet_path)
+                return
+            except (pyarrow.ArrowException, TypeError, ValueError):
+                if tmp.exists():
+                    tmp.unlink()
+
+        tmp = pickle_path.with_suffix(".pkl.tmp")
+        df.to_pickle(tmp)
+        os.replace(tmp, pickle_path)
+    except OSError as e:
+        warnings.warn(f"Failed to write cache for {path}: {e}")
+
+
+# ---------------------------------------------------------------------------
+# 프로세스 내 LRU 메모리 캐시
+# - 키: (section, name, 원본 fingerprint) → 원본이 바뀌면 자동으로 새 키가 됨
+# - 저장된 DataFrame은 호출자에게 직접 넘기지 않고 copy-on-write 사본으로 전달
+# ---------------------------------------------------------------------------
+_memo: "OrderedDict[Tuple[str, str, str], Tuple[pd.DataFrame, int]]" = OrderedDict()
+_memo_bytes = 0
+_memo_lock = threading.Lock()
+_inflight: dict = {}
+_schema_memo: dict = {}
+
+
+def _copy_on_write_enabled() -> bool:
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def _share(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    캐시에 보관 중인 DataFrame을 호출자에게 넘길 사본을 만듭니다.
+    - Copy-on-Write가 켜져 있으면 얕은 복사만 하고, 수정 시점에만 실제 복사가 일어남
+    - 아니면 깊은 복사 (파싱보다 훨씬 저렴한 메모리 복사)
+    """
+    return df.copy(deep=not _copy_on_write_enabled())
+
+
+def _memo_get(key: Tuple[str, str, str]) -> Optional[pd.DataFrame]:
+    with _memo_lock:
+        entry = _memo.get(key)
+        if entry is None:
+            return None
+        _memo.move_to_end(key)
+        return entry[0]
+
+
+def _memo_put(key: Tuple[str, str, str], df: pd.DataFrame) -> None:
+    global _memo_bytes
+    size = int(df.memory_usage(deep=True).sum())
+    if size > MEMO_MAX_BYTES:
+        return
+    with _memo_lock:
+        # 같은 (section, name)의 이전 fingerprint 항목은 제거
+        for old in [k for k in _memo if k[:2] == key[:2] and k != key]:
+            _memo_bytes -= _memo.pop(old)[1]
+        if key in _memo:
+            _memo_bytes -= _memo.pop(key)[1]
+        _memo[key] = (df, size)
+        _memo_bytes += size
+        while _memo_bytes > MEMO_MAX_BYTES:
+            _, (_, evicted) = _memo.popitem(last=False)
+            _memo_bytes -= evicted
+
+
+def clear_cache() -> None:
+    """
+    프로세스 내 메모리 캐시를 비웁니다 (디스크의 .cache/ 파일은 유지).
+    """
+    global _memo_bytes
+    with _memo_lock:
+        _memo.clear()
+        _memo_bytes = 0
+
+
+def load_data(
+    name: str,
+    section: str = "raw",
+    columns: Optional[List[str]] = None,
+    use_cache: bool = True,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    config/data_paths.yaml에서 data.<section>.<name> 키로 지정된 경로를 읽어서 DataFrame으로 반환합니다.
+    - name: data.<section>에 정의된 키 (예: 'pm10_processed_v1', 'reference_date_mapping' 등)
+    - section: 'raw', 'processed', 'reference' 중 하나
+    - columns: 필요한 컬럼만 읽을 때 지정 (Parquet 캐시에서는 해당 컬럼만 디스크에서 읽음)
+    - use_cache: False면 메모리/디스크 캐시를 모두 무시하고 원본 파일을 직접 읽음
+    - compact: True면 compact_claims()로 지역/성별/연령군 컬럼을 Categorical로, visit_count를 작은 정수형으로 변환
+
+    처음 읽을 때 원본 옆 .cache/ 폴더에 Parquet 캐시를 만들고, 이후에는 캐시에서 읽습니다.
+    원본 파일의 수정시각이나 크기가 바뀌면 캐시는 자동으로 다시 만들어집니다.
+    같은 프로세스에서 다시 호출하면 메모리 캐시에서 사본을 돌려주므로, 반환값을 수정해도 안전합니다.
+    """
+    df = _load_data(name, section, columns=columns, use_cache=use_cache)
+    return compact_claims(df) if compact else df
+
+
+def _load_data(
+    name: str,
+    section: str,
+    columns: Optional[List[str]] = None,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    full_path = _resolve_path(name, section)
+    if not use_cache:
+        return _read_source(full_path, columns=columns)
+
+    fingerprint = _fingerprint(full_path)
+    key = (section, name, fingerprint)
+    df = _memo_get(key)
+
+    if df is None and columns is not None:
+        # 일부 컬럼만 필요하면 메모리에 올리지 않고 디스크 캐시에서 바로 projection
+        return _load_path(full_path, fingerprint, columns=columns)
+
+    if df is None:
+        # 같은 키를 여러 스레드가 동시에 요청해도 파싱은 한 번만 수행
+        with _memo_lock:
+            lock = _inflight.setdefault(key, threading.Lock())
+        with lock:
+            df = _memo_get(key)
+            if df is None:
+                df = _load_path(full_path, fingerprint)
+                _memo_put(key, df)
+        with _memo_lock:
+            _inflight.pop(key, None)
+
+    return _share(df[columns] if columns is not None else df)
+
+
+def load_file(path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    config에 등록되지 않은 파일(예: ETL이 새로 만든 날짜별 결과 파일)을 load_data와 같은 캐시 경로로 읽습니다.
+    - path: 프로젝트 루트 기준 상대 경로 또는 절대 경로
+    """
+    full_path = Path(path)
+    if not full_path.is_absolute():
+        full_path = BASE_DIR / full_path
+    if not full_path.exists():
+        raise FileNotFoundError(f"Data file not found: {full_path}")
+
+    fingerprint = _fingerprint(full_path)
+    key = ("file", str(full_path.resolve()), fingerprint)
+    df = _memo_get(key)
+    if df is None:
+        if columns is not None:
+            return _load_path(full_path, fingerprint, columns=columns)
+        df = _load_path(full_path, fingerprint)
+        _memo_put(key, df)
+    return _share(df[columns] if columns is not None else df)
+
+
+DataKey = Union[str, Tuple[str, str]]
+
+
+def load_data_many(
+    keys: Iterable[DataKey],
+    max_workers: Optional[int] = None,
+) -> List[pd.DataFrame]:
+    """
+    여러 데이터를 스레드 풀에서 동시에 로드하여, 요청한 순서대로 리스트로 반환합니다.
+    - keys: 'pm10' 처럼 이름만 주면 section='raw', (name, section) 튜플이면 해당 section
+    - 예) age_df, date_df = load_data_many([("agegroup_map", "reference"), ("date_map", "reference")])
+    """
+    specs = [(k, "raw") if isinstance(k, str) else tuple(k) for k in keys]
+    if not specs:
+        return []
+    workers = max_workers or min(len(specs), os.cpu_count() or 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(load_data, name, section) for name, section in specs]
+        return [f.result() for f in futures]
+
+
+def data_fingerprint(keys: Iterable[DataKey]) -> str:
+    """
+    여러 데이터의 원본 파일 지문(경로, 수정시각, 크기)을 하나로 합친 키를 반환합니다.
+    - keys: load_data_many와 같은 형식
+    - 입력 파일 중 하나라도 바뀌면 값이 달라지므로, 파생 결과(회귀 계수 등)의 재계산 여부 판단에 사용
+    """
+    specs = sorted((k, "raw") if isinstance(k, str) else tuple(k) for k in keys)
+    parts = [f"{section}.{name}={_fingerprint(_resolve_path(name, section))}" for name, section in specs]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _load_path(
+    full_path: Path,
+    fingerprint: str,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    # Parquet 원본은 이미 컬럼 기반이므로 디스크 캐시를 만들지 않음
+    if full_path.suffix.lower() == ".parquet":
+        return _read_source(full_path, columns=columns)
+
+    cached = _read_cache(full_path, fingerprint, columns=columns)
+    if cached is not None:
+        return cached
+
+    df = _read_source(full_path)
+    _write_cache(full_path, fingerprint, df)
+    return df[columns] if columns is not None else df
+
+
+def _read_schema(path: Path, fingerprint: str) -> pd.Series:
+    """
+    데이터 전체를 읽지 않고 컬럼명과 dtype만 읽습니다.
+    - Parquet(원본 또는 디스크 캐시): 파일 footer의 스키마만 읽음
+    - xlsx/csv: 헤더와 앞부분 SCHEMA_SAMPLE_ROWS 행만 읽어 dtype을 추정
+    """
+    parquet_path = _cache_paths(path, fingerprint)[0]
+    if path.suffix.lower() == ".parquet":
+        parquet_path = path
+    if _HAS_PYARROW and parquet_path.exists():
+        return pyarrow.parquet.read_schema(parquet_path).empty_table().to_pandas().dtypes
+
+    suffix = path.suffix.lower()
+    if suffix in (".xls", ".xlsx"):
+        return pd.read_excel(path, nrows=SCHEMA_SAMPLE_ROWS).dtypes
+    elif suffix == ".csv":
+        return pd.read_csv(path, nrows=SCHEMA_SAMPLE_ROWS).dtypes
     else:
-        raise ValueError(f"Unsupported file extension: {suffix}")
\ No newline at end of file
+        raise ValueError(f"Unsupported file extension: {suffix}")
+
+
+def load_schema(name: str, section: str = "raw") -> pd.Series:
+    """
+    data.<section>.<name> 데이터의 컬럼별 dtype을 반환합니다 (DataFrame.dtypes와 같은 형태).
+    - 메모리 캐시에 이미 로드된 데이터가 있으면 그 dtype을 그대로 사용
+    - 없으면 _read_schema()로 헤더만 읽으며, 결과는 원본 fingerprint 기준으로 캐시됨
+    - xlsx/csv는 앞부분 표본으로 추정한 dtype이므로, 뒤쪽에만 결측이 있는 컬럼은 전체 로드 시 float이 될 수 있음
+    """
+    full_path = _resolve_path(name, section)
+    fingerprint = _fingerprint(full_path)
+    key = (section, name, fingerprint)
+
+    loaded = _memo_get(key)
+    if loaded is not None:
+        return loaded.dtypes.copy()
+
+    with _memo_lock:
+        schema = _schema_memo.get(key)
+    if schema is None:
+        schema = _read_schema(full_path, fingerprint)
+        with _memo_lock:
+            for old in [k for k in _schema_memo if k[:2] == key[:2]]:
+                del _schema_memo[old]
+            _schema_memo[key] = schema
+    return schema.copy()
+
+
+def load_columns(name: str, section: str = "raw") -> List[str]:
+    """
+    data.<section>.<name> 데이터의 컬럼명 리스트만 반환합니다.
+    - 예) provinces = [c for c in load_columns('pm10_processed_v1', 'processed') if c != 'year_month']
+    """
+    return list(load_schema(name, section).index)
+
+
+# ---------------------------------------------------------------------------
+# 진료 데이터용 Categorical 어휘(vocabulary)
+# - 참조 테이블(지역/연령군 매핑)에서 만든 공용 카테고리 목록을 모든 프레임이 공유
+# - 카테고리는 정렬된 순서로 고정되므로 sort_values 결과가 문자열 정렬과 같음
+# ---------------------------------------------------------------------------
+CATEGORICAL_COLUMNS = ["province_name", "district_name", "gender", "age_group", "region"]
+
+
+def _sorted_unique(values) -> list:
+    uniq = set(v for v in values if not pd.isna(v))
+    try:
+        return sorted(uniq)
+    except TypeError:
+        return sorted(uniq, key=lambda v: (type(v).__name__, str(v)))
+
+
+def category_vocabulary() -> dict:
+    """
+    진료 데이터 컬럼별 공용 카테고리 목록을 반환합니다.
+    - province_name: reference_region_mapping의 시도명 + avgcode 매핑의 도 이름
+    - district_name: reference_region_mapping의 시군구명
+    - region: 시도명 + 도 이름 + PM 전처리 결과의 지역(관측소) 컬럼
+    - age_group: reference_agegroup_mapping의 구분 코드
+    - gender: 참조 테이블이 없으므로 관측값만 사용
+    """
+    region_map, age_map, avg_map = load_data_many([
+        ("region_map", "reference"),
+        ("agegroup_map", "reference"),
+        ("avgcode_map", "reference"),
+    ])
+    provinces = list(region_map["시도명"]) + list(avg_map["province_name"])
+
+    stations = []
+    for name in ("pm10_processed_v1", "pm25_processed_v1"):
+        try:
+            stations += [c for c in load_columns(name, "processed") if c != "year_month"]
+        except (KeyError, FileNotFoundError):
+            pass
+
+    return {
+        "province_name": _sorted_unique(provinces),
+        "district_name": _sorted_unique(region_map["시군구명"]),
+        "region":        _sorted_unique(provinces + stations),
+        "age_group":     _sorted_unique(age_map["구분"]),
+        "gender":        [],
+    }
+
+
+def compact_claims(df: pd.DataFrame, vocabulary: Optional[dict] = None) -> pd.DataFrame:
+    """
+    진료 데이터 프레임을 메모리 효율적인 형태로 변환합니다.
+    - CATEGORICAL_COLUMNS 중 존재하는 컬럼을 공용 어휘 기반 Categorical로 변환
+      (어휘에 없는 관측값은 버리지 않고 카테고리에 추가)
+    - visit_count는 값이 들어가는 가장 작은 정수형으로 downcast
+    - Categorical 컬럼으로 groupby할 때는 observed=True를 지정해야 빈 조합이 생기지 않음
+    """
+    cols = [c for c in CATEGORICAL_COLUMNS if c in df.columns]
+    if not cols and "visit_count" not in df.columns:
+        return df
+
+    vocabulary = vocabulary if vocabulary is not None else category_vocabulary()
+    out = df.copy(deep=False)
+    for c in cols:
+        observed = out[c].cat.categories if isinstance(out[c].dtype, pd.CategoricalDtype) else out[c].unique()
+        categories = _sorted_unique(list(vocabulary.get(c, [])) + list(observed))
+        out[c] = pd.Categorical(out[c], categories=categories)
+
+    if "visit_count" in out.columns and pd.api.types.is_numeric_dtype(out["visit_count"].dtype):
+        if out["visit_count"].notna().all():
+            out["visit_count"] = pd.to_numeric(out["visit_count"], downcast="integer")
+    return out
@@ -2,10 +2,14 @@
 
 import os
 import sys
+import time
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import yaml
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 import pandas as pd
 
 # 프로젝트 루트 등록
@@ -18,247 +22,298 @@ cfg = yaml.safe_load(open(CONFIG_PATH, "r", encoding="utf-8"))
 
 #  load_data 함수 가져오기
 from scripts.data_loader import load_data
+from scripts.bulk_loader import bulk_load
+from scripts.schema import (
+    DIMENSION_TABLES, FACT_TABLES, POLLUTANT_FACTS, ROLLUP_TABLES, ROLLUP_STATE_TABLE,
+    LOAD_GENERATION_TABLE, schema_ddl,
+)
+from scripts.rollups import refresh_rollups
+from src.utils.db_util import database_url
+
+"""
+DB 구조 초기화 및 데이터 적재
+- 원본 파일 8개는 프로세스 풀에서 동시에 파싱 (Excel 파싱은 CPU 작업이라 스레드로는 병렬화되지 않음)
+- 스키마(인덱스, 파티션, 차원 키)는 scripts/schema.py에서 정의
+- 차원 테이블(date_dim, age_group_dim, region_dim)을 먼저 적재한 뒤,
+  사실 테이블 6개는 지역/연령군을 정수 키로 바꿔 파싱이 끝나는 순서대로 스레드 풀에서 병렬 적재 (워커당 풀 커넥션 1개)
+  (SQLite/DuckDB는 쓰기 잠금이 파일 단위라 적재 워커 1개로 순서대로 적재)
+- 테이블별 파싱/적재 시간을 출력하므로 전체 시간이 가장 느린 테이블에 의해 정해지는지 확인 가능
+- 사실 테이블 적재 후 롤업 테이블(scripts/rollups.py)을 DB 안에서 다시 계산
+- 적재가 끝나면 load_generation 세대를 올려 DustDB 조회 캐시를 무효화
+- .env의 DB_BACKEND=duckdb(또는 sqlite)면 서버 없이 로컬 파일 DB에 같은 스키마를 적재
+  (DuckDB는 파싱된 DataFrame을 Arrow로 등록해 INSERT ... SELECT, 롤업 집계도 DuckDB 벡터 엔진에서 수행)
+"""
 
-#  DB 접속 정보 .env에서 로드
+#  DB 접속 정보 .env에서 로드 (URL 구성은 src.utils.db_util.database_url)
 load_dotenv()
-DB_USER     = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST     = os.getenv("DB_HOST")
-DB_PORT     = os.getenv("DB_PORT")
-DB_NAME     = os.getenv("DB_NAME")
-
-# MySQL 엔진 생성 (DB가 없다면 생성)
-engine0 = create_engine(
-    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}"
-)
-with engine0.connect() as conn:
-    conn.execute(text(
-        f"CREATE DATABASE IF NOT EXISTS {DB_NAME} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
-    ))
+# 적재 방식: 'multi'(executemany), 'infile'(LOAD DATA LOCAL INFILE), 'register'(DuckDB)
+# 지정하지 않으면 DB별 기본값 (scripts/bulk_loader.default_method)
+BULK_METHOD = os.getenv("DB_BULK_METHOD") or None
+
+# 쓰기 잠금이 DB 파일 전체에 걸리는 백엔드: 사실 테이블을 동시에 적재하지 않고 하나씩 적재
+SINGLE_WRITER_DIALECTS = ("sqlite", "duckdb")
+
+# SQLite 잠금 대기 시간 (초) — 적재 중 다른 커넥션(롤업 갱신 등)이 잠금을 기다릴 수 있도록 넉넉히
+SQLITE_TIMEOUT = 300
+
+
+def prepare_date_dim(df):
+    # date_dim (date_df_map에는 ['date_id','year','month','quarter','season'] 포함)
+    df["date_id"] = df["date_id"].astype(str)
+    return df
+
+
+def prepare_age_group_dim(df):
+    df.columns = ["age_group", "age_range"]
+    df["age_group"] = df["age_group"].astype(int)
+    return df
+
+
+def build_region_dim(frames):
+    """
+    오염물질 사실 테이블의 region_name으로 region_dim을 만듭니다 (처음 나온 순서대로 1부터 번호).
+    - 질환 사실 테이블의 region은 PM 지역 집합으로 투영된 값이므로 모두 여기에 포함됨
+    """
+    names = pd.unique(pd.concat([f["region_name"] for f in frames], ignore_index=True))
+    return pd.DataFrame({"region_id": range(1, len(names) + 1), "region_name": names})
 
-engine = create_engine(
-    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-)
 
-# 기존 테이블(외래키 포함) DROP
-with engine.connect() as conn:
-    conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
-    for t in [
-        "pm10_fact", "pm10_asthma_fact", "pm10_rhinitis_fact",
-        "pm25_fact", "pm25_asthma_fact", "pm25_rhinitis_fact",
-        "date_dim", "age_group_dim"
-    ]:
-        conn.execute(text(f"DROP TABLE IF EXISTS {t};"))
-    conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
-
-# DDL 정의
-DDL = [
-    # date_dim
+def prepare_pollutant_fact(df, pollutant):
+    # pm10_fact / pm25_fact (wide → long)
+    long_df = df.melt(
+        id_vars="year_month", var_name="region_name", value_name=pollutant
+    )
+    long_df["date_id"] = long_df["year_month"].str.replace("-", "")
+    return long_df[["date_id", "region_name", pollutant]].dropna()
+
+
+def prepare_claims_fact(df):
+    # 질환 사실 테이블 (ym: 'YYYYMM' 형식으로 변경)
+    df = df.rename(columns={"year_month": "ym"})
+    df["ym"] = df["ym"].str.replace("-", "")
+    return df
+
+
+def _lookup(values, mapping, label, table):
+    # 차원 키 변환: 파티션 테이블에는 FK가 없으므로 여기서 누락 값을 검증
+    keys = values.map(mapping)
+    missing = pd.unique(values[keys.isna()])
+    if len(missing):
+        raise ValueError(f"{table}: {label} not in dimension table: {list(missing)[:10]}")
+    return keys.astype(int)
+
+
+def encode_fact(table, df, region_ids, age_groups):
     """
-    CREATE TABLE IF NOT EXISTS date_dim (
-        date_id CHAR(6) PRIMARY KEY,
-        year SMALLINT NOT NULL,
-        month TINYINT NOT NULL,
-        quarter TINYINT NOT NULL,
-        season VARCHAR(10) NOT NULL
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """,
-
-    # age_group_dim
+    사실 테이블의 지역 이름/연령군을 차원 테이블의 정수 키로 바꿉니다.
     """
-    CREATE TABLE IF NOT EXISTS age_group_dim (
-        age_group VARCHAR(10) PRIMARY KEY,
-        age_range VARCHAR(20)
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """,
+    if table in POLLUTANT_FACTS.values():
+        out = df.assign(region_id=_lookup(df["region_name"], region_ids, "region_name", table))
+        return out.drop(columns="region_name")
+    out = df.assign(
+        region_id=_lookup(df["region"], region_ids, "region", table),
+        age_group=_lookup(pd.to_numeric(df["age_group"], errors="coerce"), age_groups, "age_group", table),
+    )
+    return out[["ym", "region_id", "age_group", "gender", "visit_count"]]
+
 
-    # pm10_asthma_fact (천식+PM10)
+# 테이블 → (data_loader 키, section, 전처리 함수, 추가 인자)
+# (region_dim은 원본 파일이 아니라 pm10_fact/pm25_fact 파싱 결과에서 만듦)
+TABLE_SOURCES = {
+    "date_dim":           ("date_map",                   "reference", prepare_date_dim,       ()),
+    "age_group_dim":      ("agegroup_map",               "reference", prepare_age_group_dim,  ()),
+    "pm10_fact":          ("pm10_processed_v1",          "processed", prepare_pollutant_fact, ("pm10",)),
+    "pm25_fact":          ("pm25_processed_v1",          "processed", prepare_pollutant_fact, ("pm25",)),
+    "pm10_asthma_fact":   ("pm10_asthma_processed_v1",   "processed", prepare_claims_fact,    ()),
+    "pm25_asthma_fact":   ("pm25_asthma_processed_v1",   "processed", prepare_claims_fact,    ()),
+    "pm10_rhinitis_fact": ("pm10_rhinitis_processed_v1", "processed", prepare_claims_fact,    ()),
+    "pm25_rhinitis_fact": ("pm25_rhinitis_processed_v1", "processed", prepare_claims_fact,    ()),
+}
+
+
+def create_database(url):
+    url = make_url(url)
+    if url.get_backend_name() != "mysql":
+        # DuckDB / SQLite: DB 파일이 들어갈 폴더만 준비
+        if url.database and url.database != ":memory:":
+            Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+        return
+
+    # MySQL 엔진 생성 (DB가 없다면 생성)
+    engine0 = create_engine(url.set(database=""))
+    with engine0.connect() as conn:
+        conn.execute(text(
+            f"CREATE DATABASE IF NOT EXISTS {url.database} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"
+        ))
+    engine0.dispose()
+
+
+def load_workers(dialect):
+    """
+    사실 테이블 동시 적재 수 (단일 writer 백엔드는 1)
     """
-    CREATE TABLE IF NOT EXISTS pm10_asthma_fact (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        ym CHAR(6),
-        region VARCHAR(50),
-        gender VARCHAR(10),
-        age_group VARCHAR(10),
-        visit_count INT
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """,
-
-    # pm10_rhinitis_fact (비염+PM10)
+    return 1 if dialect in SINGLE_WRITER_DIALECTS else len(FACT_TABLES)
+
+
+def create_db_engine(url, pool_size):
     """
-    CREATE TABLE IF NOT EXISTS pm10_rhinitis_fact (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        ym CHAR(6),
-        region VARCHAR(50),
-        gender VARCHAR(10),
-        age_group VARCHAR(10),
-        visit_count INT
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """,
-
-    # pm10_fact (PM10 농도)
+    적재 워커 수만큼 커넥션을 유지하는 풀 엔진을 만듭니다.
     """
-    CREATE TABLE IF NOT EXISTS pm10_fact (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        date_id CHAR(6),
-        region_name VARCHAR(50),
-        pm10 DECIMAL(5,2),
-        FOREIGN KEY(date_id) REFERENCES date_dim(date_id)
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """,
-
-    # pm25_asthma_fact (천식+PM2.5)
+    connect_args = {"local_infile": True} if BULK_METHOD == "infile" else {}
+    if make_url(url).get_backend_name() == "sqlite":
+        connect_args = {"timeout": SQLITE_TIMEOUT}
+    return create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+
+
+def reset_schema(engine):
+    mysql = engine.dialect.name == "mysql"
+
+    # 기존 테이블(외래키 포함) DROP — 사실 테이블을 차원 테이블보다 먼저
+    with engine.begin() as conn:
+        if mysql:
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
+        for t in ROLLUP_TABLES + [ROLLUP_STATE_TABLE] + FACT_TABLES + DIMENSION_TABLES:
+            conn.execute(text(f"DROP TABLE IF EXISTS {t};"))
+        if mysql:
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
+
+    # DDL 실행
+    with engine.begin() as conn:
+        if mysql:
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
+        for ddl in schema_ddl(engine.dialect.name):
+            conn.execute(text(ddl))
+        if mysql:
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
+
+
+def parse_table(table):
     """
-    CREATE TABLE IF NOT EXISTS pm25_asthma_fact (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        ym CHAR(6),
-        region VARCHAR(50),
-        gender VARCHAR(10),
-        age_group VARCHAR(10),
-        visit_count INT
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """,
-
-    # pm25_rhinitis_fact (비염+PM2.5)
+    테이블 하나의 원본 파일을 읽고 적재 형태로 변환합니다 (프로세스 풀 워커).
+    - 반환: (DataFrame, 파싱 소요 시간[초])
     """
-    CREATE TABLE IF NOT EXISTS pm25_rhinitis_fact (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        ym CHAR(6),
-        region VARCHAR(50),
-        gender VARCHAR(10),
-        age_group VARCHAR(10),
-        visit_count INT
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-    """,
-
-    # pm25_fact (PM2.5 농도)
+    start = time.perf_counter()
+    name, section, prepare, args = TABLE_SOURCES[table]
+    df = prepare(load_data(name, section), *args)
+    return df, time.perf_counter() - start
+
+
+def _load_table(engine, table, df, encode=None):
+    start = time.perf_counter()
+    if encode is not None:
+        df = encode(table, df)
+    rows = bulk_load(df, table, engine, method=BULK_METHOD)
+    return rows, time.perf_counter() - start
+
+
+def load_all(engine, jobs=None):
     """
-    CREATE TABLE IF NOT EXISTS pm25_fact (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        date_id CHAR(6),
-        region_name VARCHAR(50),
-        pm25 DECIMAL(5,2),
-        FOREIGN KEY(date_id) REFERENCES date_dim(date_id)
-    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    모든 원본을 병렬 파싱하고 차원 → 사실 테이블 순서로 적재합니다.
+    - jobs: 파싱 프로세스 수 (기본: CPU 수와 테이블 수 중 작은 값)
+    - 반환: {테이블: {'rows', 'parse', 'load'}}
     """
-]
-
-# DDL 실행
-with engine.connect() as conn:
-    conn.execute(text("SET FOREIGN_KEY_CHECKS=0;"))
-    for ddl in DDL:
-        conn.execute(text(ddl))
-    conn.execute(text("SET FOREIGN_KEY_CHECKS=1;"))
-
-# 데이터 로드
-age_group_df       = load_data("agegroup_map", section="reference")
-date_df_map        = load_data("date_map",     section="reference")
-pm10_df            = load_data("pm10_processed_v1",    section="processed")
-pm25_df            = load_data("pm25_processed_v1",    section="processed")
-pm10_asthma_df     = load_data("pm10_asthma_processed_v1", section="processed")
-pm25_asthma_df     = load_data("pm25_asthma_processed_v1", section="processed")
-pm10_rhinitis_df   = load_data("pm10_rhinitis_processed_v1", section="processed")
-pm25_rhinitis_df   = load_data("pm25_rhinitis_processed_v1", section="processed")
-
-# date_dim 삽입 (date_df_map에는 ['year_month','date_id','year','month','quarter','season'] 포함)
-date_df_map["date_id"] = date_df_map["date_id"].astype(str)
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM date_dim;"))
-# dtype 인자 제거: MySQL이 자동으로 타입을 생성하도록 함
-date_df_map.to_sql(
-    "date_dim",
-    engine,
-    if_exists="append",
-    index=False
-)
+    sources = [t for t in DIMENSION_TABLES if t in TABLE_SOURCES] + FACT_TABLES
+    timings = {}
+    # 파싱 프로세스는 DB를 쓰지 않음: fork 시 부모의 풀 커넥션을 물려주지 않도록 풀을 먼저 비움
+    # (initializer에 engine을 넘기면 spawn 방식(Windows/macOS)에서 pickle되지 않음)
+    engine.dispose()
+    with ProcessPoolExecutor(max_workers=jobs or min(len(sources), os.cpu_count() or 4)) as parsers, \
+         ThreadPoolExecutor(max_workers=load_workers(engine.dialect.name)) as loaders:
+        parsed = {parsers.submit(parse_table, t): t for t in sources}
+        by_table = {t: f for f, t in parsed.items()}
 
-# age_group_dim 삽입
-age_group_df.columns = ["age_group", "age_range"]
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM age_group_dim;"))
-age_group_df.to_sql(
-    "age_group_dim",
-    engine,
-    if_exists="append",
-    index=False
-)
+        # 1) 차원 테이블: 사실 테이블이 참조하므로 먼저 적재
+        #    region_dim은 오염물질 사실 테이블의 지역 컬럼에서 만듦
+        frames = {}
+        for table in DIMENSION_TABLES:
+            if table == "region_dim":
+                pollutant_frames = [by_table[t].result()[0] for t in POLLUTANT_FACTS.values()]
+                parse_sec = 0.0
+                df = build_region_dim(pollutant_frames)
+            else:
+                df, parse_sec = by_table[table].result()
+            frames[table] = df
+            rows, load_sec = _load_table(engine, table, df)
+            timings[table] = {"rows": rows, "parse": parse_sec, "load": load_sec}
 
-# pm10_fact (wide → long)
-pm10_long = pm10_df.melt(
-    id_vars="year_month", var_name="region_name", value_name="pm10"
-)
-pm10_long["date_id"] = pm10_long["year_month"].str.replace("-", "")
-pm10_long = pm10_long[["date_id", "region_name", "pm10"]].dropna()
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM pm10_fact;"))
-pm10_long.to_sql(
-    "pm10_fact",
-    engine,
-    if_exists="append",
-    index=False
-)
+        region_ids = dict(zip(frames["region_dim"]["region_name"], frames["region_dim"]["region_id"]))
+        age_groups = {code: code for code in frames["age_group_dim"]["age_group"]}
 
-# pm25_fact (wide → long)
-pm25_long = pm25_df.melt(
-    id_vars="year_month", var_name="region_name", value_name="pm25"
-)
-pm25_long["date_id"] = pm25_long["year_month"].str.replace("-", "")
-pm25_long = pm25_long[["date_id", "region_name", "pm25"]].dropna()
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM pm25_fact;"))
-pm25_long.to_sql(
-    "pm25_fact",
-    engine,
-    if_exists="append",
-    index=False
-)
+        def encode(table, df):
+            return encode_fact(table, df, region_ids, age_groups)
 
-# pm10_asthma_fact 삽입 (ym: 'YYYYMM' 형식으로 변경)
-pm10_asthma_df = pm10_asthma_df.rename(columns={"year_month": "ym"})
-pm10_asthma_df["ym"] = pm10_asthma_df["ym"].str.replace("-", "")
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM pm10_asthma_fact;"))
-pm10_asthma_df.to_sql(
-    "pm10_asthma_fact",
-    engine,
-    if_exists="append",
-    index=False
-)
+        # 2) 사실 테이블: 파싱이 끝나는 순서대로 적재 작업 제출
+        loading = {}
+        for future in as_completed([by_table[t] for t in FACT_TABLES]):
+            table = parsed[future]
+            df, parse_sec = future.result()
+            timings[table] = {"parse": parse_sec}
+            loading[loaders.submit(_load_table, engine, table, df, encode)] = table
+        for future in as_completed(loading):
+            table = loading[future]
+            timings[table]["rows"], timings[table]["load"] = future.result()
+    return timings
 
-# pm25_asthma_fact 삽입
-pm25_asthma_df = pm25_asthma_df.rename(columns={"year_month": "ym"})
-pm25_asthma_df["ym"] = pm25_asthma_df["ym"].str.replace("-", "")
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM pm25_asthma_fact;"))
-pm25_asthma_df.to_sql(
-    "pm25_asthma_fact",
-    engine,
-    if_exists="append",
-    index=False
-)
 
-# pm10_rhinitis_fact 삽입
-pm10_rhinitis_df = pm10_rhinitis_df.rename(columns={"year_month": "ym"})
-pm10_rhinitis_df["ym"] = pm10_rhinitis_df["ym"].str.replace("-", "")
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM pm10_rhinitis_fact;"))
-pm10_rhinitis_df.to_sql(
-    "pm10_rhinitis_fact",
-    engine,
-    if_exists="append",
-    index=False
-)
+def bump_load_generation(engine):
+    """
+    적재 세대를 1 올리고 새 세대를 반환합니다 (행이 없으면 1부터 시작).
+    """
+    loaded_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    with engine.begin() as conn:
+        current = conn.execute(text(
+            f"SELECT generation FROM {LOAD_GENERATION_TABLE} WHERE id = 1"
+        )).scalar()
+        if current is None:
+            generation = 1
+            conn.execute(text(
+                f"INSERT INTO {LOAD_GENERATION_TABLE} (id, generation, loaded_at) VALUES (1, :g, :t)"
+            ), {"g": generation, "t": loaded_at})
+        else:
+            generation = current + 1
+            conn.execute(text(
+                f"UPDATE {LOAD_GENERATION_TABLE} SET generation = :g, loaded_at = :t WHERE id = 1"
+            ), {"g": generation, "t": loaded_at})
+    return generation
+
+
+def print_timings(timings, elapsed):
+    print(f"{'table':<20} {'rows':>10} {'parse(s)':>10} {'load(s)':>10}")
+    for table in DIMENSION_TABLES + FACT_TABLES:
+        t = timings[table]
+        print(f"{table:<20} {t['rows']:>10,} {t['parse']:>10.2f} {t['load']:>10.2f}")
+    total = sum(t["parse"] + t["load"] for t in timings.values())
+    print(f"전체 {elapsed:.2f}s (테이블별 합계 {total:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 구조 초기화 및 데이터 적재")
+    parser.add_argument("--jobs", type=int, default=None, help="원본 파싱 프로세스 수")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    url = database_url()
+    create_database(url)
+    engine = create_db_engine(url, pool_size=load_workers(make_url(url).get_backend_name()))
+    try:
+        reset_schema(engine)
+        timings = load_all(engine, jobs=args.jobs)
+        rollup_start = time.perf_counter()
+        refresh_rollups(engine, force=True)
+        rollup_sec = time.perf_counter() - rollup_start
+        generation = bump_load_generation(engine)
+    finally:
+        engine.dispose()
+    print_timings(timings, time.perf_counter() - start)
+    print(f"롤업 테이블 갱신 {rollup_sec:.2f}s")
+    print(f"DB 구조 초기화 및 데이터 삽입 완료 (load generation {generation})")
 
-# pm25_rhinitis_fact 삽입
-pm25_rhinitis_df = pm25_rhinitis_df.rename(columns={"year_month": "ym"})
-pm25_rhinitis_df["ym"] = pm25_rhinitis_df["ym"].str.replace("-", "")
-with engine.begin() as conn:
-    conn.execute(text("DELETE FROM pm25_rhinitis_fact;"))
-pm25_rhinitis_df.to_sql(
-    "pm25_rhinitis_fact",
-    engine,
-    if_exists="append",
-    index=False
-)
 
-print("DB 구조 초기화 및 데이터 삽입 완료")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
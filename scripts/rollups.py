@@ -0,0 +1,262 @@
+# scripts/rollups.py
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 등록
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from sqlalchemy import bindparam, text
+
+from scripts.schema import (
+    CLAIMS_FACTS, DISEASE_KEYS, POLLUTANT_FACTS, ROLLUP_STATE_TABLE, ROLLUP_TABLES,
+)
+
+"""
+사전 집계(롤업) 테이블 갱신
+- rollup_month_region     : 월×지역 PM 농도 + 질환별 진료 건수
+- rollup_month_region_age : 월×지역×연령군 진료 건수 + 해당 월·지역 PM 농도
+- rollup_month_national   : 월별 전국 (지역 PM 농도 평균, 진료 건수 합계) — month_region에서 집계
+- rollup_season_region    : 계절×지역 (월 PM 농도 평균, 진료 건수 합계) — month_region + date_dim에서 집계
+- 모두 INSERT ... SELECT로 DB 안에서 계산 (MySQL / SQLite / DuckDB 공용 SQL)
+- 증분 갱신: 사실 테이블의 월별 서명(행 수, 값 합계)을 rollup_state와 비교해
+  바뀐 달만 DELETE 후 다시 INSERT (계절 롤업은 바뀐 달이 속한 계절만 재계산)
+"""
+
+
+def _pollutant_sources(pollutant):
+    """
+    오염물질 하나의 롤업에 쓰이는 사실 테이블 → (월 컬럼, 값 컬럼)
+    """
+    sources = {POLLUTANT_FACTS[pollutant]: ("date_id", pollutant)}
+    for disease in DISEASE_KEYS:
+        sources[CLAIMS_FACTS[(pollutant, disease)]] = ("ym", "visit_count")
+    return sources
+
+
+def _month_filter(column, months):
+    return f" WHERE {column} IN :months" if months is not None else ""
+
+
+def _execute(conn, sql, params, months):
+    stmt = text(sql)
+    if months is not None:
+        stmt = stmt.bindparams(bindparam("months", expanding=True))
+        params = {**params, "months": list(months)}
+    conn.execute(stmt, params)
+
+
+# ----------------------------------------------------------------------
+# 변경 감지
+# ----------------------------------------------------------------------
+def _signatures(conn, table, month_col, value_col):
+    rows = conn.execute(text(
+        f"SELECT {month_col}, COUNT(*), SUM({value_col}) FROM {table} GROUP BY {month_col}"
+    )).fetchall()
+    return {str(ym): (int(n), None if total is None else round(float(total), 6)) for ym, n, total in rows}
+
+
+def changed_months(conn, pollutant):
+    """
+    마지막 롤업 이후 사실 테이블 내용이 바뀐(추가·수정·삭제된) 달의 집합과 현재 서명을 반환합니다.
+    - 반환: (바뀐 달 set, 상태 테이블이 비어 있었는지, {테이블: 현재 서명})
+    """
+    current, changed, empty = {}, set(), True
+    for table, (month_col, value_col) in _pollutant_sources(pollutant).items():
+        now = _signatures(conn, table, month_col, value_col)
+        stored = {
+            str(ym): (int(n), None if total is None else round(float(total), 6))
+            for ym, n, total in conn.execute(text(
+                f"SELECT ym, n_rows, total FROM {ROLLUP_STATE_TABLE} WHERE source_table = :t"
+            ), {"t": table}).fetchall()
+        }
+        empty = empty and not stored
+        changed |= {ym for ym in now.keys() | stored.keys() if now.get(ym) != stored.get(ym)}
+        current[table] = now
+    return changed, empty, current
+
+
+def _save_state(conn, current, months=None):
+    """
+    현재 서명을 rollup_state에 기록합니다.
+    - months: 주면 그 달의 서명만 교체 (나머지 달은 이전 상태 유지 → 다음 증분 갱신에서 다시 비교)
+    """
+    for table, signatures in current.items():
+        if months is not None:
+            signatures = {ym: sig for ym, sig in signatures.items() if ym in months}
+        _execute(conn, f"DELETE FROM {ROLLUP_STATE_TABLE} WHERE source_table = :t"
+                       + (" AND ym IN :months" if months is not None else ""), {"t": table}, months)
+        if signatures:
+            conn.execute(
+                text(f"INSERT INTO {ROLLUP_STATE_TABLE} (source_table, ym, n_rows, total) VALUES (:t, :ym, :n, :total)"),
+                [{"t": table, "ym": ym, "n": n, "total": total} for ym, (n, total) in signatures.items()],
+            )
+
+
+# ----------------------------------------------------------------------
+# 롤업 SQL
+# ----------------------------------------------------------------------
+def _visits_join(pollutant, keys, months):
+    """
+    질환별 진료 건수 서브쿼리 LEFT JOIN 절과 SELECT 컬럼을 만듭니다.
+    """
+    joins, cols = [], []
+    for disease in DISEASE_KEYS:
+        fact = CLAIMS_FACTS[(pollutant, disease)]
+        alias = f"v_{disease}"
+        key_list = ", ".join(keys)
+        on = " AND ".join(f"{alias}.{k} = k.{k}" for k in keys)
+        joins.append(
+            f"LEFT JOIN (SELECT {key_list}, SUM(visit_count) AS visits FROM {fact}"
+            f"{_month_filter('ym', months)} GROUP BY {key_list}) {alias} ON {on}"
+        )
+        cols.append(f"{alias}.visits")
+    return joins, cols
+
+
+def _refresh_month_region(conn, pollutant, months):
+    pm_fact = POLLUTANT_FACTS[pollutant]
+    keys = [f"SELECT date_id AS ym, region_id FROM {pm_fact}{_month_filter('date_id', months)}"]
+    keys += [
+        f"SELECT ym, region_id FROM {CLAIMS_FACTS[(pollutant, d)]}{_month_filter('ym', months)}"
+        for d in DISEASE_KEYS
+    ]
+    joins, visit_cols = _visits_join(pollutant, ["ym", "region_id"], months)
+    visit_names = ", ".join(f"{d}_visits" for d in DISEASE_KEYS)
+
+    _execute(conn, f"DELETE FROM rollup_month_region WHERE pollutant = :p"
+                   + (" AND ym IN :months" if months is not None else ""), {"p": pollutant}, months)
+    _execute(conn, f"""
+        INSERT INTO rollup_month_region (pollutant, ym, region_id, pm_level, {visit_names})
+        SELECT :p, k.ym, k.region_id, pm.{pollutant}, {", ".join(visit_cols)}
+        FROM ({" UNION ".join(keys)}) k
+        LEFT JOIN {pm_fact} pm ON pm.date_id = k.ym AND pm.region_id = k.region_id
+        {" ".join(joins)}
+    """, {"p": pollutant}, months)
+
+
+def _refresh_month_region_age(conn, pollutant, months):
+    pm_fact = POLLUTANT_FACTS[pollutant]
+    keys = [
+        f"SELECT ym, region_id, age_group FROM {CLAIMS_FACTS[(pollutant, d)]}{_month_filter('ym', months)}"
+        for d in DISEASE_KEYS
+    ]
+    joins, visit_cols = _visits_join(pollutant, ["ym", "region_id", "age_group"], months)
+    visit_names = ", ".join(f"{d}_visits" for d in DISEASE_KEYS)
+
+    _execute(conn, f"DELETE FROM rollup_month_region_age WHERE pollutant = :p"
+                   + (" AND ym IN :months" if months is not None else ""), {"p": pollutant}, months)
+    _execute(conn, f"""
+        INSERT INTO rollup_month_region_age (pollutant, ym, region_id, age_group, pm_level, {visit_names})
+        SELECT :p, k.ym, k.region_id, k.age_group, pm.{pollutant}, {", ".join(visit_cols)}
+        FROM ({" UNION ".join(keys)}) k
+        LEFT JOIN {pm_fact} pm ON pm.date_id = k.ym AND pm.region_id = k.region_id
+        {" ".join(joins)}
+    """, {"p": pollutant}, months)
+
+
+def _refresh_month_national(conn, pollutant, months):
+    visit_names = ", ".join(f"{d}_visits" for d in DISEASE_KEYS)
+    visit_sums = ", ".join(f"SUM({d}_visits)" for d in DISEASE_KEYS)
+    month_and = " AND ym IN :months" if months is not None else ""
+
+    _execute(conn, f"DELETE FROM rollup_month_national WHERE pollutant = :p{month_and}", {"p": pollutant}, months)
+    _execute(conn, f"""
+        INSERT INTO rollup_month_national (pollutant, ym, n_regions, pm_level, {visit_names})
+        SELECT pollutant, ym, COUNT(*), AVG(pm_level), {visit_sums}
+        FROM rollup_month_region
+        WHERE pollutant = :p{month_and}
+        GROUP BY pollutant, ym
+    """, {"p": pollutant}, months)
+
+
+def _refresh_season_region(conn, pollutant, months):
+    visit_names = ", ".join(f"{d}_visits" for d in DISEASE_KEYS)
+    visit_sums = ", ".join(f"SUM(m.{d}_visits)" for d in DISEASE_KEYS)
+
+    # 바뀐 달이 속한 계절만 다시 계산 (계절 행은 여러 해의 달을 합산)
+    seasons = None
+    if months is not None:
+        stmt = text("SELECT DISTINCT season FROM date_dim WHERE date_id IN :months").bindparams(
+            bindparam("months", expanding=True))
+        seasons = [row[0] for row in conn.execute(stmt, {"months": list(months)})]
+        if not seasons:
+            return
+    season_and = " AND d.season IN :seasons" if seasons is not None else ""
+
+    delete = "DELETE FROM rollup_season_region WHERE pollutant = :p"
+    insert = f"""
+        INSERT INTO rollup_season_region (pollutant, season, region_id, n_months, pm_level, {visit_names})
+        SELECT m.pollutant, d.season, m.region_id, COUNT(*), AVG(m.pm_level), {visit_sums}
+        FROM rollup_month_region m
+        JOIN date_dim d ON d.date_id = m.ym
+        WHERE m.pollutant = :p{season_and}
+        GROUP BY m.pollutant, d.season, m.region_id
+    """
+    if seasons is None:
+        conn.execute(text(delete), {"p": pollutant})
+        conn.execute(text(insert), {"p": pollutant})
+        return
+    conn.execute(
+        text(delete + " AND season IN :seasons").bindparams(bindparam("seasons", expanding=True)),
+        {"p": pollutant, "seasons": seasons},
+    )
+    conn.execute(
+        text(insert).bindparams(bindparam("seasons", expanding=True)),
+        {"p": pollutant, "seasons": seasons},
+    )
+
+
+def refresh_rollups(engine, pollutants=None, months=None, force=False):
+    """
+    롤업 테이블을 갱신하고 {오염물질: 갱신한 달 수}를 반환합니다.
+    - months: 갱신할 달('YYYYMM') 목록 — 주지 않으면 rollup_state와 비교해 바뀐 달을 찾음
+    - force: True면 해당 오염물질의 롤업 전체를 다시 계산
+    - 오염물질마다 한 트랜잭션 (중간에 실패하면 이전 롤업 유지)
+    """
+    refreshed = {}
+    for pollutant in (pollutants or list(POLLUTANT_FACTS)):
+        with engine.begin() as conn:
+            changed, empty, current = changed_months(conn, pollutant)
+            if months is not None:
+                target = {str(ym) for ym in months}
+            elif force or empty:
+                target = None
+            else:
+                target = changed
+            if target is not None and not target:
+                refreshed[pollutant] = 0
+                continue
+
+            target = sorted(target) if target is not None else None
+            _refresh_month_region(conn, pollutant, target)
+            _refresh_month_region_age(conn, pollutant, target)
+            _refresh_month_national(conn, pollutant, target)
+            _refresh_season_region(conn, pollutant, target)
+            _save_state(conn, current, target)
+            refreshed[pollutant] = len(target) if target is not None else len(
+                set().union(*(sig.keys() for sig in current.values()))
+            )
+    return refreshed
+
+
+def main():
+    from src.utils.db_util import get_engine
+
+    parser = argparse.ArgumentParser(description="롤업 테이블 갱신")
+    parser.add_argument("pollutants", nargs="*", help=f"갱신할 오염물질 (기본: {' '.join(POLLUTANT_FACTS)})")
+    parser.add_argument("--force", action="store_true", help="바뀐 달과 관계없이 전체 재계산")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    refreshed = refresh_rollups(get_engine(), args.pollutants or None, force=args.force)
+    for pollutant, n in refreshed.items():
+        print(f"{pollutant}: {n}개월 갱신")
+    print(f"롤업 갱신 완료 ({time.perf_counter() - start:.2f}s, 테이블: {', '.join(ROLLUP_TABLES)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# scripts/schema.py
+
+import datetime
+
+"""
+DB 스키마 정의 (차원 테이블 + 사실 테이블)
+- 지역/연령군은 region_dim, age_group_dim의 정수 키로 참조
+- 질환 사실 테이블은 (ym, region_id, age_group, gender) 복합 PK = 클러스터드 커버링 인덱스,
+  지역 우선 조회용 (region_id, ym) 보조 인덱스
+- MySQL에서는 질환 사실 테이블을 ym 연도 단위 RANGE COLUMNS 파티션으로 분할
+  (MySQL은 파티션 테이블에 FK를 허용하지 않으므로 차원 키 검증은 적재 단계에서 수행)
+- 오염물질 사실 테이블은 지역×월 수천 행 규모라 파티션 없이 date_dim/region_dim FK 유지
+- 롤업 테이블(scripts/rollups.py가 갱신): 월×지역, 월×전국, 월×지역×연령군, 계절×지역
+  각 행에 오염물질 농도와 질환별 진료 건수 합계를 함께 저장 (pollutant 컬럼으로 PM10/PM2.5 구분)
+- dialect별 DDL: 'mysql'은 InnoDB/utf8mb4/파티션 옵션, 그 외(sqlite, duckdb 등)는 표준 DDL만 사용
+"""
+
+POLLUTANT_KEYS = ["pm10", "pm25"]
+DISEASE_KEYS = ["asthma", "rhinitis"]
+
+# 차원 테이블 → 사실 테이블 순서로 적재 (사실 테이블이 차원 키를 참조)
+DIMENSION_TABLES = ["date_dim", "age_group_dim", "region_dim"]
+POLLUTANT_FACTS = {p: f"{p}_fact" for p in POLLUTANT_KEYS}
+CLAIMS_FACTS = {(p, d): f"{p}_{d}_fact" for d in DISEASE_KEYS for p in POLLUTANT_KEYS}
+FACT_TABLES = list(POLLUTANT_FACTS.values()) + list(CLAIMS_FACTS.values())
+
+# 롤업 테이블 (사실 테이블 재적재 시 함께 DROP 후 재생성)
+ROLLUP_TABLES = [
+    "rollup_month_region",
+    "rollup_month_national",
+    "rollup_month_region_age",
+    "rollup_season_region",
+]
+# 롤업 증분 갱신용 사실 테이블 월별 서명 (행 수, 합계)
+ROLLUP_STATE_TABLE = "rollup_state"
+
+# 적재 세대 카운터 (init_database가 적재 후 +1, DustDB 결과 캐시 무효화에 사용)
+# 재적재 시에도 DROP하지 않아 세대가 계속 증가함
+LOAD_GENERATION_TABLE = "load_generation"
+
+# 일괄 예측 결과 (src/modeling/forecast.py --db가 통째로 다시 적재, 재적재 시 DROP하지 않음)
+FORECAST_TABLE = "forecast"
+
+# 파티션 시작 연도 (date_dim 기준 첫 해)
+PARTITION_FIRST_YEAR = 2006
+
+_MYSQL_TABLE_OPTIONS = " ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+
+
+def year_partitions(first_year=PARTITION_FIRST_YEAR, last_year=None):
+    """
+    ym(CHAR(6), 'YYYYMM') 연도 단위 RANGE COLUMNS 파티션 절을 만듭니다.
+    - last_year 기본값은 올해 + 1, 그 이후 데이터는 pmax 파티션에 저장
+    """
+    last_year = last_year or datetime.date.today().year + 1
+    parts = [
+        f"PARTITION p{y} VALUES LESS THAN ('{y + 1}01')"
+        for y in range(first_year, last_year + 1)
+    ]
+    parts.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return "\n        PARTITION BY RANGE COLUMNS(ym) (\n            " + ",\n            ".join(parts) + "\n        )"
+
+
+def schema_ddl(dialect="mysql", last_year=None):
+    """
+    CREATE TABLE / CREATE INDEX 문 리스트를 반환합니다 (차원 테이블 먼저).
+    """
+    mysql = dialect == "mysql"
+    options = _MYSQL_TABLE_OPTIONS if mysql else ""
+
+    ddl = [
+        # date_dim
+        f"""
+        CREATE TABLE IF NOT EXISTS date_dim (
+            date_id CHAR(6) PRIMARY KEY,
+            year SMALLINT NOT NULL,
+            month SMALLINT NOT NULL,
+            quarter SMALLINT NOT NULL,
+            season VARCHAR(10) NOT NULL
+        ){options}
+        """,
+
+        # age_group_dim (age_group: reference_agegroup_mapping의 구분 코드)
+        f"""
+        CREATE TABLE IF NOT EXISTS age_group_dim (
+            age_group SMALLINT PRIMARY KEY,
+            age_range VARCHAR(20)
+        ){options}
+        """,
+
+        # region_dim (PM 전처리 결과의 지역 컬럼)
+        f"""
+        CREATE TABLE IF NOT EXISTS region_dim (
+            region_id SMALLINT PRIMARY KEY,
+            region_name VARCHAR(50) NOT NULL UNIQUE
+        ){options}
+        """,
+
+        # load_generation (단일 행)
+        f"""
+        CREATE TABLE IF NOT EXISTS {LOAD_GENERATION_TABLE} (
+            id SMALLINT PRIMARY KEY,
+            generation INT NOT NULL,
+            loaded_at CHAR(19) NOT NULL
+        ){options}
+        """,
+
+        # forecast (지역 × 질환 × 시나리오 × 예측 월)
+        f"""
+        CREATE TABLE IF NOT EXISTS {FORECAST_TABLE} (
+            pollutant VARCHAR(10) NOT NULL,
+            disease VARCHAR(20) NOT NULL,
+            region_name VARCHAR(50) NOT NULL,
+            scenario VARCHAR(20) NOT NULL,
+            horizon SMALLINT NOT NULL,
+            ym CHAR(6) NOT NULL,
+            level DOUBLE,
+            forecast_value DOUBLE,
+            lower_bound DOUBLE,
+            upper_bound DOUBLE,
+            PRIMARY KEY (pollutant, disease, region_name, scenario, ym)
+        ){options}
+        """,
+    ]
+
+    # pm10_fact / pm25_fact (오염물질 농도)
+    for pollutant, table in POLLUTANT_FACTS.items():
+        ddl.append(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            date_id CHAR(6) NOT NULL,
+            region_id SMALLINT NOT NULL,
+            {pollutant} DECIMAL(5,2),
+            PRIMARY KEY (date_id, region_id),
+            FOREIGN KEY (date_id) REFERENCES date_dim(date_id),
+            FOREIGN KEY (region_id) REFERENCES region_dim(region_id)
+        ){options}
+        """)
+        ddl.append(f"CREATE INDEX ix_{table}_region ON {table} (region_id, date_id)")
+
+    # 질환 × 오염물질 사실 테이블 (진료 에피소드 건수)
+    partitions = year_partitions(last_year=last_year) if mysql else ""
+    for table in CLAIMS_FACTS.values():
+        ddl.append(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            ym CHAR(6) NOT NULL,
+            region_id SMALLINT NOT NULL,
+            age_group SMALLINT NOT NULL,
+            gender VARCHAR(10) NOT NULL,
+            visit_count INT NOT NULL,
+            PRIMARY KEY (ym, region_id, age_group, gender)
+        ){options}{partitions}
+        """)
+        ddl.append(f"CREATE INDEX ix_{table}_region_ym ON {table} (region_id, ym)")
+
+    ddl += rollup_ddl(dialect)
+    return ddl
+
+
+def rollup_ddl(dialect="mysql"):
+    """
+    롤업 테이블과 롤업 상태 테이블의 CREATE 문 리스트를 반환합니다.
+    - 질환별 진료 건수 컬럼: <질환>_visits (해당 월·지역에 진료 데이터가 없으면 NULL)
+    """
+    options = _MYSQL_TABLE_OPTIONS if dialect == "mysql" else ""
+    visits = "".join(f"\n            {d}_visits BIGINT," for d in DISEASE_KEYS)
+    grains = {
+        "rollup_month_region":     (["ym CHAR(6) NOT NULL", "region_id SMALLINT NOT NULL"],
+                                    ["ym", "region_id"]),
+        "rollup_month_national":   (["ym CHAR(6) NOT NULL", "n_regions SMALLINT NOT NULL"],
+                                    ["ym"]),
+        "rollup_month_region_age": (["ym CHAR(6) NOT NULL", "region_id SMALLINT NOT NULL", "age_group SMALLINT NOT NULL"],
+                                    ["ym", "region_id", "age_group"]),
+        "rollup_season_region":    (["season VARCHAR(10) NOT NULL", "region_id SMALLINT NOT NULL", "n_months SMALLINT NOT NULL"],
+                                    ["season", "region_id"]),
+    }
+    ddl = []
+    for table in ROLLUP_TABLES:
+        columns, key = grains[table]
+        cols = "".join(f"\n            {c}," for c in columns)
+        ddl.append(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            pollutant VARCHAR(10) NOT NULL,{cols}
+            pm_level DOUBLE,{visits}
+            PRIMARY KEY (pollutant, {", ".join(key)})
+        ){options}
+        """)
+
+    ddl.append(f"""
+        CREATE TABLE IF NOT EXISTS {ROLLUP_STATE_TABLE} (
+            source_table VARCHAR(40) NOT NULL,
+            ym CHAR(6) NOT NULL,
+            n_rows BIGINT NOT NULL,
+            total DOUBLE,
+            PRIMARY KEY (source_table, ym)
+        ){options}
+        """)
+    return ddl
@@ -26,10 +26,20 @@ setup(
         "numpy>=1.21.0",
         "sqlalchemy>=1.4.0",
         "PyMySQL>=1.0.2",
+        "pyarrow>=7.0.0",
         "streamlit>=1.0.0",
         "scikit-learn>=1.0.0",     
     ],
 
+    # 선택 기능: pip install -e .[duckdb] → DB_BACKEND=duckdb (서버 없는 로컬 DB)
+    extras_require={
+        "duckdb": ["duckdb>=0.9.0", "duckdb-engine>=0.9.0"],
+        # pip install -e .[models] → src/modeling/train.py의 xgb, lgbm 후보
+        "models": ["xgboost>=1.7.0", "lightgbm>=3.3.0"],
+        # pip install -e .[prophet] → src/modeling/prophet_models.py, streamlit_prophet_app.py
+        "prophet": ["prophet>=1.1"],
+    },
+
     python_requires=">=3.8",   
     include_package_data=True,
     classifiers=[
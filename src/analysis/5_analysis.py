@@ -13,15 +13,16 @@ import pandas as pd
 import re
 import datetime
 from scripts.data_loader import load_data
+from src.analysis.coefficients import load_coefficients
+from src.modeling.batch_ols import grouped_ols
+from src.modeling.batch_glm import load_glms
 
 
 import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
-import statsmodels.formula.api as smf
 from pathlib import Path
 from scripts.data_loader import load_data
-import statsmodels.api as sm
 
 # 한글 폰트 설정
 import matplotlib.pyplot as plt
@@ -32,7 +33,7 @@ plt.rcParams['axes.unicode_minus'] = False
 @st.cache
 def prepare():
     # 천식-PM10 전처리 데이터 로드
-    asthma_df = load_data('pm10_asthma_processed_v1', section='processed')
+    asthma_df = load_data('pm10_asthma_processed_v1', section='processed', compact=True)
     
     # 날짜 매핑(season 붙이기)
     date_map = load_data('date_map', section='reference')
@@ -67,28 +68,19 @@ def prepare():
     # EDA용 데이터프레임 결합
     eda_df = monthly.merge(pm10_avg, on='year_month', how='left')
     
-    # 지역별 PM10-진료 기울기 계산
-    #    (지역·월별 진료 합계와 pm10을 병합한 뒤 회귀)
-    df2 = (
-        asthma_df
-        .groupby(['year_month','region'], as_index=False)['visit_count']
-        .sum()
-        .merge(pm10_long, on=['year_month','region'], how='left')
+    # 지역별 PM10-진료 기울기 (ETL 후 미리 계산된 회귀 계수 저장소에서 조회)
+    slopes_df = (
+        load_coefficients('pm10', 'asthma', lag=0)[['region', 'slope']]
+        .rename(columns={'slope': 'coef'})
     )
-    slopes = {}
-    for region, sub in df2.groupby('region'):
-        if len(sub) < 10:
-            continue
-        model = smf.ols('visit_count ~ pm10', data=sub).fit()
-        slopes[region] = model.params['pm10']
-    slopes_df = pd.DataFrame({
-        'region': list(slopes.keys()),
-        'coef':   list(slopes.values())
-    })
     
     return eda_df, slopes_df
 
-eda_df, slopes_df = prepare()
+try:
+    eda_df, slopes_df = prepare()
+except FileNotFoundError:
+    st.info("회귀 계수 저장소가 없습니다. `python src/analysis/coefficients.py`를 실행해 계수를 계산하세요.")
+    st.stop()
 
 st.title("5번 가설 — 계절별 PM10↔천식 진료")
 
@@ -99,23 +91,37 @@ st.dataframe(seasonal_stats)
 
 # EDA: 산점도·회귀
 st.header("계절별 산점도 & 회귀선")
+# 계절별 회귀선은 한 번에 계산 (계절마다 formula 적합을 반복하지 않음)
+season_fits = grouped_ols(eda_df, 'pm10', 'total_visit_count', by='season').set_index('season')
 for s in eda_df['season'].unique():
     sub = eda_df[eda_df['season']==s]
     fig, ax = plt.subplots()
     ax.scatter(sub['pm10'], sub['total_visit_count'])
-    m = smf.ols('total_visit_count~pm10', data=sub).fit()
+    m = season_fits.loc[s]
     x0 = np.linspace(sub['pm10'].min(), sub['pm10'].max(), 100)
-    ax.plot(x0, m.params['Intercept']+m.params['pm10']*x0, color='red')
+    ax.plot(x0, m['intercept']+m['slope']*x0, color='red')
     ax.set_title(f"{s} 계절")
     st.pyplot(fig)
 
 # 모델: Poisson & NB GLM
 st.header("Poisson / Negative Binomial GLM 결과")
-poisson = smf.glm('total_visit_count~pm10*season', data=eda_df, family=sm.families.Poisson()).fit()
-st.text(poisson.summary().as_text())
-
-nb = smf.glm('total_visit_count~pm10*season', data=eda_df, family=sm.families.NegativeBinomial()).fit()
-st.text(nb.summary().as_text())
+# src/modeling/batch_glm.py가 미리 적합해 저장한 결과를 읽기만 함 (화면에서는 적합하지 않음)
+try:
+    glm_df = load_glms('pm10', 'asthma', scope='national')
+    region_glm = load_glms('pm10', 'asthma', scope='region')
+except FileNotFoundError:
+    st.info("GLM 적합 결과가 없습니다. `python src/modeling/batch_glm.py`를 실행해 모형을 적합하세요.")
+    st.stop()
+for family, label in [('poisson', 'Poisson'), ('negbin', 'Negative Binomial')]:
+    st.subheader(label)
+    st.dataframe(glm_df[glm_df['family'] == family][['term', 'coef', 'se', 'p_value', 'deviance', 'aic']])
+
+# 지역별 같은 모형의 PM10 주효과 (봄·여름·겨울은 상호작용 항을 더해 해석)
+st.subheader("지역별 Poisson GLM PM10 계수")
+st.dataframe(
+    region_glm[(region_glm['family'] == 'poisson') & (region_glm['term'] == 'pm10')]
+    [['region', 'coef', 'se', 'p_value', 'n']]
+)
 
 # 지도 시각화
 st.header("지역별 PM10 효과 기울기 (β)")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# src/analysis/coefficients.py
+
+import sys
+import json
+import time
+import argparse
+import datetime
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import pandas as pd
+from scripts.data_loader import load_data, data_fingerprint
+from src.etl.pollutant_etl import POLLUTANTS
+from src.etl.claims_etl import DISEASES
+from src.etl.watermark import normalize_year_month
+from src.modeling.batch_ols import grouped_ols, statsmodels_parity
+
+"""
+지역별 회귀 계수 저장소 (진료 건수 ~ 오염물질 농도)
+- 오염물질 × 질환 × 시차(lag) × 지역마다 기울기, 절편, 표준오차, p-value, R², 관측 수를 저장
+- 지역·월별 진료 건수 합계와 lag개월 전 농도를 결합해 단순 회귀 (lag=0은 기존 대시보드의 기울기와 동일)
+- 모든 조합의 패널을 이어 붙인 뒤 src/modeling/batch_ols.grouped_ols로 한 번에 계산
+- 결과는 data/processed/region_coefficients.parquet, 입력 파일 지문은 옆의 .json 메타 파일에 기록
+- 대시보드는 load_coefficients()로 읽기만 함 — 다시 계산은 이 스크립트(build_store)가 입력 파일 지문이 달라졌을 때만 수행
+- run.py가 ETL/DB 적재 뒤에 이 스크립트를 실행해 저장소를 미리 만들어 둠
+"""
+
+# 진료 건수와 결합할 농도의 시차 (개월)
+LAGS = [0, 1, 2, 3]
+
+# 이보다 관측 월 수가 적은 지역은 회귀하지 않음
+MIN_OBS = 10
+
+STORE_PATH = BASE_DIR / 'data' / 'processed' / 'region_coefficients.parquet'
+META_PATH = STORE_PATH.with_suffix('.json')
+
+COLUMNS = [
+    'pollutant', 'disease', 'lag', 'region', 'n',
+    'slope', 'intercept', 'slope_se', 'intercept_se', 'p_value', 'r2',
+]
+
+
+def input_keys(pollutants=None, diseases=None):
+    """
+    계수 계산에 쓰이는 전처리 데이터 키 목록 (data_fingerprint 입력)
+    """
+    keys = []
+    for pollutant in (pollutants or POLLUTANTS):
+        keys.append((f'{pollutant}_processed_v1', 'processed'))
+        keys += [(f'{pollutant}_{disease}_processed_v1', 'processed') for disease in (diseases or DISEASES)]
+    return keys
+
+
+def _month_ordinals(values):
+    """
+    year_month 값('YYYY-MM', 202301 등)을 월 서수(Period ordinal)로 바꿉니다 (고유값만 변환).
+    """
+    values = pd.Series(values)
+    lookup = {v: pd.Period(normalize_year_month(v), freq='M').ordinal for v in pd.unique(values.dropna())}
+    return values.map(lookup)
+
+
+def region_panel(pollutant, disease):
+    """
+    지역·월별 진료 건수 합계와 농도를 반환합니다.
+    - 반환: (visits[month, region, visit_count], levels[month, region, level])
+    """
+    claims = load_data(f'{pollutant}_{disease}_processed_v1', section='processed', compact=True)
+    visits = claims.groupby(['year_month', 'region'], as_index=False, observed=True)['visit_count'].sum()
+    visits['month'] = _month_ordinals(visits['year_month'])
+    visits['region'] = visits['region'].astype(str)
+
+    wide = load_data(f'{pollutant}_processed_v1', section='processed')
+    levels = wide.melt(id_vars='year_month', var_name='region', value_name='level')
+    levels['month'] = _month_ordinals(levels['year_month'])
+    return visits[['month', 'region', 'visit_count']], levels[['month', 'region', 'level']]
+
+
+def lagged_panel(visits, levels, lag=0):
+    """
+    t월 진료 건수와 (t - lag)월 농도를 지역별로 결합합니다 (농도 결측 행 제외).
+    """
+    shifted = levels.assign(month=levels['month'] + lag)
+    return visits.merge(shifted, on=['month', 'region'], how='inner').dropna(subset=['level'])
+
+
+def coefficient_panel(pollutants=None, diseases=None, lags=LAGS):
+    """
+    모든 오염물질 × 질환 × 시차 패널을 하나로 이어 붙여 반환합니다.
+    """
+    frames = []
+    for pollutant in (pollutants or POLLUTANTS):
+        for disease in (diseases or DISEASES):
+            visits, levels = region_panel(pollutant, disease)
+            for lag in lags:
+                frames.append(lagged_panel(visits, levels, lag).assign(pollutant=pollutant, disease=disease, lag=lag))
+    if not frames:
+        return pd.DataFrame(columns=['pollutant', 'disease', 'lag', 'month', 'region', 'visit_count', 'level'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_coefficients(pollutants=None, diseases=None, lags=LAGS, min_obs=MIN_OBS, panel=None):
+    """
+    오염물질 × 질환 × 시차 × 지역 회귀 계수 표를 계산합니다.
+    - 관측 수가 min_obs보다 적거나 농도가 모두 같은(기울기를 정의할 수 없는) 지역은 제외
+    """
+    if panel is None:
+        panel = coefficient_panel(pollutants, diseases, lags)
+    coef = grouped_ols(panel, 'level', 'visit_count', by=COLUMNS[:4])
+    coef = coef[(coef['n'] >= min_obs) & coef['slope'].notna()]
+    return coef[COLUMNS].reset_index(drop=True)
+
+
+def _read_meta():
+    if not META_PATH.exists():
+        return None
+    with open(META_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _current_meta(lags, min_obs):
+    return {'fingerprint': data_fingerprint(input_keys()), 'lags': list(lags), 'min_obs': min_obs}
+
+
+def is_stale(lags=LAGS, min_obs=MIN_OBS):
+    """
+    저장소가 없거나 입력 파일/설정이 저장 당시와 달라졌으면 True
+    - 입력 파일을 찾을 수 없으면(배포 환경 등) 저장소가 있는 한 그대로 사용
+    """
+    meta = _read_meta()
+    if meta is None or not STORE_PATH.exists():
+        return True
+    try:
+        current = _current_meta(lags, min_obs)
+    except FileNotFoundError:
+        return False
+    return any(meta.get(k) != v for k, v in current.items())
+
+
+def build_store(force=False, lags=LAGS, min_obs=MIN_OBS):
+    """
+    회귀 계수 저장소를 (필요하면) 다시 계산해 저장하고, 저장소 경로를 반환합니다.
+    - force: True면 지문과 관계없이 다시 계산
+    """
+    if not force and not is_stale(lags, min_obs):
+        return STORE_PATH
+
+    meta = _current_meta(lags, min_obs)
+    coef = compute_coefficients(lags=lags, min_obs=min_obs)
+
+    STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STORE_PATH.with_suffix('.parquet.tmp')
+    coef.to_parquet(tmp, index=False)
+    tmp.replace(STORE_PATH)
+
+    meta['rows'] = len(coef)
+    meta['created_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    tmp = META_PATH.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    tmp.replace(META_PATH)
+    return STORE_PATH
+
+
+def load_coefficients(pollutant=None, disease=None, lag=None, rebuild=False):
+    """
+    저장된 회귀 계수를 조건에 맞게 읽어 반환합니다.
+    - pollutant, disease, lag: None이면 전체
+    - rebuild: True면 저장소가 없거나 오래됐을 때 먼저 다시 계산
+      (대시보드는 읽기만 하므로 기본 False, 계산은 이 스크립트 또는 run.py)
+    """
+    if rebuild:
+        build_store()
+    if not STORE_PATH.exists():
+        raise FileNotFoundError(f"Coefficient store not found: {STORE_PATH} (run src/analysis/coefficients.py)")
+    filters = [
+        (col, '==', value)
+        for col, value in (('pollutant', pollutant), ('disease', disease), ('lag', lag))
+        if value is not None
+    ]
+    return pd.read_parquet(STORE_PATH, filters=filters or None).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지역별 회귀 계수 저장소 생성")
+    parser.add_argument('--force', action='store_true', help="입력 지문과 관계없이 다시 계산")
+    parser.add_argument('--check', action='store_true', help="일부 셀을 statsmodels OLS 적합과 비교")
+    args = parser.parse_args()
+
+    if args.check:
+        panel = coefficient_panel()
+        errors = statsmodels_parity(panel, 'level', 'visit_count', by=COLUMNS[:4], max_groups=200)
+        for col, err in errors.items():
+            print(f"{col:>13}: 최대 상대 오차 {err:.2e}")
+        return
+
+    start = time.perf_counter()
+    stale = args.force or is_stale()
+    path = build_store(force=args.force)
+    status = "계산" if stale else "최신 상태 (건너뜀)"
+    print(f"회귀 계수 저장소 {status}: {path} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# src/analysis/dashboard_panel.py
+
+import sys
+import json
+import time
+import argparse
+import datetime
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+import pandas as pd
+from scripts.data_loader import load_data, data_fingerprint
+from src.etl.claims_etl import DISEASES
+from src.etl.watermark import normalize_year_month
+
+"""
+환자 수 예측 대시보드(streamlit_ex.py)용 지역 패널 저장소
+- 패널: 지역 × 월별 PM10, PM2.5 월평균 농도와 호흡기 진료 건수 합계(천식 + 비염)
+  (진료 데이터는 PM10 지역 집합으로 투영된 전처리 결과를 사용 → 전처리 데이터의 모든 지역)
+- 분해표: 지역 × 월 × (연령대 | 진단)별 진료 건수 — groupby 한 번씩으로 계산
+- 대기질 등급별 분해는 패널의 월평균 농도를 등급(좋음~위험)으로 나눠 화면에서 합산 (grade_breakdown)
+- 결과는 data/processed/dashboard/ 아래 Parquet, 입력 파일 지문은 옆 .json에 기록
+  — 대시보드는 load_panel()로 읽기만 하고, 다시 계산은 이 스크립트(run.py)가 입력 파일이 바뀌었을 때만 수행
+"""
+
+PANEL_DIR = BASE_DIR / 'data' / 'processed' / 'dashboard'
+PANEL_PATH = PANEL_DIR / 'panel.parquet'
+BREAKDOWN_PATH = PANEL_DIR / 'breakdown.parquet'
+META_PATH = PANEL_DIR / 'panel.json'
+
+# 진료 건수를 가져올 지역 집합 (claims 전처리 결과의 오염물질 키)
+CLAIMS_POLLUTANT = 'pm10'
+
+DISEASE_LABELS = {'asthma': '천식', 'rhinitis': '비염'}
+
+# 대기질 등급: 농도가 경계값 이하이면 해당 등급 (streamlit_ex.py pm_color와 같은 경계)
+GRADE_LABELS = ['좋음', '보통', '나쁨', '매우나쁨', '위험']
+GRADE_BINS = {
+    'pm10': [30, 80, 150, 600],
+    'pm25': [15, 35, 75, 500],
+}
+
+PANEL_COLUMNS = ['region', 'year_month', 'pm10', 'pm25', 'visit_count']
+BREAKDOWN_COLUMNS = ['region', 'year_month', 'kind', 'category', 'visit_count']
+
+
+def input_keys():
+    """
+    패널 계산에 쓰이는 데이터 키 목록 (data_fingerprint 입력)
+    """
+    keys = [('pm10_processed_v1', 'processed'), ('pm25_processed_v1', 'processed'), ('agegroup_map', 'reference')]
+    keys += [(f'{CLAIMS_POLLUTANT}_{d}_processed_v1', 'processed') for d in DISEASES]
+    return keys
+
+
+def _year_months(values):
+    """
+    year_month 값을 'YYYY-MM' 문자열로 바꿉니다 (고유값만 변환).
+    """
+    values = pd.Series(values)
+    lookup = {v: normalize_year_month(v) for v in pd.unique(values.dropna())}
+    return values.map(lookup)
+
+
+def _age_labels():
+    """
+    연령군 코드 → 표시 이름 ('0-5' → '0-5세', 마지막 구간 '65' → '65세 이상')
+    """
+    age_map = load_data('agegroup_map', section='reference')
+    return {
+        str(code): f'{age}세' if '-' in str(age) else f'{age}세 이상'
+        for code, age in zip(age_map['구분'], age_map['나이'])
+    }
+
+
+def pm_grade(values, pollutant='pm10'):
+    """
+    농도 배열을 대기질 등급 Categorical로 바꿉니다 (결측은 결측).
+    """
+    values = np.asarray(values, dtype=float)
+    codes = np.searchsorted(GRADE_BINS[pollutant], values, side='left')
+    codes = np.where(np.isnan(values), -1, codes)
+    return pd.Categorical.from_codes(codes, categories=GRADE_LABELS)
+
+
+def build_frames():
+    """
+    패널과 분해표를 계산합니다 (저장 없이).
+    - 반환: (panel[PANEL_COLUMNS], breakdown[BREAKDOWN_COLUMNS])
+    """
+    claims = []
+    for disease in DISEASES:
+        df = load_data(f'{CLAIMS_POLLUTANT}_{disease}_processed_v1', section='processed', compact=True)
+        df = df.groupby(['year_month', 'region', 'age_group'], as_index=False, observed=True)['visit_count'].sum()
+        claims.append(df.assign(disease=DISEASE_LABELS.get(disease, disease)))
+    claims = pd.concat(claims, ignore_index=True)
+    claims['year_month'] = _year_months(claims['year_month'].astype(str))
+    claims['region'] = claims['region'].astype(str)
+    age_labels = _age_labels()
+    claims['age_group'] = claims['age_group'].astype(str).map(age_labels).fillna(claims['age_group'].astype(str))
+    claims['visit_count'] = claims['visit_count'].astype('int64')
+
+    by = ['region', 'year_month']
+    breakdown = pd.concat([
+        claims.groupby(by + ['age_group'], as_index=False)['visit_count'].sum()
+              .rename(columns={'age_group': 'category'}).assign(kind='age'),
+        claims.groupby(by + ['disease'], as_index=False)['visit_count'].sum()
+              .rename(columns={'disease': 'category'}).assign(kind='diagnosis'),
+    ], ignore_index=True)[BREAKDOWN_COLUMNS]
+
+    panel = claims.groupby(by, as_index=False)['visit_count'].sum()
+    for pollutant in ('pm10', 'pm25'):
+        wide = load_data(f'{pollutant}_processed_v1', section='processed')
+        levels = wide.melt(id_vars='year_month', var_name='region', value_name=pollutant)
+        levels['year_month'] = _year_months(levels['year_month'])
+        levels[pollutant] = pd.to_numeric(levels[pollutant], errors='coerce')
+        levels = levels.drop_duplicates(by, keep='last')
+        panel = panel.merge(levels, on=by, how='left')
+
+    panel = panel[PANEL_COLUMNS].sort_values(by).reset_index(drop=True)
+    # 분류 순서: 연령대는 연령군 코드 순, 진단은 DISEASES 순
+    order = {label: i for i, label in enumerate(list(age_labels.values()) + list(DISEASE_LABELS.values()))}
+    breakdown['order'] = breakdown['category'].map(order).fillna(len(order))
+    breakdown = breakdown.sort_values(by + ['kind', 'order', 'category']).drop(columns='order').reset_index(drop=True)
+    return panel, breakdown
+
+
+def grade_breakdown(levels, visit_counts, pollutant='pm10'):
+    """
+    월별 진료 건수를 그 달 농도의 대기질 등급별로 합산합니다 (모든 등급 포함).
+    - levels, visit_counts: 같은 길이의 월평균 농도, 진료 건수 배열
+    - 반환: DataFrame[category, visit_count]
+    """
+    grades = pm_grade(levels, pollutant)
+    totals = pd.Series(np.asarray(visit_counts), name='visit_count').groupby(grades, observed=False).sum()
+    return totals.rename_axis('category').reset_index()
+
+
+def _current_meta():
+    return {'fingerprint': data_fingerprint(input_keys()), 'claims_pollutant': CLAIMS_POLLUTANT}
+
+
+def is_stale():
+    """
+    패널이 없거나 입력 파일이 바뀌었으면 True (입력 파일이 없으면 저장된 패널 사용)
+    """
+    if not (PANEL_PATH.exists() and BREAKDOWN_PATH.exists() and META_PATH.exists()):
+        return True
+    with open(META_PATH, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    try:
+        current = _current_meta()
+    except FileNotFoundError:
+        return False
+    return any(meta.get(k) != v for k, v in current.items())
+
+
+def build_panel(force=False):
+    """
+    패널과 분해표를 (필요하면) 다시 계산해 저장하고 패널 경로를 반환합니다.
+    """
+    if not force and not is_stale():
+        return PANEL_PATH
+    meta = _current_meta()
+    panel, breakdown = build_frames()
+
+    PANEL_DIR.mkdir(parents=True, exist_ok=True)
+    for frame, path in ((panel, PANEL_PATH), (breakdown, BREAKDOWN_PATH)):
+        tmp = path.with_suffix('.parquet.tmp')
+        frame.to_parquet(tmp, index=False)
+        tmp.replace(path)
+    meta['rows'] = {'panel': len(panel), 'breakdown': len(breakdown)}
+    meta['created_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    tmp = META_PATH.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    tmp.replace(META_PATH)
+    return PANEL_PATH
+
+
+def load_panel(rebuild=False):
+    """
+    저장된 패널과 분해표를 반환합니다: (panel, breakdown)
+    - rebuild: True면 입력 지문이 바뀌었을 때 먼저 다시 계산 (대시보드는 읽기만 하므로 기본 False)
+    """
+    if rebuild:
+        build_panel()
+    if not (PANEL_PATH.exists() and BREAKDOWN_PATH.exists()):
+        raise FileNotFoundError(f"Dashboard panel not found: {PANEL_DIR} (run src/analysis/dashboard_panel.py)")
+    return pd.read_parquet(PANEL_PATH), pd.read_parquet(BREAKDOWN_PATH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="환자 수 예측 대시보드용 지역 패널 생성")
+    parser.add_argument('--force', action='store_true', help="입력 지문과 관계없이 다시 계산")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stale = args.force or is_stale()
+    path = build_panel(force=args.force)
+    panel = pd.read_parquet(path)
+    status = "계산" if stale else "최신 상태 (건너뜀)"
+    print(f"대시보드 패널 {status}: {panel['region'].nunique()}개 지역 × "
+          f"{panel['year_month'].nunique()}개월 ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
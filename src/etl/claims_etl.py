@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import pandas as pd
+import datetime
+from scripts.data_loader import load_data, load_file, load_columns, compact_claims, category_vocabulary
+from src.etl.pollutant_etl import POLLUTANTS
+from src.etl.watermark import read_watermark, write_watermark, normalize_year_month
+
+"""
+호흡기 질환(천식, 비염) 진료 데이터와 대기오염 지역 단위를 결합하는 공용 ETL 엔진
+- 원본을 (year_month, province_name, district_name, gender, age_group) 단위로 한 번만 집계
+- district_name → region 매핑은 고유 district_name마다 한 번만 계산 (dict 조회)
+- 광역시/특별자치시는 province_name 기준, 나머지는 district_name의 province 접두사 기준
+- 한 번 집계한 결과를 PM10, PM2.5 지역 집합으로 각각 투영
+- 지역/성별/연령군은 공용 어휘 기반 Categorical, visit_count는 작은 정수형으로 유지 (compact_claims)
+- --incremental: 워터마크 이후 달의 진료 행만 집계해 기존 결과에 이어 붙임 (월별 집계는 서로 독립)
+"""
+
+# key: 출력 파일 이름, source: data.raw.<source> 키
+DISEASES = {
+    'asthma':   {'source': 'asthma'},
+    'rhinitis': {'source': 'rhinitis'},
+}
+
+# 광역시·특별자치시 리스트
+METROS = [
+    '서울특별시','부산광역시','대구광역시','인천광역시',
+    '광주광역시','대전광역시','울산광역시','세종특별자치시'
+]
+
+# 원본 컬럼명 → 영어 컬럼명
+CLAIMS_COLUMNS = {
+    '요양개시연월':      'year_month',
+    '시도명':            'province_name',
+    '시군구명':          'district_name',
+    '성별':              'gender',
+    '연령군':            'age_group',
+    '진료에피소드 건수': 'visit_count'
+}
+
+GROUP_KEYS = ['year_month', 'region', 'gender', 'age_group']
+
+
+def load_claims(disease, vocabulary=None):
+    """
+    질환 원본 데이터를 로드하고 컬럼명을 영어로 변경한 뒤 compact 형태로 변환합니다.
+    """
+    hosp_df = load_data(DISEASES[disease]['source'], section='raw')
+    return compact_claims(hosp_df.rename(columns=CLAIMS_COLUMNS), vocabulary)
+
+
+def load_province_sets(pollutants=None):
+    """
+    오염물질별 전처리 결과 파일의 헤더에서 지역(province) 리스트를 추출합니다.
+    """
+    return {
+        key: [c for c in load_columns(f'{key}_processed_v1', section='processed') if c != 'year_month']
+        for key in (pollutants or POLLUTANTS)
+    }
+
+
+def build_region_lookup(district_names, provinces):
+    """
+    고유 district_name → region 매핑 dict를 만듭니다.
+    - provinces 순서대로 처음 일치하는 접두사를 사용 (기존 '^(a|b|...)' 정규식과 동일한 규칙)
+    - 일치하는 접두사가 없으면 매핑하지 않음 (집계에서 제외)
+    """
+    lookup = {}
+    for name in district_names:
+        if not isinstance(name, str):
+            continue
+        for p in provinces:
+            if name.startswith(p):
+                lookup[name] = p
+                break
+    return lookup
+
+
+def compress_claims(df):
+    """
+    원본 진료 데이터를 (year_month, province_name, district_name, gender, age_group) 단위로 합산합니다.
+    - 이후 오염물질별 투영은 이 작은 중간 결과만 사용
+    - district_name 결측 행도 광역시 집계에 필요하므로 dropna=False로 유지
+    """
+    return (
+        df.groupby(
+            ['year_month','province_name','district_name','gender','age_group'],
+            as_index=False, dropna=False, observed=True, sort=False
+        )['visit_count'].sum()
+    )
+
+
+def project_to_regions(base, provinces):
+    """
+    compress_claims() 결과를 하나의 지역 집합으로 투영하여 region 단위로 집계합니다.
+    """
+    is_metro = base['province_name'].isin(METROS)
+    other_names = pd.unique(base.loc[~is_metro, 'district_name'].dropna())
+    lookup = build_region_lookup(other_names, provinces)
+
+    region = base['district_name'].map(lookup).astype(object)
+    region[is_metro] = base.loc[is_metro, 'province_name'].astype(object)
+
+    result = (
+        base.assign(region=region)
+        .dropna(subset=['region'])
+        .groupby(GROUP_KEYS, as_index=False, observed=True)['visit_count']
+        .sum()
+    )
+    return result.sort_values(['year_month','region']).reset_index(drop=True)
+
+
+def aggregate_claims(df, province_sets, vocabulary=None):
+    """
+    진료 데이터를 한 번 집계한 뒤 오염물질별 지역 집합으로 투영합니다.
+    - province_sets: {오염물질 키: province 리스트}
+    - 반환: {오염물질 키: 집계 결과 (compact 형태)}
+    """
+    base = compress_claims(df)
+    return {
+        key: compact_claims(project_to_regions(base, provinces), vocabulary)
+        for key, provinces in province_sets.items()
+    }
+
+
+def _year_months(values):
+    """
+    year_month 컬럼을 비교 가능한 'YYYY-MM' 문자열 Series로 변환합니다 (고유값만 변환).
+    """
+    values = pd.Series(values)
+    lookup = {v: normalize_year_month(v) for v in pd.unique(values.dropna())}
+    return values.map(lookup)
+
+
+def run_claims_etl(diseases=None, pollutants=None, out_dir=None, incremental=False):
+    """
+    질환 × 오염물질 조합의 집계 결과를 만들어 저장합니다.
+    - incremental: True면 워터마크 이후 달만 집계해 기존 결과에 병합 (워터마크가 없으면 전체 처리)
+    - 반환: {(오염물질 키, 질환 키): 저장 경로}
+    """
+    province_sets = load_province_sets(pollutants)
+    today = datetime.datetime.now().strftime('%Y%m%d')
+    out_dir = Path(out_dir) if out_dir else BASE_DIR / 'data' / 'processed'
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    vocabulary = category_vocabulary()
+
+    saved = {}
+    for disease in (diseases or DISEASES):
+        marks = {
+            p: read_watermark(f'{p}_{disease}_processed') if incremental else None
+            for p in province_sets
+        }
+        claims = load_claims(disease, vocabulary)
+
+        # 모든 조합에 워터마크가 있으면 가장 이른 워터마크 이후 행만 집계
+        if all(m is not None for m in marks.values()):
+            since = min(m['year_month'] for m in marks.values())
+            claims = claims[(_year_months(claims['year_month']) > since).to_numpy()]
+            if claims.empty:
+                print(f"{disease} is up to date (watermark {since})")
+                saved.update({(p, disease): BASE_DIR / m['output'] for p, m in marks.items()})
+                continue
+
+        results = aggregate_claims(claims, province_sets, vocabulary)
+        for pollutant, result in results.items():
+            mark = marks[pollutant]
+            if mark is not None:
+                new_rows = result[(_year_months(result['year_month']) > mark['year_month']).to_numpy()]
+                existing = load_file(mark['output'])
+                existing = existing[(_year_months(existing['year_month']) <= mark['year_month']).to_numpy()]
+                result = compact_claims(pd.concat([existing, new_rows], ignore_index=True), vocabulary)
+
+            out_path = out_dir / f"{pollutant}_{disease}_processed_{today}_v1.0.xlsx"
+            result.to_excel(out_path, index=False)
+            print(f"Saved {pollutant.upper()}-{disease} data to: {out_path}")
+            write_watermark(f'{pollutant}_{disease}_processed', _year_months(result['year_month']).max(), out_path)
+            saved[(pollutant, disease)] = out_path
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질환 진료 데이터 × 대기오염 지역 집계 ETL")
+    parser.add_argument('diseases', nargs='*', help=f"처리할 질환 (기본: {' '.join(DISEASES)})")
+    parser.add_argument('--incremental', action='store_true', help="워터마크 이후의 새 달만 처리")
+    args = parser.parse_args()
+    run_claims_etl(args.diseases or None, incremental=args.incremental)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# src/etl/imputation.py
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import DateOffset
+
+"""
+관측소×월 행렬 전체를 한 번에 처리하는 결측치 보간 엔진
+- 연속 NaN 구간(run) 길이는 NumPy diff/cumsum으로 한 번에 계산
+- 전년·후년 값은 12개월 이동한 위치(indexer)로 가져와 마스크 연산으로 대체
+- 결과는 기존 컬럼별 루프(fill_mid_na)와 바이트 단위로 동일
+"""
+
+
+def _na_runs(mask):
+    """
+    (T, C) 불리언 마스크에서 연속 True 구간을 찾습니다.
+    - 반환: (run 시작 행, run 컬럼, run 길이) 배열 — 컬럼, 행 순으로 정렬됨
+    """
+    T, C = mask.shape
+    padded = np.zeros((T + 2, C), dtype=np.int8)
+    padded[1:-1] = mask
+    edges = np.diff(padded, axis=0).T          # (C, T+1): +1=시작, -1=끝(미포함)
+    start_c, start_r = np.nonzero(edges == 1)
+    _, end_r = np.nonzero(edges == -1)
+    return start_r, start_c, end_r - start_r
+
+
+def _run_length_matrix(mask):
+    """
+    각 셀이 속한 NaN run의 길이를 (T, C) 행렬로 반환합니다 (NaN이 아니면 0).
+    - run마다 길이만큼 셀 좌표를 펼칠 때 cumsum으로 run 내부 오프셋을 계산
+    """
+    start_r, start_c, lengths = _na_runs(mask)
+    run_len = np.zeros(mask.shape, dtype=np.int64)
+    if len(lengths) == 0:
+        return run_len
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    rows = np.repeat(start_r, lengths) + offsets
+    cols = np.repeat(start_c, lengths)
+    run_len[rows, cols] = np.repeat(lengths, lengths)
+    return run_len
+
+
+def _year_offsets(index, period=12):
+    """
+    각 행의 전년/후년 행 위치를 반환합니다 (없으면 -1).
+    - DatetimeIndex면 DateOffset(years=1)로 날짜를 맞춰 찾고 (월 누락이 있어도 안전)
+    - 그 외 인덱스는 단순히 period 행만큼 이동
+    """
+    n = len(index)
+    if isinstance(index, pd.DatetimeIndex):
+        prev_pos = index.get_indexer(index - DateOffset(years=1))
+        next_pos = index.get_indexer(index + DateOffset(years=1))
+    else:
+        pos = np.arange(n)
+        prev_pos = np.where(pos - period >= 0, pos - period, -1)
+        next_pos = np.where(pos + period < n, pos + period, -1)
+    return prev_pos, next_pos
+
+
+def long_na_columns(df, n=10):
+    """
+    첫 valid 관측 이후 구간에서 연속 n개 이상 NaN이 있는 컬럼 리스트를 반환합니다.
+    - has_mid_long_na()를 모든 컬럼에 적용한 것과 같은 결과
+    """
+    mask = df.isna().to_numpy()
+    valid = ~mask
+    has_valid = valid.any(axis=0)
+    first_valid = np.where(has_valid, valid.argmax(axis=0), mask.shape[0])
+    start_r, start_c, lengths = _na_runs(mask)
+    hit = (start_r > first_valid[start_c]) & (lengths >= n)
+    flagged = np.zeros(mask.shape[1], dtype=bool)
+    flagged[start_c[hit]] = True
+    return [c for c, f in zip(df.columns, flagged & has_valid) if f]
+
+
+def fill_mid_na_frame(df, max_gap=10, period=12):
+    """
+    중간 결측치 보간 (행렬 전체를 한 번에 처리)
+    - 연속 max_gap 미만의 NaN은 전년·후년 값의 평균, 한쪽만 있으면 그 값으로 대체
+    - 앞선 달이 먼저 채워지고 그 값이 다음 해의 '전년 값'으로 쓰이는 기존 순차 동작을 그대로 재현:
+      전년 셀이 아직 채울 대상이면 그 셀이 먼저 확정된 뒤에 계산 (연도 단위 wave 반복)
+    - 후년 값은 항상 원본 값을 사용 (기존 루프에서도 아직 처리되지 않은 시점이므로)
+    """
+    out = df.copy()
+    is_float = np.array([pd.api.types.is_float_dtype(d) for d in df.dtypes], dtype=bool)
+    pos = np.flatnonzero(is_float & df.isna().to_numpy().any(axis=0))
+    if len(pos) == 0:
+        return out
+
+    values = df.iloc[:, pos].to_numpy(dtype=np.float64)
+    mask = np.isnan(values)
+    pending = mask & (_run_length_matrix(mask) < max_gap)
+    prev_pos, next_pos = _year_offsets(df.index, period)
+
+    has_prev = prev_pos >= 0
+    has_next = next_pos >= 0
+    # 후년 값은 원본 기준으로 한 번만 계산
+    next_vals = np.full(values.shape, np.nan)
+    next_vals[has_next] = values[next_pos[has_next]]
+
+    result = values.copy()
+    while pending.any():
+        prev_pending = np.zeros_like(pending)
+        prev_pending[has_prev] = pending[prev_pos[has_prev]]
+        ready = pending & ~prev_pending
+
+        prev_vals = np.full(values.shape, np.nan)
+        prev_vals[has_prev] = result[prev_pos[has_prev]]
+        prev_ok = ~np.isnan(prev_vals)
+        next_ok = ~np.isnan(next_vals)
+
+        filled = np.where(
+            prev_ok & next_ok, (prev_vals + next_vals) / 2,
+            np.where(prev_ok, prev_vals, next_vals)
+        )
+        result[ready] = filled[ready]
+        pending &= ~ready
+
+    out.iloc[:, pos] = result
+    return out
+
+
+def has_mid_long_na(s, n=10):
+    """
+    첫 valid 관측 이후 구간에서 연속 n개 이상 NaN이 있는지 체크
+    """
+    return bool(long_na_columns(s.to_frame(), n=n))
+
+
+def fill_mid_na(s):
+    """
+    중간 결측치 보간: 연속 n 미만의 NaN은 전년·후년 값으로 대체 (단일 시리즈용)
+    """
+    return fill_mid_na_frame(s.to_frame()).iloc[:, 0]
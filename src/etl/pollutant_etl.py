@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+import sys
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Project root
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# Ensure project root on path for imports
+sys.path.insert(0, str(BASE_DIR))
+
+import pandas as pd
+import datetime
+from scripts.data_loader import load_data_many, load_file
+from src.etl.imputation import fill_mid_na_frame, long_na_columns
+from src.etl.watermark import read_watermark, write_watermark, normalize_year_month, shift_year_month
+
+"""
+대기오염물질(PM10, PM2.5, ...) 공용 ETL 엔진
+- 오염물질 목록을 받아 한 번에 처리 (원본 로드는 스레드 풀, 가공은 선택적으로 프로세스 풀)
+- avgcode 매핑 등 참조 테이블은 한 번만 로드
+- '구분' 날짜 라벨은 모든 오염물질의 고유값을 모아 한 번만 파싱
+- --incremental: 워터마크(src/etl/watermark.py) 이후의 새 달과 보간에 필요한 최근 12개월만 다시 계산
+- 새 오염물질(O3, NO2 등)은 config에 원본 경로를 추가하고 POLLUTANTS에 한 줄 추가하면 됨
+"""
+
+# key: 출력 파일 접두사, source: data.raw.<source> 키, label: 로그용 이름
+POLLUTANTS = {
+    'pm10': {'source': 'pm10', 'label': 'PM10'},
+    'pm25': {'source': 'pm25', 'label': 'PM2.5'},
+}
+
+# 첫 valid 관측 이후 이 길이 이상 연속 결측이 있는 관측소는 제거
+LONG_NA_RUN = 10
+
+# 원본에 문자열이 섞여 들어오는 것으로 알려진 관측소 (숫자로 변환, 기존 pm10/pm25 스크립트와 동일)
+TEXT_COLUMNS = ['군산']
+
+# 전년·후년 보간 주기 (개월) — 증분 처리 시 재계산/문맥 구간 길이로도 사용
+YOY_PERIOD = 12
+
+
+def parse_year_month(labels):
+    """
+    '2006.01 월' 형식의 라벨들을 월초 Timestamp로 변환하는 dict를 반환합니다.
+    - 고유 라벨만 한 번 파싱하므로 여러 오염물질에서 재사용 가능
+    """
+    uniq = pd.Series(pd.unique(pd.Series(list(labels), dtype=object).dropna()), dtype=object)
+    parsed = pd.to_datetime(
+        uniq.astype(str)
+            .str.replace(r'\s*월$', '', regex=True)
+            .str.replace('.', '-', n=1, regex=False)
+            .str.strip() + '-01',
+        format='%Y-%m-%d'
+    )
+    return dict(zip(uniq, parsed))
+
+
+def _prepare_frame(df_raw, date_lookup):
+    """
+    '구분' 라벨을 year_month 인덱스로 바꾸고 관측소 컬럼을 숫자형으로 맞춥니다.
+    """
+    # '구분' -> 'year_month' 인덱스 (datetime 변환)
+    df = df_raw.drop(columns=['구분'])
+    df.index = pd.DatetimeIndex(df_raw['구분'].map(date_lookup), name='year_month')
+
+    # 문자열로 들어온 관측소(예: 군산) 숫자 변환
+    # TEXT_COLUMNS 밖의 관측소가 숫자가 아니면 변환하되, 결측이 된 셀 수를 출력
+    for c in df.columns:
+        if pd.api.types.is_numeric_dtype(df[c].dtype):
+            continue
+        converted = pd.to_numeric(df[c], errors='coerce')
+        if c not in TEXT_COLUMNS:
+            lost = int((converted.isna() & df[c].notna()).sum())
+            print(f"Warning: non-numeric station column '{c}' coerced to numeric ({lost} cell(s) set to NaN)")
+        df[c] = converted
+    return df
+
+
+def _to_output(df_filled):
+    # 'day' 제거: YYYY-MM 형식 문자열로 변환
+    df_filled = df_filled.reset_index()
+    df_filled['year_month'] = df_filled['year_month'].dt.to_period('M').astype(str)
+    return df_filled
+
+
+def process_pollutant(df_raw, date_lookup, rename_dict):
+    """
+    원본 wide 데이터(구분 + 관측소 컬럼) 하나를 전처리합니다.
+    - 프로세스 풀에서 실행될 수 있도록 필요한 입력을 모두 인자로 받음
+    """
+    df = _prepare_frame(df_raw, date_lookup)
+
+    # 중간에 연속 LONG_NA_RUN개 이상 결측치가 있는 컬럼 제거
+    df = df.drop(columns=long_na_columns(df, n=LONG_NA_RUN))
+
+    # 중간 결측치 보간
+    df_filled = fill_mid_na_frame(df)
+
+    # 컬럼명 매핑 (avg_code -> province_name)
+    df_filled = df_filled.rename(columns=rename_dict)
+    return _to_output(df_filled)
+
+
+def process_pollutant_increment(df_raw, date_lookup, rename_dict, existing, watermark):
+    """
+    기존 전처리 결과(existing)에 워터마크 이후의 새 달만 이어 붙입니다.
+    - 워터마크 포함 최근 12개월은 후년 값이 새로 생겼을 수 있으므로 원본에서 다시 보간
+    - 그 직전 12개월은 기존 결과(보간 완료 값)를 '전년 값' 문맥으로만 사용
+    - 컬럼 구성은 기존 결과를 그대로 유지 (관측소 제거 여부는 전체 재처리 때만 다시 판단)
+    - 재계산 구간 경계에 걸친 결측 run은 경계에서 잘린 길이로 판단됨
+    """
+    window_start = pd.Timestamp(shift_year_month(watermark, -(YOY_PERIOD - 1)) + '-01')
+    context_start = pd.Timestamp(shift_year_month(watermark, -(2 * YOY_PERIOD - 1)) + '-01')
+    cols = [c for c in existing.columns if c != 'year_month']
+
+    df = _prepare_frame(df_raw, date_lookup).rename(columns=rename_dict).reindex(columns=cols)
+    prev = existing.set_index(pd.DatetimeIndex(pd.to_datetime(existing['year_month'] + '-01'), name='year_month'))[cols]
+
+    frame = pd.concat([
+        prev[(prev.index >= context_start) & (prev.index < window_start)],
+        df[df.index >= window_start],
+    ]).sort_index()
+    recomputed = fill_mid_na_frame(frame)
+    recomputed = recomputed[recomputed.index >= window_start]
+
+    kept = existing[existing['year_month'] < window_start.strftime('%Y-%m')]
+    return pd.concat([kept, _to_output(recomputed)], ignore_index=True)
+
+
+def _process_job(job):
+    func, args = job
+    return func(*args)
+
+
+def run_pollutant_etl(pollutants=None, n_jobs=1, out_dir=None, incremental=False):
+    """
+    여러 오염물질을 한 번에 전처리하고 저장합니다.
+    - pollutants: POLLUTANTS의 키 리스트 (기본: 전체)
+    - n_jobs: 1보다 크면 오염물질별 가공을 프로세스 풀에서 병렬 실행
+    - incremental: True면 워터마크 이후의 새 달만 처리해 기존 결과에 병합 (워터마크가 없으면 전체 처리)
+    - 반환: {오염물질 키: 저장 경로}
+    """
+    keys = list(pollutants or POLLUTANTS)
+    unknown = [k for k in keys if k not in POLLUTANTS]
+    if unknown:
+        raise KeyError(f"Unknown pollutant(s): {unknown} (available: {list(POLLUTANTS)})")
+
+    # 원본과 참조 테이블을 한 번에 로드
+    *raws, map_df = load_data_many(
+        [(POLLUTANTS[k]['source'], 'raw') for k in keys] + [('avgcode_map', 'reference')]
+    )
+    rename_dict = dict(zip(map_df['avg_code'], map_df['province_name']))
+
+    # 모든 오염물질의 날짜 라벨을 한 번에 파싱
+    date_lookup = parse_year_month(pd.concat([r['구분'] for r in raws], ignore_index=True))
+
+    jobs, job_keys, saved = [], [], {}
+    for key, raw in zip(keys, raws):
+        mark = read_watermark(f'{key}_processed') if incremental else None
+        if mark is None:
+            jobs.append((process_pollutant, (raw, date_lookup, rename_dict)))
+            job_keys.append(key)
+            continue
+
+        last = normalize_year_month(max(date_lookup[l] for l in raw['구분'].dropna()))
+        if last <= mark['year_month']:
+            print(f"{POLLUTANTS[key]['label']} is up to date (watermark {mark['year_month']})")
+            saved[key] = BASE_DIR / mark['output']
+            continue
+        existing = load_file(mark['output'])
+        jobs.append((process_pollutant_increment, (raw, date_lookup, rename_dict, existing, mark['year_month'])))
+        job_keys.append(key)
+
+    if n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(jobs))) as pool:
+            results = list(pool.map(_process_job, jobs))
+    else:
+        results = [_process_job(job) for job in jobs]
+
+    # 저장
+    today = datetime.datetime.now().strftime('%Y%m%d')
+    out_dir = Path(out_dir) if out_dir else BASE_DIR / 'data' / 'processed'
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for key, df_filled in zip(job_keys, results):
+        out_path = out_dir / f"{key}_processed_{today}_v1.0.xlsx"
+        df_filled.to_excel(out_path, index=False)
+        print(f"Saved {POLLUTANTS[key]['label']} processed data to: {out_path}")
+        write_watermark(f'{key}_processed', df_filled['year_month'].max(), out_path)
+        saved[key] = out_path
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대기오염물질 공용 ETL")
+    parser.add_argument('pollutants', nargs='*', help=f"처리할 오염물질 (기본: {' '.join(POLLUTANTS)})")
+    parser.add_argument('--jobs', type=int, default=1, help="오염물질 병렬 처리 프로세스 수")
+    parser.add_argument('--incremental', action='store_true', help="워터마크 이후의 새 달만 처리")
+    args = parser.parse_args()
+    run_pollutant_etl(args.pollutants or None, n_jobs=args.jobs, incremental=args.incremental)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# src/etl/watermark.py
+
+import sys
+import json
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import pandas as pd
+
+"""
+증분(append-only) ETL을 위한 데이터셋별 워터마크 저장소
+- 데이터셋(예: 'pm10_processed', 'pm10_asthma_processed')마다
+  마지막으로 처리한 year_month와 그 결과 파일 경로를 JSON 파일 하나에 기록
+"""
+
+WATERMARK_PATH = BASE_DIR / 'data' / 'processed' / 'etl_watermarks.json'
+
+
+def _read_all():
+    if not WATERMARK_PATH.exists():
+        return {}
+    with open(WATERMARK_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_watermark(dataset):
+    """
+    데이터셋의 워터마크를 반환합니다 ({'year_month': 'YYYY-MM', 'output': 경로}).
+    - 기록이 없거나 결과 파일이 사라졌으면 None (→ 전체 재처리)
+    """
+    mark = _read_all().get(dataset)
+    if mark is None or not (BASE_DIR / mark['output']).exists():
+        return None
+    return mark
+
+
+def write_watermark(dataset, year_month, output):
+    """
+    데이터셋의 워터마크를 갱신합니다.
+    - output은 프로젝트 루트 아래면 상대 경로로, 아니면 절대 경로로 저장
+    """
+    marks = _read_all()
+    output = Path(output)
+    if output.is_absolute() and BASE_DIR in output.resolve().parents:
+        output = output.resolve().relative_to(BASE_DIR)
+    marks[dataset] = {'year_month': normalize_year_month(year_month), 'output': output.as_posix()}
+
+    WATERMARK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = WATERMARK_PATH.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(marks, f, ensure_ascii=False, indent=2)
+    tmp.replace(WATERMARK_PATH)
+
+
+def normalize_year_month(value):
+    """
+    '2023-01', '202301', 202301, Timestamp 등을 'YYYY-MM' 문자열로 통일합니다.
+    """
+    if isinstance(value, (pd.Timestamp, pd.Period)):
+        return value.strftime('%Y-%m')
+    digits = ''.join(ch for ch in str(value) if ch.isdigit())[:6]
+    return f"{digits[:4]}-{digits[4:6]}"
+
+
+def shift_year_month(year_month, months):
+    """
+    'YYYY-MM' 문자열을 months개월 이동합니다.
+    """
+    return (pd.Period(normalize_year_month(year_month), freq='M') + months).strftime('%Y-%m')
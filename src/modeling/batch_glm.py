@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# src/modeling/batch_glm.py
+
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from scripts.data_loader import load_data, data_fingerprint
+from src.etl.pollutant_etl import POLLUTANTS
+from src.etl.claims_etl import DISEASES
+from src.etl.watermark import normalize_year_month
+
+"""
+계절 상호작용 GLM(진료 건수 ~ 농도 * 계절)을 셀(전국/지역/연령군/지역×연령군)마다 일괄 적합하는 엔진
+- 5_analysis.py의 smf.glm('total_visit_count~pm10*season')과 같은 모형 (Poisson, NegativeBinomial)
+- 패널 전체의 설계 행렬을 한 번만 만들고 셀은 행 구간으로 잘라 사용 (formula 파싱 없음)
+- 셀들을 배치로 나눠 프로세스 풀에서 병렬 적합
+- 초기값(warm start): 같은 셀의 이전 적합 계수 → 없으면 패널 전체(pooled) Poisson 적합 계수,
+  NegativeBinomial은 같은 셀의 Poisson 계수에서 시작
+- 결과는 data/processed/glm/<오염물질>_<질환>_<범위>.parquet, 입력 파일 지문은 옆 .json에 기록
+  (지문이 같으면 다시 적합하지 않고 저장된 결과를 반환)
+- 대시보드는 load_glms()로 저장된 결과를 읽기만 함 — 적합은 이 스크립트(run.py)에서 수행
+"""
+
+# 범위 이름 → 셀을 나누는 키
+SCOPES = {
+    'national':   [],
+    'region':     ['region'],
+    'age_group':  ['age_group'],
+    'region_age': ['region', 'age_group'],
+}
+
+FAMILIES = ['poisson', 'negbin']
+
+# NegativeBinomial 분산 모수 (statsmodels 기본값, 5_analysis.py와 동일)
+NB_ALPHA = 1.0
+
+# 이보다 관측 월 수가 적은 셀은 적합하지 않음
+MIN_OBS = 24
+
+GLM_DIR = BASE_DIR / 'data' / 'processed' / 'glm'
+
+RESULT_COLUMNS = ['family', 'term', 'coef', 'se', 'p_value', 'n', 'deviance', 'aic', 'converged']
+
+
+def _family(name, alpha=NB_ALPHA):
+    if name == 'poisson':
+        return sm.families.Poisson()
+    if name == 'negbin':
+        return sm.families.NegativeBinomial(alpha=alpha)
+    raise ValueError(f"Unknown GLM family: {name}")
+
+
+def input_keys(pollutant, disease):
+    return [
+        (f'{pollutant}_processed_v1', 'processed'),
+        (f'{pollutant}_{disease}_processed_v1', 'processed'),
+        ('date_map', 'reference'),
+    ]
+
+
+def _month_ordinals(values):
+    values = pd.Series(values)
+    lookup = {v: pd.Period(normalize_year_month(v), freq='M').ordinal for v in pd.unique(values.dropna())}
+    return values.map(lookup)
+
+
+def glm_panel(pollutant, disease, scope='national'):
+    """
+    셀 키 + (month, season, level, visit_count) 패널을 만듭니다.
+    - 지역이 키에 있으면 해당 지역 농도, 없으면 월별 전 지역 평균 농도를 사용
+    - 셀 키, 월 순으로 정렬 (셀마다 연속된 행 구간)
+    """
+    keys = SCOPES[scope]
+    claims = load_data(f'{pollutant}_{disease}_processed_v1', section='processed', compact=True)
+    claims['month'] = _month_ordinals(claims['year_month'])
+    visits = claims.groupby(['month'] + keys, as_index=False, observed=True)['visit_count'].sum()
+    for key in keys:
+        visits[key] = visits[key].astype(str)
+
+    wide = load_data(f'{pollutant}_processed_v1', section='processed')
+    levels = wide.melt(id_vars='year_month', var_name='region', value_name='level')
+    levels['month'] = _month_ordinals(levels['year_month'])
+    if 'region' in keys:
+        panel = visits.merge(levels[['month', 'region', 'level']], on=['month', 'region'], how='left')
+    else:
+        national = levels.groupby('month', as_index=False)['level'].mean()
+        panel = visits.merge(national, on='month', how='left')
+
+    date_map = load_data('date_map', section='reference')
+    seasons = pd.DataFrame({
+        'month': _month_ordinals(date_map['date_id'].astype(str)),
+        'season': date_map['season'].astype(str),
+    }).drop_duplicates('month')
+    panel = panel.merge(seasons, on='month', how='left').dropna(subset=['level', 'season'])
+    return panel.sort_values(keys + ['month']).reset_index(drop=True)
+
+
+def design_matrix(panel, pollutant):
+    """
+    패널 전체의 설계 행렬과 항 이름을 만듭니다 (patsy 'pollutant*season'과 같은 열 순서·이름).
+    - 계절 기준 범주는 정렬 순서상 첫 번째 (patsy 기본값과 동일)
+    """
+    seasons = sorted(panel['season'].unique())
+    level = panel['level'].to_numpy(dtype=float)
+    dummies = [(panel['season'] == s).to_numpy(dtype=float) for s in seasons[1:]]
+    columns = [np.ones(len(panel))] + dummies + [level] + [level * d for d in dummies]
+    terms = (
+        ['Intercept']
+        + [f'season[T.{s}]' for s in seasons[1:]]
+        + [pollutant]
+        + [f'{pollutant}:season[T.{s}]' for s in seasons[1:]]
+    )
+    return np.column_stack(columns), terms
+
+
+def _fit_cell(X, y, family, alpha, start):
+    model = sm.GLM(y, X, family=_family(family, alpha))
+    try:
+        return model.fit(start_params=start)
+    except (np.linalg.LinAlgError, ValueError, FloatingPointError):
+        return None
+
+
+def _fit_batch(task):
+    """
+    프로세스 풀 작업 단위: 셀 목록을 받아 패밀리별로 적합하고 결과 행 리스트를 반환합니다.
+    """
+    families, alpha, terms, cells = task
+    rows = []
+    for key, X, y, starts in cells:
+        previous = None
+        for family in families:
+            start = starts.get(family)
+            if start is None and previous is not None:
+                start = previous
+            result = _fit_cell(X, y, family, alpha, start)
+            if result is None:
+                rows.append((key, family, None))
+                continue
+            if family == 'poisson':
+                previous = result.params
+            rows.append((key, family, (
+                result.params, result.bse, result.pvalues,
+                result.deviance, result.aic, bool(result.converged),
+            )))
+    return rows
+
+
+def _cells(panel, keys):
+    """
+    셀 키 → (시작 행, 끝 행) (패널은 셀 키 순으로 정렬되어 있음)
+    """
+    if not keys:
+        return {(): (0, len(panel))}
+    groups = panel.groupby(keys, sort=False).indices
+    return {
+        (k if isinstance(k, tuple) else (k,)): (int(idx[0]), int(idx[-1]) + 1)
+        for k, idx in groups.items()
+    }
+
+
+def _store_paths(pollutant, disease, scope):
+    base = GLM_DIR / f'{pollutant}_{disease}_{scope}'
+    return base.with_suffix('.parquet'), base.with_suffix('.json')
+
+
+def _previous_starts(previous, keys, terms):
+    """
+    이전 결과 표에서 (셀 키, 패밀리) → 계수 벡터 dict를 만듭니다 (항 구성이 다르면 사용하지 않음).
+    """
+    if previous is None or previous.empty:
+        return {}
+    starts = {}
+    for group, sub in previous.groupby(keys + ['family'], sort=False):
+        group = group if isinstance(group, tuple) else (group,)
+        coef = sub.set_index('term')['coef'].reindex(terms)
+        if coef.notna().all():
+            starts[(tuple(str(g) for g in group[:-1]), group[-1])] = coef.to_numpy(dtype=float)
+    return starts
+
+
+def run_glms(panel, pollutant, keys, families=FAMILIES, alpha=NB_ALPHA,
+             min_obs=MIN_OBS, jobs=None, previous=None):
+    """
+    패널의 모든 셀에 GLM을 적합하고 (셀 키 + RESULT_COLUMNS) 긴 형식 표를 반환합니다.
+    - previous: 이전 결과 표 (같은 셀의 계수를 초기값으로 사용)
+    - jobs: 프로세스 수 (1이면 현재 프로세스에서 적합)
+    """
+    X, terms = design_matrix(panel, pollutant)
+    y = panel['visit_count'].to_numpy(dtype=float)
+    p = X.shape[1]
+
+    # 이전 결과가 없는 셀은 패널 전체 Poisson 계수에서 시작
+    pooled = _fit_cell(X, y, 'poisson', alpha, None)
+    pooled_start = pooled.params if pooled is not None else None
+    starts = _previous_starts(previous, keys, terms)
+
+    cells = []
+    for key, (lo, hi) in _cells(panel, keys).items():
+        Xc, yc = X[lo:hi], y[lo:hi]
+        # 관측이 적거나 일부 계절이 없어 설계 행렬이 특이하면 적합하지 않음
+        if hi - lo < min_obs or np.linalg.matrix_rank(Xc) < p:
+            continue
+        cell_starts = {f: starts.get((key, f)) for f in families}
+        if cell_starts.get('poisson') is None:
+            cell_starts['poisson'] = pooled_start
+        cells.append((key, Xc, yc, cell_starts))
+
+    jobs = jobs or os.cpu_count() or 1
+    n_batches = min(len(cells), jobs * 4) or 1
+    tasks = [(families, alpha, terms, cells[i::n_batches]) for i in range(n_batches)]
+    if jobs == 1 or len(cells) <= 1:
+        fitted = [row for task in tasks for row in _fit_batch(task)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            fitted = [row for rows in pool.map(_fit_batch, tasks) for row in rows]
+
+    ns = {key: len(yc) for key, _, yc, _ in cells}
+    records = []
+    for key, family, fit in fitted:
+        if fit is None:
+            continue
+        params, bse, pvalues, deviance, aic, converged = fit
+        for i, term in enumerate(terms):
+            records.append(key + (family, term, params[i], bse[i], pvalues[i], ns[key], deviance, aic, converged))
+    result = pd.DataFrame(records, columns=keys + RESULT_COLUMNS)
+    return result.sort_values(keys + ['family']).reset_index(drop=True) if keys else result
+
+
+def fit_glms(pollutant='pm10', disease='asthma', scope='national', families=FAMILIES,
+             alpha=NB_ALPHA, min_obs=MIN_OBS, jobs=None, force=False):
+    """
+    (오염물질, 질환, 범위)의 GLM 결과를 반환합니다.
+    - 입력 파일 지문과 설정이 저장된 결과와 같으면 저장된 결과를 그대로 읽음
+    - 다르면 이전 결과를 초기값으로 삼아 다시 적합하고 저장
+    """
+    store, meta_path = _store_paths(pollutant, disease, scope)
+    meta = {
+        'fingerprint': data_fingerprint(input_keys(pollutant, disease)),
+        'families': list(families), 'alpha': alpha, 'min_obs': min_obs,
+    }
+    previous = pd.read_parquet(store) if store.exists() else None
+    if not force and previous is not None and meta_path.exists():
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if all(stored.get(k) == v for k, v in meta.items()):
+            return previous
+
+    keys = SCOPES[scope]
+    panel = glm_panel(pollutant, disease, scope)
+    result = run_glms(panel, pollutant, keys, families, alpha, min_obs, jobs, previous)
+
+    GLM_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = store.with_suffix('.parquet.tmp')
+    result.to_parquet(tmp, index=False)
+    tmp.replace(store)
+    meta['cells'] = int(result[keys].drop_duplicates().shape[0]) if keys else int(not result.empty)
+    meta['created_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    tmp = meta_path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    tmp.replace(meta_path)
+    return result
+
+
+def load_glms(pollutant='pm10', disease='asthma', scope='national', rebuild=False):
+    """
+    저장된 GLM 결과를 읽어 반환합니다 (대시보드용 — 화면에서는 적합하지 않음).
+    - rebuild: True면 fit_glms()로 입력 지문을 확인해 필요할 때 먼저 다시 적합
+    - 저장된 결과가 없으면 FileNotFoundError (python src/modeling/batch_glm.py 또는 run.py로 미리 적합)
+    """
+    if rebuild:
+        return fit_glms(pollutant, disease, scope)
+    store, _ = _store_paths(pollutant, disease, scope)
+    if not store.exists():
+        raise FileNotFoundError(f"GLM store not found: {store} (run src/modeling/batch_glm.py)")
+    return pd.read_parquet(store)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계절 상호작용 GLM 일괄 적합")
+    parser.add_argument('--pollutants', nargs='*', default=list(POLLUTANTS), help="오염물질 (기본: 전체)")
+    parser.add_argument('--diseases', nargs='*', default=list(DISEASES), help="질환 (기본: 전체)")
+    parser.add_argument('--scopes', nargs='*', default=['national', 'region', 'age_group'],
+                        choices=list(SCOPES), help="적합 범위 (기본: national region age_group)")
+    parser.add_argument('--jobs', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--force', action='store_true', help="입력 지문과 관계없이 다시 적합")
+    args = parser.parse_args()
+
+    for pollutant in args.pollutants:
+        for disease in args.diseases:
+            for scope in args.scopes:
+                start = time.perf_counter()
+                result = fit_glms(pollutant, disease, scope, jobs=args.jobs, force=args.force)
+                keys = SCOPES[scope]
+                cells = len(result[keys].drop_duplicates()) if keys else int(not result.empty)
+                print(f"{pollutant}-{disease} [{scope}]: {cells}개 셀 ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
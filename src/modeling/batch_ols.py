@@ -0,0 +1,129 @@
+# src/modeling/batch_ols.py
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+"""
+그룹별 단순 선형회귀(y ~ x)를 한 번에 계산하는 닫힌 형식(closed-form) OLS 엔진
+- 그룹마다 충분통계량(n, Σx, Σy, Σxy, Σx², Σy²)만 groupby 합계로 구하고,
+  기울기/절편/표준오차/t/p-value/R²는 NumPy 배열 연산으로 모든 그룹을 동시에 계산
+- 지역 × 계절 × 연령군 × 오염물질 등 수천 개 회귀 셀도 formula 파싱이나 모델 객체 생성 없이 처리
+- 합계 전에 x, y를 전체 평균으로 이동시켜 Σx² - (Σx)²/n 계산의 자릿수 손실을 줄임
+- statsmodels OLS(y ~ 1 + x)와 같은 값 (statsmodels_parity()로 확인)
+"""
+
+RESULT_COLUMNS = ['n', 'slope', 'intercept', 'slope_se', 'intercept_se', 't_value', 'p_value', 'r2']
+
+
+def ols_from_sums(n, sx, sy, sxy, sxx, syy, x_shift=0.0, y_shift=0.0):
+    """
+    충분통계량 배열로 단순회귀 결과를 계산해 {컬럼: 배열} dict로 반환합니다.
+    - x_shift, y_shift: 합계를 구하기 전에 x, y에서 뺀 값 (절편을 원래 좌표로 되돌릴 때 사용)
+    - n < 3 이거나 x 분산이 0인 그룹은 NaN
+    """
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = sx / n
+        mean_y = sy / n
+        ss_xx = sxx - sx * mean_x
+        ss_xy = sxy - sx * mean_y
+        ss_yy = syy - sy * mean_y
+
+        valid = (n >= 3) & (ss_xx > 0)
+        ss_xx = np.where(valid, ss_xx, np.nan)
+
+        slope = ss_xy / ss_xx
+        sse = np.maximum(ss_yy - slope * ss_xy, 0.0)
+        dof = n - 2
+        sigma2 = sse / dof
+
+        # 원래 좌표의 x 평균 (절편 표준오차에 필요)
+        orig_mean_x = mean_x + x_shift
+        intercept = (mean_y + y_shift) - slope * orig_mean_x
+        slope_se = np.sqrt(sigma2 / ss_xx)
+        intercept_se = np.sqrt(sigma2 * (1.0 / n + orig_mean_x ** 2 / ss_xx))
+        t_value = slope / slope_se
+        p_value = 2.0 * stats.t.sf(np.abs(t_value), np.where(valid, dof, 1))
+        r2 = np.where(ss_yy > 0, 1.0 - sse / ss_yy, np.nan)
+
+    return {
+        'n': n.astype(int),
+        'slope': slope,
+        'intercept': intercept,
+        'slope_se': slope_se,
+        'intercept_se': intercept_se,
+        't_value': t_value,
+        'p_value': np.where(valid, p_value, np.nan),
+        'r2': np.where(valid, r2, np.nan),
+    }
+
+
+def grouped_ols(frame, x, y, by):
+    """
+    frame을 by 컬럼으로 묶어 그룹마다 y ~ x 회귀 결과를 계산합니다.
+    - by: 컬럼 이름 또는 리스트 (예: ['pollutant', 'season', 'region'])
+    - x 또는 y가 결측인 행은 제외
+    - 반환: by 컬럼 + RESULT_COLUMNS (그룹 키 순으로 정렬)
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    data = frame[by + [x, y]].dropna(subset=[x, y])
+    xv = data[x].to_numpy(dtype=float)
+    yv = data[y].to_numpy(dtype=float)
+    x_shift = xv.mean() if len(xv) else 0.0
+    y_shift = yv.mean() if len(yv) else 0.0
+    xs = xv - x_shift
+    ys = yv - y_shift
+
+    moments = pd.DataFrame({'sx': xs, 'sy': ys, 'sxy': xs * ys, 'sxx': xs * xs, 'syy': ys * ys}, index=data.index)
+    grouped = moments.groupby([data[c] for c in by], observed=True, sort=True)
+    sums = grouped.sum()
+    counts = grouped.size().reindex(sums.index)
+
+    result = ols_from_sums(
+        counts.to_numpy(),
+        sums['sx'].to_numpy(), sums['sy'].to_numpy(), sums['sxy'].to_numpy(),
+        sums['sxx'].to_numpy(), sums['syy'].to_numpy(),
+        x_shift=x_shift, y_shift=y_shift,
+    )
+    out = pd.DataFrame(result, index=sums.index)[RESULT_COLUMNS]
+    return out.reset_index()
+
+
+def statsmodels_parity(frame, x, y, by, result=None, max_groups=None):
+    """
+    grouped_ols 결과를 그룹별 statsmodels OLS 적합과 비교해 컬럼별 최대 상대 오차를 반환합니다.
+    - max_groups: 비교할 그룹 수 상한 (None이면 전체)
+    - 검증/디버깅용 (대시보드 경로에서는 사용하지 않음)
+    """
+    import statsmodels.api as sm
+
+    by = [by] if isinstance(by, str) else list(by)
+    result = grouped_ols(frame, x, y, by) if result is None else result
+    result = result.dropna(subset=['slope'])
+    if max_groups is not None:
+        result = result.head(max_groups)
+
+    data = frame[by + [x, y]].dropna(subset=[x, y]).set_index(by).sort_index()
+    errors = {c: 0.0 for c in RESULT_COLUMNS[1:]}
+    for row in result.itertuples(index=False):
+        key = tuple(getattr(row, c) for c in by)
+        sub = data.loc[key if len(by) > 1 else key[0]]
+        model = sm.OLS(sub[y].to_numpy(dtype=float), sm.add_constant(sub[x].to_numpy(dtype=float), has_constant='add')).fit()
+        expected = {
+            'slope': model.params[1], 'intercept': model.params[0],
+            'slope_se': model.bse[1], 'intercept_se': model.bse[0],
+            't_value': model.tvalues[1], 'p_value': model.pvalues[1], 'r2': model.rsquared,
+        }
+        for col, value in expected.items():
+            actual = getattr(row, col)
+            scale = max(abs(value), 1e-12)
+            errors[col] = max(errors[col], abs(actual - value) / scale)
+    return errors
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# src/modeling/features.py
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+import pandas as pd
+from scripts.data_loader import load_data, data_fingerprint
+from src.etl.pollutant_etl import POLLUTANTS
+from src.etl.watermark import normalize_year_month
+
+"""
+지역×월 노출(exposure) 피처 엔진 — 모든 모형이 같은 피처 행렬을 공유
+- 입력: 오염물질별 전처리 결과(year_month × 지역 wide 파일) 전체
+- 지역 × 연속 월 격자(빠진 달은 결측)로 맞춘 뒤, 모든 지역을 한 번에 시간축으로 shift/rolling
+  (격자가 연속이므로 지역 경계를 넘는 shift가 생기지 않음)
+- 오염물질마다 생성하는 피처
+  - <p>            : 해당 월 농도
+  - <p>_lag<k>     : k개월 전 농도
+  - <p>_mean<w>, <p>_max<w> : 최근 w개월(해당 월 포함) 평균/최댓값 (w개월이 모두 있어야 계산)
+  - <p>_cum<w>     : 최근 w개월 누적 농도 (0531_Lag_Cumulative.ipynb의 cum12와 같은 정의)
+  - <p>_exceed<w>  : 최근 w개월 중 월평균 농도가 기준(THRESHOLDS)을 넘은 달 수
+    (전처리 데이터가 월 단위라 일 단위 초과 일수 대신 초과 월수를 사용)
+- 결과는 (region, year_month) 순으로 정렬된 긴 형식이며,
+  입력 파일 지문 + 피처 설정으로 만든 키로 data/processed/features/에 Parquet 캐시
+"""
+
+LAGS = list(range(1, 13))
+WINDOWS = [3, 6, 12]
+
+# 대기환경기준 연평균 농도 (㎍/㎥)
+THRESHOLDS = {'pm10': 50.0, 'pm25': 15.0}
+
+FEATURE_DIR = BASE_DIR / 'data' / 'processed' / 'features'
+KEY_COLUMNS = ['region', 'year_month']
+
+
+def feature_columns(pollutants=None, lags=LAGS, windows=WINDOWS):
+    """
+    exposure_features()가 만드는 피처 컬럼 이름 목록
+    """
+    columns = []
+    for p in (pollutants or POLLUTANTS):
+        columns.append(p)
+        columns += [f'{p}_lag{k}' for k in lags]
+        for w in windows:
+            columns += [f'{p}_mean{w}', f'{p}_max{w}', f'{p}_cum{w}', f'{p}_exceed{w}']
+    return columns
+
+
+def _level_frames(pollutants):
+    """
+    오염물질별 (월 서수 × 지역) 농도 표를 공통 월 격자·지역 목록으로 맞춰 반환합니다.
+    """
+    frames = {}
+    for p in pollutants:
+        wide = load_data(f'{p}_processed_v1', section='processed')
+        months = wide['year_month'].map(lambda v: pd.Period(normalize_year_month(v), freq='M').ordinal)
+        wide = wide.drop(columns='year_month').apply(pd.to_numeric, errors='coerce')
+        wide.index = months.to_numpy()
+        frames[p] = wide[~wide.index.duplicated(keep='last')]
+
+    regions = []
+    for wide in frames.values():
+        regions += [c for c in wide.columns if c not in regions]
+    first = min(int(w.index.min()) for w in frames.values())
+    last = max(int(w.index.max()) for w in frames.values())
+    grid = np.arange(first, last + 1)
+    return {p: w.reindex(index=grid, columns=regions) for p, w in frames.items()}, grid, regions
+
+
+def build_features(pollutants=None, lags=LAGS, windows=WINDOWS, thresholds=THRESHOLDS):
+    """
+    노출 피처 행렬을 계산합니다 (캐시 없이).
+    """
+    pollutants = list(pollutants or POLLUTANTS)
+    levels, grid, regions = _level_frames(pollutants)
+
+    # (월 × 지역) 표를 지역 우선 1차원 배열로 펼침 → (region, year_month) 정렬 순서
+    def flat(frame):
+        return frame.to_numpy(dtype=float).T.ravel()
+
+    columns = {
+        'region': np.repeat(np.array(regions, dtype=object), len(grid)),
+        'year_month': np.tile(pd.PeriodIndex.from_ordinals(grid, freq='M').strftime('%Y-%m').to_numpy(), len(regions)),
+    }
+    for p in pollutants:
+        lv = levels[p]
+        columns[p] = flat(lv)
+        for k in lags:
+            columns[f'{p}_lag{k}'] = flat(lv.shift(k))
+        exceed = (lv > thresholds[p]).astype(float).where(lv.notna())
+        for w in windows:
+            columns[f'{p}_mean{w}'] = flat(lv.rolling(w, min_periods=w).mean())
+            columns[f'{p}_max{w}'] = flat(lv.rolling(w, min_periods=w).max())
+            columns[f'{p}_cum{w}'] = flat(lv.rolling(w, min_periods=1).sum())
+            columns[f'{p}_exceed{w}'] = flat(exceed.rolling(w, min_periods=1).sum())
+
+    features = pd.DataFrame(columns)
+    features['region'] = features['region'].astype('category')
+    return features[KEY_COLUMNS + feature_columns(pollutants, lags, windows)]
+
+
+def _cache_key(pollutants, lags, windows, thresholds):
+    fingerprint = data_fingerprint([(f'{p}_processed_v1', 'processed') for p in pollutants])
+    spec = json.dumps([fingerprint, pollutants, list(lags), list(windows), thresholds], sort_keys=True)
+    return hashlib.sha1(spec.encode('utf-8')).hexdigest()[:16]
+
+
+def exposure_features(pollutants=None, lags=LAGS, windows=WINDOWS, thresholds=THRESHOLDS, use_cache=True):
+    """
+    노출 피처 행렬을 반환합니다 (입력 파일 지문과 설정이 같으면 Parquet 캐시에서 읽음).
+    - 새로 계산하면 같은 접두사의 이전 캐시 파일은 지움
+    """
+    pollutants = list(pollutants or POLLUTANTS)
+    if not use_cache:
+        return build_features(pollutants, lags, windows, thresholds)
+
+    key = _cache_key(pollutants, lags, windows, thresholds)
+    prefix = f"exposure_{'_'.join(pollutants)}_"
+    path = FEATURE_DIR / f'{prefix}{key}.parquet'
+    if path.exists():
+        return pd.read_parquet(path)
+
+    features = build_features(pollutants, lags, windows, thresholds)
+    FEATURE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.parquet.tmp')
+    features.to_parquet(tmp, index=False)
+    tmp.replace(path)
+    for old in FEATURE_DIR.glob(f'{prefix}*.parquet'):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return features
+
+
+def main():
+    parser = argparse.ArgumentParser(description="노출 피처 행렬 생성")
+    parser.add_argument('pollutants', nargs='*', help=f"오염물질 (기본: {' '.join(POLLUTANTS)})")
+    parser.add_argument('--no-cache', action='store_true', help="캐시를 쓰지 않고 다시 계산")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    features = exposure_features(args.pollutants or None, use_cache=not args.no_cache)
+    print(f"피처 행렬 {features.shape[0]}행 × {features.shape[1] - len(KEY_COLUMNS)}개 피처 "
+          f"({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# src/modeling/forecast.py
+
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scripts.data_loader import data_fingerprint
+from src.etl.pollutant_etl import POLLUTANTS
+from src.etl.claims_etl import DISEASES
+from src.analysis.coefficients import region_panel, input_keys
+
+"""
+지역 × 질환 × 오염물질 시나리오 1~12개월 진료 건수 일괄 예측
+- 지역마다 진료 건수 ~ 절편 + 추세 + 월(12개월 더미) + 농도 선형모형을 최근 HISTORY개월로 적합
+  (streamlit_ex.py가 화면마다 즉석 적합하던 LinearRegression을 미리, 모든 지역에 대해 수행)
+- 예측 구간: OLS 예측 표준오차 sigma * sqrt(1 + x0 (X'X)^-1 x0')와 t 분포 분위수 (기본 95%)
+- 미래 농도 시나리오: 지역별 같은 달 평균 농도(최근 HISTORY개월) × 시나리오 배수
+- (오염물질, 질환) 조합마다 프로세스 풀에서 병렬 실행
+- 결과: data/processed/forecasts/forecasts.parquet (+ --db면 forecast 테이블),
+  입력 파일 지문은 옆 .json에 기록 — 대시보드는 load_forecasts()로 읽기만 함
+"""
+
+HORIZON = 12
+HISTORY = 60
+MIN_OBS = 24
+INTERVAL = 0.95
+
+# 시나리오 이름 → 같은 달 평균 농도에 곱할 배수
+SCENARIOS = {'baseline': 1.0, 'low': 0.8, 'high': 1.2}
+
+FORECAST_DIR = BASE_DIR / 'data' / 'processed' / 'forecasts'
+FORECAST_PATH = FORECAST_DIR / 'forecasts.parquet'
+META_PATH = FORECAST_PATH.with_suffix('.json')
+
+COLUMNS = [
+    'pollutant', 'disease', 'region', 'scenario', 'horizon', 'year_month',
+    'level', 'forecast', 'lower', 'upper',
+]
+
+
+def _design(months, levels, origin):
+    """
+    설계 행렬: [절편, 추세(년), 2~12월 더미, 농도]
+    """
+    months = np.asarray(months)
+    calendar = (months % 12).astype(int)   # Period ordinal % 12 == 월 - 1
+    dummies = (calendar[:, None] == np.arange(1, 12)[None, :]).astype(float)
+    trend = (months - origin) / 12.0
+    return np.column_stack([np.ones(len(months)), trend, dummies, np.asarray(levels, dtype=float)])
+
+
+def forecast_region(months, visits, levels, future_months, future_levels, interval=INTERVAL):
+    """
+    지역 하나의 예측값과 예측 구간을 계산합니다.
+    - months, visits, levels: 학습 구간 (월 서수, 진료 건수, 농도)
+    - future_levels: (시나리오 수, 예측 개월 수) 농도 배열
+    - 반환: (forecast, lower, upper) 각각 future_levels와 같은 모양 (관측이 부족하면 None)
+    """
+    origin = int(future_months[0]) - 1
+    X = _design(months, levels, origin)
+    n, p = X.shape
+    if n < max(MIN_OBS, p + 2):
+        return None
+
+    XtX_inv = np.linalg.pinv(X.T @ X)
+    beta = XtX_inv @ (X.T @ visits)
+    resid = visits - X @ beta
+    dof = n - np.linalg.matrix_rank(X)
+    sigma = np.sqrt(resid @ resid / dof)
+    q = stats.t.ppf(0.5 + interval / 2, dof)
+
+    # 모든 시나리오 × 예측 개월을 한 번에 계산
+    scen, steps = future_levels.shape
+    X0 = _design(np.tile(future_months, scen), future_levels.ravel(), origin)
+    mean = X0 @ beta
+    se = sigma * np.sqrt(1.0 + np.einsum('ij,jk,ik->i', X0, XtX_inv, X0))
+    lower = np.maximum(mean - q * se, 0.0)
+    upper = mean + q * se
+    return (np.maximum(mean, 0.0).reshape(scen, steps), lower.reshape(scen, steps), upper.reshape(scen, steps))
+
+
+def forecast_pair(task):
+    """
+    (오염물질, 질환) 하나의 모든 지역 × 시나리오 예측 표를 만듭니다 (프로세스 풀 작업 단위).
+    """
+    pollutant, disease, horizon, history, scenarios, interval = task
+    visits, levels = region_panel(pollutant, disease)
+    panel = visits.merge(levels, on=['month', 'region'], how='inner').dropna(subset=['level'])
+    last = int(visits['month'].max())
+    panel = panel[panel['month'] > last - history]
+    future_months = np.arange(last + 1, last + horizon + 1)
+    future_labels = pd.PeriodIndex.from_ordinals(future_months, freq='M').strftime('%Y-%m').to_numpy()
+    names = list(scenarios)
+    factors = np.array([scenarios[s] for s in names])[:, None]
+
+    frames = []
+    for region, sub in panel.groupby('region', sort=True):
+        # 같은 달 평균 농도 (그 달 관측이 없으면 지역 전체 평균)
+        by_month = sub.groupby(sub['month'] % 12)['level'].mean()
+        climate = by_month.reindex(future_months % 12).fillna(sub['level'].mean()).to_numpy()
+        future_levels = factors * climate[None, :]
+
+        result = forecast_region(
+            sub['month'].to_numpy(), sub['visit_count'].to_numpy(dtype=float), sub['level'].to_numpy(),
+            future_months, future_levels, interval,
+        )
+        if result is None:
+            continue
+        mean, lower, upper = result
+        frames.append(pd.DataFrame({
+            'region': region,
+            'scenario': np.repeat(names, horizon),
+            'horizon': np.tile(np.arange(1, horizon + 1), len(names)),
+            'year_month': np.tile(future_labels, len(names)),
+            'level': future_levels.ravel(),
+            'forecast': mean.ravel(),
+            'lower': lower.ravel(),
+            'upper': upper.ravel(),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    return pd.concat(frames, ignore_index=True).assign(pollutant=pollutant, disease=disease)[COLUMNS]
+
+
+def run_forecasts(pollutants=None, diseases=None, horizon=HORIZON, history=HISTORY,
+                  scenarios=SCENARIOS, interval=INTERVAL, jobs=None):
+    """
+    모든 (오염물질, 질환) 조합을 병렬로 예측해 하나의 표로 반환합니다.
+    """
+    tasks = [
+        (p, d, horizon, history, scenarios, interval)
+        for p in (pollutants or POLLUTANTS) for d in (diseases or DISEASES)
+    ]
+    jobs = jobs or min(len(tasks), os.cpu_count() or 1)
+    if jobs == 1:
+        frames = [forecast_pair(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            frames = list(pool.map(forecast_pair, tasks))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _current_meta():
+    return {
+        'fingerprint': data_fingerprint(input_keys()),
+        'horizon': HORIZON, 'history': HISTORY, 'interval': INTERVAL, 'scenarios': SCENARIOS,
+    }
+
+
+def is_stale():
+    """
+    예측 결과가 없거나 입력 파일/설정이 바뀌었으면 True (입력 파일이 없으면 저장된 결과 사용)
+    """
+    if not FORECAST_PATH.exists() or not META_PATH.exists():
+        return True
+    with open(META_PATH, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    try:
+        current = _current_meta()
+    except FileNotFoundError:
+        return False
+    return any(meta.get(k) != v for k, v in current.items())
+
+
+def build_forecasts(force=False, jobs=None):
+    """
+    예측 결과를 (필요하면) 다시 계산해 Parquet로 저장하고 경로를 반환합니다.
+    """
+    if not force and not is_stale():
+        return FORECAST_PATH
+    meta = _current_meta()
+    result = run_forecasts(jobs=jobs)
+
+    FORECAST_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = FORECAST_PATH.with_suffix('.parquet.tmp')
+    result.to_parquet(tmp, index=False)
+    tmp.replace(FORECAST_PATH)
+    meta['rows'] = len(result)
+    meta['created_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    tmp = META_PATH.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    tmp.replace(META_PATH)
+    return FORECAST_PATH
+
+
+def load_forecasts(pollutant=None, disease=None, region=None, scenario=None, rebuild=False):
+    """
+    저장된 예측 결과를 조건에 맞게 읽어 반환합니다 (None인 조건은 전체).
+    - rebuild: True면 입력 지문이 바뀌었을 때 먼저 다시 계산 (대시보드는 읽기만 하므로 기본 False,
+      계산은 python src/modeling/forecast.py 또는 run.py)
+    """
+    if rebuild:
+        build_forecasts()
+    if not FORECAST_PATH.exists():
+        raise FileNotFoundError(f"Forecast store not found: {FORECAST_PATH} (run src/modeling/forecast.py)")
+    filters = [
+        (col, '==', value)
+        for col, value in (('pollutant', pollutant), ('disease', disease), ('region', region), ('scenario', scenario))
+        if value is not None
+    ]
+    return pd.read_parquet(FORECAST_PATH, filters=filters or None).reset_index(drop=True)
+
+
+def write_forecast_table(engine, forecasts):
+    """
+    예측 결과를 forecast 테이블에 통째로 다시 적재합니다 (scripts/schema.py의 FORECAST_TABLE).
+    """
+    from scripts.bulk_loader import bulk_load
+    from scripts.schema import FORECAST_TABLE
+
+    table = forecasts.rename(columns={
+        'region': 'region_name', 'year_month': 'ym',
+        'forecast': 'forecast_value', 'lower': 'lower_bound', 'upper': 'upper_bound',
+    })
+    table['ym'] = table['ym'].str.replace('-', '', regex=False)
+    return bulk_load(table, FORECAST_TABLE, engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지역 × 질환 × 시나리오 진료 건수 일괄 예측")
+    parser.add_argument('--force', action='store_true', help="입력 지문과 관계없이 다시 계산")
+    parser.add_argument('--jobs', type=int, default=None, help="프로세스 수 (기본: 조합 수와 CPU 수 중 작은 값)")
+    parser.add_argument('--db', action='store_true', help="forecast 테이블에도 적재")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = build_forecasts(force=args.force, jobs=args.jobs)
+    forecasts = pd.read_parquet(path)
+    print(f"예측 {len(forecasts):,}행: {path} ({time.perf_counter() - start:.2f}s)")
+
+    if args.db:
+        from src.utils.db_util import get_engine
+        rows = write_forecast_table(get_engine(), forecasts)
+        print(f"forecast 테이블 적재: {rows:,}행")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# src/modeling/prophet_models.py
+
+import os
+import sys
+import time
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import pandas as pd
+from src.analysis.coefficients import region_panel
+from src.modeling.registry import load_model, save_model, prune
+
+"""
+지역별 Prophet 모형 일괄 적합 파이프라인 (streamlit_prophet_app.py용)
+- 모형: 월평균 농도(y) ~ Prophet(interval_width=0.95) + 진료 건수 외생 변수 (앱과 같은 구성)
+- 모든 지역을 프로세스 풀에서 동시에 적합하고, model_to_json 형식으로 모형 저장소(registry.py)에 저장
+  (저장 이름: prophet_<오염물질>_<질환>_<지역>, 지문: 해당 지역 학습 데이터의 해시)
+- 지문이 같은 모형이 이미 있으면 다시 적합하지 않음 → 서버를 재시작해도 적합 결과 유지
+- 이전 모형의 학습 데이터가 현재 데이터의 앞부분과 같으면(새 달만 추가된 경우)
+  이전 파라미터(k, m, sigma_obs, delta, beta)를 Stan 초기값으로 넘겨 warm start
+"""
+
+INTERVAL_WIDTH = 0.95
+
+# 지역마다 남겨 둘 모형 버전 수
+KEEP_VERSIONS = 2
+
+
+def regressor_name(disease):
+    return f'{disease}_cases'
+
+
+def model_name(pollutant, disease, region):
+    return f'prophet_{pollutant}_{disease}_{region}'
+
+
+def prophet_frame(pollutant='pm10', disease='asthma'):
+    """
+    지역별 Prophet 학습 데이터 (region, ds, y, <질환>_cases)를 만듭니다.
+    - ds: 월초 날짜, y: 월평균 농도, <질환>_cases: 같은 달 진료 건수 합계
+    """
+    visits, levels = region_panel(pollutant, disease)
+    frame = levels.merge(visits, on=['month', 'region'], how='inner').dropna(subset=['level'])
+    frame['ds'] = pd.PeriodIndex.from_ordinals(frame['month'].to_numpy(), freq='M').to_timestamp()
+    frame = frame.rename(columns={'level': 'y', 'visit_count': regressor_name(disease)})
+    return frame[['region', 'ds', 'y', regressor_name(disease)]].sort_values(['region', 'ds']).reset_index(drop=True)
+
+
+def frame_fingerprint(df):
+    """
+    학습 데이터(ds, y, 외생 변수) 내용의 해시
+    """
+    hashed = pd.util.hash_pandas_object(df.reset_index(drop=True), index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def stan_init(model):
+    """
+    적합된 Prophet 모형의 파라미터를 다음 적합의 Stan 초기값 dict로 바꿉니다.
+    """
+    init = {name: model.params[name][0][0] for name in ('k', 'm', 'sigma_obs')}
+    init.update({name: model.params[name][0] for name in ('delta', 'beta')})
+    return init
+
+
+def _warm_start_version(previous, df):
+    """
+    이전 모형의 학습 데이터가 현재 데이터의 앞부분과 같으면 그 버전을 반환합니다 (아니면 None).
+    """
+    if previous is None:
+        return None
+    last_ds = pd.Timestamp(previous.meta['params']['last_ds'])
+    prefix = df[df['ds'] <= last_ds]
+    if len(prefix) < len(df) and frame_fingerprint(prefix) == previous.meta['fingerprint']:
+        return previous.meta['version']
+    return None
+
+
+def _fit_task(task):
+    """
+    프로세스 풀 작업: 지역 하나를 적합해 저장소에 저장하고 (지역, 버전, warm start 여부)를 반환합니다.
+    """
+    from prophet import Prophet
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    name, region, df, fingerprint, regressor, warm_version = task
+    init = None
+    if warm_version is not None:
+        init = stan_init(load_model(name, version=warm_version).model)
+
+    model = Prophet(interval_width=INTERVAL_WIDTH)
+    model.add_regressor(regressor)
+    if init is not None:
+        model.fit(df, init=init)
+    else:
+        model.fit(df)
+
+    saved = save_model(
+        name, model, fingerprint, features=[regressor],
+        params={'region': region, 'last_ds': df['ds'].max().strftime('%Y-%m-%d'), 'rows': len(df)},
+    )
+    prune(name, keep=KEEP_VERSIONS)
+    return region, saved.meta['version'], warm_version is not None
+
+
+def fit_all(pollutant='pm10', disease='asthma', regions=None, jobs=None, force=False):
+    """
+    지역별 Prophet 모형을 (필요한 지역만) 병렬로 적합합니다.
+    - regions: 적합할 지역 목록 (기본: 전체)
+    - force: True면 지문이 같아도 다시 적합 (warm start 조건은 그대로 적용)
+    - 반환: {지역: 'cached' | 'warm' | 'cold'}
+    """
+    frame = prophet_frame(pollutant, disease)
+    regressor = regressor_name(disease)
+    if regions is not None:
+        frame = frame[frame['region'].isin(regions)]
+
+    status, tasks = {}, []
+    for region, df in frame.groupby('region', sort=True):
+        df = df[['ds', 'y', regressor]].reset_index(drop=True)
+        name = model_name(pollutant, disease, region)
+        fingerprint = frame_fingerprint(df)
+        if not force and load_model(name, fingerprint=fingerprint) is not None:
+            status[region] = 'cached'
+            continue
+        warm = _warm_start_version(load_model(name), df)
+        tasks.append((name, region, df, fingerprint, regressor, warm))
+
+    jobs = jobs or min(len(tasks), os.cpu_count() or 1) or 1
+    if jobs == 1:
+        results = [_fit_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_fit_task, tasks))
+    for region, _, warm in results:
+        status[region] = 'warm' if warm else 'cold'
+    return status
+
+
+def load_prophet(region, pollutant='pm10', disease='asthma', fit_missing=True):
+    """
+    지역의 Prophet 모형(LazyModel)과 학습 데이터를 반환합니다.
+    - 현재 데이터 지문과 같은 모형 → 없으면 fit_missing=True일 때 그 지역만 적합해 저장
+    - 반환: (LazyModel 또는 None, 학습 데이터)
+    """
+    frame = prophet_frame(pollutant, disease)
+    df = frame[frame['region'] == region][['ds', 'y', regressor_name(disease)]].reset_index(drop=True)
+    if df.empty:
+        return None, df
+    name = model_name(pollutant, disease, region)
+    model = load_model(name, fingerprint=frame_fingerprint(df))
+    if model is None and fit_missing:
+        fit_all(pollutant, disease, regions=[region], jobs=1)
+        model = load_model(name, fingerprint=frame_fingerprint(df))
+    return model, df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지역별 Prophet 모형 일괄 적합")
+    parser.add_argument('--pollutant', default='pm10')
+    parser.add_argument('--disease', default='asthma')
+    parser.add_argument('--jobs', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--force', action='store_true', help="지문이 같아도 다시 적합")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    status = fit_all(args.pollutant, args.disease, jobs=args.jobs, force=args.force)
+    counts = pd.Series(status).value_counts().to_dict()
+    print(f"Prophet {len(status)}개 지역: {counts} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+# src/modeling/registry.py
+
+import sys
+import json
+import shutil
+import datetime
+import threading
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import joblib
+import pandas as pd
+
+"""
+학습된 모형 저장소 (model registry)
+- models/<이름>/<버전>/ 아래에 모형 파일 + meta.json(데이터 지문, 피처 목록, 지표, 파라미터) 저장
+- 형식: 'joblib'(scikit-learn 등, 압축 없이 저장해 numpy 배열을 mmap으로 읽음),
+  'xgboost'/'lightgbm'(부스터 고유 형식), 'prophet'(model_to_json)
+- 불러오기는 지연 로딩: load_model()은 LazyModel을 돌려주고, 처음 predict 등을 호출할 때 파일을 읽음
+  (같은 버전은 프로세스 안에서 한 번만 읽어 공유)
+- 대시보드/배치 예측은 데이터 지문으로 맞는 버전을 찾아 쓰기만 하고, 요청 시점에 학습하지 않음
+"""
+
+MODELS_DIR = BASE_DIR / 'models'
+
+_FILENAMES = {
+    'joblib':   'model.joblib',
+    'xgboost':  'model.ubj',
+    'lightgbm': 'model.txt',
+    'prophet':  'model.json',
+}
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def _detect_format(model):
+    module = type(model).__module__
+    if module.startswith('xgboost'):
+        return 'xgboost'
+    if module.startswith('lightgbm'):
+        return 'lightgbm'
+    if module.startswith('prophet'):
+        return 'prophet'
+    return 'joblib'
+
+
+def _write(model, fmt, path):
+    if fmt == 'joblib':
+        joblib.dump(model, path)
+    elif fmt == 'xgboost':
+        model.save_model(path)
+    elif fmt == 'lightgbm':
+        model.booster_.save_model(str(path))
+    elif fmt == 'prophet':
+        from prophet.serialize import model_to_json
+        path.write_text(model_to_json(model), encoding='utf-8')
+    else:
+        raise ValueError(f"Unknown model format: {fmt}")
+
+
+def _read(fmt, path):
+    if fmt == 'joblib':
+        return joblib.load(path, mmap_mode='r')
+    if fmt == 'xgboost':
+        import xgboost
+        model = xgboost.XGBRegressor()
+        model.load_model(path)
+        return model
+    if fmt == 'lightgbm':
+        import lightgbm
+        return lightgbm.Booster(model_file=str(path))
+    if fmt == 'prophet':
+        from prophet.serialize import model_from_json
+        return model_from_json(path.read_text(encoding='utf-8'))
+    raise ValueError(f"Unknown model format: {fmt}")
+
+
+class LazyModel:
+    """
+    레지스트리에 저장된 모형 하나 (처음 사용할 때 파일을 읽음)
+    - meta: meta.json 내용 (name, version, fingerprint, features, metrics, params, format)
+    - model: 실제 추정기 (접근 시 로드)
+    """
+
+    def __init__(self, path, meta):
+        self.path = Path(path)
+        self.meta = meta
+
+    @property
+    def model(self):
+        key = str(self.path)
+        with _loaded_lock:
+            model = _loaded.get(key)
+        if model is None:
+            model = _read(self.meta['format'], self.path / _FILENAMES[self.meta['format']])
+            with _loaded_lock:
+                model = _loaded.setdefault(key, model)
+        return model
+
+    @property
+    def features(self):
+        return self.meta.get('features') or []
+
+    def predict(self, X, *args, **kwargs):
+        return self.model.predict(X, *args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyModel({self.meta['name']!r}, version={self.meta['version']!r})"
+
+
+def save_model(name, model, fingerprint, features=None, metrics=None, params=None, fmt=None):
+    """
+    모형을 새 버전으로 저장하고 LazyModel을 반환합니다.
+    - fingerprint: 학습 데이터 지문 (load_model로 같은 데이터의 모형을 찾을 때 사용)
+    - fmt: None이면 모형 종류에 따라 자동 선택
+    """
+    fmt = fmt or _detect_format(model)
+    now = datetime.datetime.now()
+    version = now.strftime('%Y%m%d%H%M%S%f')
+    path = MODELS_DIR / name / version
+    tmp = MODELS_DIR / name / f'.{version}.tmp'
+    tmp.mkdir(parents=True, exist_ok=True)
+    try:
+        _write(model, fmt, tmp / _FILENAMES[fmt])
+        meta = {
+            'name': name,
+            'version': version,
+            'format': fmt,
+            'fingerprint': fingerprint,
+            'features': list(features) if features is not None else None,
+            'metrics': metrics or {},
+            'params': params or {},
+            'created_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        with open(tmp / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2, default=str)
+        tmp.rename(path)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return LazyModel(path, meta)
+
+
+def _versions(name):
+    root = MODELS_DIR / name
+    if not root.exists():
+        return []
+    metas = []
+    for meta_path in sorted(root.glob('[!.]*/meta.json'), reverse=True):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            metas.append((meta_path.parent, json.load(f)))
+    return metas
+
+
+def load_model(name, fingerprint=None, version=None):
+    """
+    저장된 모형을 LazyModel로 반환합니다 (없으면 None).
+    - version을 주면 해당 버전, fingerprint를 주면 그 지문의 최신 버전, 둘 다 없으면 최신 버전
+    """
+    for path, meta in _versions(name):
+        if version is not None and meta['version'] != version:
+            continue
+        if fingerprint is not None and meta['fingerprint'] != fingerprint:
+            continue
+        return LazyModel(path, meta)
+    return None
+
+
+def list_models(name=None):
+    """
+    저장된 모형 버전 목록을 표로 반환합니다 (이름별 최신 버전 먼저).
+    """
+    names = [name] if name else sorted(p.name for p in MODELS_DIR.glob('*') if p.is_dir())
+    rows = []
+    for n in names:
+        for _, meta in _versions(n):
+            rows.append({
+                'name': n, 'version': meta['version'], 'format': meta['format'],
+                'fingerprint': meta['fingerprint'], 'created_at': meta['created_at'],
+                **{f'metric_{k}': v for k, v in (meta.get('metrics') or {}).items()},
+            })
+    return pd.DataFrame(rows)
+
+
+def prune(name, keep=3):
+    """
+    이름별로 최신 keep개 버전만 남기고 지웁니다.
+    """
+    removed = 0
+    for path, _ in _versions(name)[keep:]:
+        with _loaded_lock:
+            _loaded.pop(str(path), None)
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+    return removed
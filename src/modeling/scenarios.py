@@ -0,0 +1,161 @@
+# src/modeling/scenarios.py
+
+import sys
+import itertools
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+import pandas as pd
+
+"""
+what-if 시나리오 엔진 (streamlit_ex.py의 예측 슬라이더용)
+- 그룹(예: 지역 × 연도)마다 환자 수 ~ 절편 + 입력 변수(PM10, PM2.5, 평균기온) 선형회귀를
+  그룹별 정규방정식으로 한 번에 적합 (LinearRegression을 그룹마다 다시 만들지 않음)
+- 입력 변수 격자 전체(예: PM10 × PM2.5 × 기온)의 예측값을 (그룹 수 × 격자 점 수) 행렬곱 한 번으로
+  미리 계산해 응답 곡면(surface)으로 보관
+- 슬라이더 값 조회는 격자 다중선형 보간 (선형모형이므로 격자 범위 안에서는 직접 예측과 같은 값)
+- 여러 시나리오(그룹 × 입력값 조합)를 한 번에 평가하고, 최근 월 환자당 병상·의료진 비율로
+  필요 병상/간호사/의사 수를 계산 (capacity_plan)
+"""
+
+# 기본 격자: streamlit_ex.py 슬라이더 범위와 같음
+DEFAULT_AXES = {
+    'PM10':   np.arange(0, 151, 5, dtype=float),
+    'PM2.5':  np.arange(0, 81, 5, dtype=float),
+    '평균기온': np.arange(-5, 35.5, 2.5),
+}
+
+
+def fit_grouped_linear(frame, features, target, by):
+    """
+    그룹별 선형회귀 계수를 한 번에 계산합니다.
+    - 반환: (그룹 키 DataFrame, 계수 배열[그룹, 1 + 변수 수] — 첫 열이 절편)
+    - LinearRegression과 같이 그룹 안에서 X, y를 평균으로 중심화한 뒤 기울기를 구하고
+      절편 = ȳ - β·x̄ (관측이 변수 수보다 적은 그룹은 기울기만 최소노름 해(pinv))
+    - 그룹 키가 결측인 행은 제외 (ngroup()이 -1을 주므로 코드로 쓰기 전에 제거)
+    """
+    frame = frame.dropna(subset=list(by))
+    keys, codes = _group_codes(frame, by)
+    X = frame[features].to_numpy(dtype=float)
+    y = frame[target].to_numpy(dtype=float)
+
+    g, k = len(keys), X.shape[1]
+    counts = np.bincount(codes, minlength=g).astype(float)
+    x_mean = np.zeros((g, k))
+    np.add.at(x_mean, codes, X)
+    x_mean /= counts[:, None]
+    y_mean = np.bincount(codes, weights=y, minlength=g) / counts
+
+    Xc = X - x_mean[codes]
+    yc = y - y_mean[codes]
+    XtX = np.zeros((g, k, k))
+    Xty = np.zeros((g, k))
+    np.add.at(XtX, codes, Xc[:, :, None] * Xc[:, None, :])
+    np.add.at(Xty, codes, Xc * yc[:, None])
+    slopes = np.einsum('gij,gj->gi', np.linalg.pinv(XtX, hermitian=True), Xty)
+    intercepts = y_mean - np.einsum('gi,gi->g', slopes, x_mean)
+    return keys, np.column_stack([intercepts, slopes])
+
+
+def _group_codes(frame, by):
+    grouped = frame.groupby(by, sort=True)
+    keys = grouped.size().reset_index()[by]
+    return keys, grouped.ngroup().to_numpy()
+
+
+class ScenarioGrid:
+    """
+    그룹별 미리 계산한 응답 곡면
+    - keys: 그룹 키 DataFrame (surface 첫 번째 축 순서)
+    - axes: {입력 변수: 격자 값 배열}
+    - surface: (그룹 수, 격자 축 길이...) 예측값 배열
+    """
+
+    def __init__(self, keys, axes, surface):
+        self.keys = keys.reset_index(drop=True)
+        self.axes = dict(axes)
+        self.surface = surface
+        self._index = pd.MultiIndex.from_frame(self.keys)
+
+    @classmethod
+    def fit(cls, frame, features=None, target='환자 수', by=('지역',), axes=None):
+        """
+        그룹별 선형모형을 적합하고 격자 전체를 한 번에 예측해 ScenarioGrid를 만듭니다.
+        """
+        axes = {f: np.asarray(v, dtype=float) for f, v in (axes or DEFAULT_AXES).items()}
+        features = list(features or axes)
+        by = list(by)
+        keys, coefs = fit_grouped_linear(frame, features, target, by)
+
+        mesh = np.meshgrid(*(axes[f] for f in features), indexing='ij')
+        design = np.column_stack([np.ones(mesh[0].size)] + [m.ravel() for m in mesh])
+        surface = (coefs @ design.T).reshape((len(keys),) + mesh[0].shape)
+        return cls(keys, {f: axes[f] for f in features}, surface)
+
+    def group_index(self, keys):
+        """
+        그룹 키 표(keys 컬럼)의 surface 행 번호 배열 (없는 그룹이면 KeyError)
+        """
+        index = self._index.get_indexer(pd.MultiIndex.from_frame(keys[list(self.keys.columns)]))
+        if (index < 0).any():
+            raise KeyError(f"Unknown scenario group: {keys[index < 0].iloc[0].tolist()}")
+        return index
+
+    def lookup(self, key, values):
+        """
+        그룹 하나의 예측값 (슬라이더 값 조회용)
+        - key: 그룹 키 값 (그룹 컬럼이 하나면 스칼라, 여러 개면 튜플)
+        - values: {입력 변수: 값}
+        """
+        key = key if isinstance(key, tuple) else (key,)
+        groups = self.group_index(pd.DataFrame([key], columns=self.keys.columns))
+        point = np.array([[values[f] for f in self.axes]], dtype=float)
+        return float(self._interpolate(groups, point)[0])
+
+    def predict(self, scenarios):
+        """
+        시나리오 표(그룹 키 컬럼 + 입력 변수 컬럼)의 예측값을 한 번에 계산합니다.
+        """
+        groups = self.group_index(scenarios)
+        return self._interpolate(groups, scenarios[list(self.axes)].to_numpy(dtype=float))
+
+    def _interpolate(self, groups, points):
+        """
+        격자 다중선형 보간 (격자 밖 값은 가장자리 구간으로 선형 외삽)
+        """
+        lower, weight = [], []
+        for d, grid in enumerate(self.axes.values()):
+            i = np.clip(np.searchsorted(grid, points[:, d], side='right') - 1, 0, len(grid) - 2)
+            lower.append(i)
+            weight.append((points[:, d] - grid[i]) / (grid[i + 1] - grid[i]))
+
+        result = np.zeros(len(points))
+        for corner in itertools.product((0, 1), repeat=len(lower)):
+            index = tuple(i + c for i, c in zip(lower, corner))
+            w = np.prod([t if c else 1.0 - t for t, c in zip(weight, corner)], axis=0)
+            result += w * self.surface[(groups,) + index]
+        return result
+
+
+def capacity_plan(predicted, current):
+    """
+    예측 환자 수에 필요한 병상·의료진 수를 계산합니다.
+    - predicted: 예측 환자 수 배열
+    - current: 같은 길이의 기준 현황 표 (환자 수, 총 병상 수, 남은 병상 수, 간호사 수, 의사 수)
+    - 기준 현황의 환자당 사용 병상·간호사·의사 비율이 유지된다고 가정
+    """
+    predicted = np.maximum(np.asarray(predicted, dtype=float), 0.0)
+    patients = current['환자 수'].to_numpy(dtype=float)
+    scale = np.divide(predicted, patients, out=np.ones_like(predicted), where=patients > 0)
+    used = (current['총 병상 수'] - current['남은 병상 수']).to_numpy(dtype=float)
+
+    plan = pd.DataFrame({'예측 환자 수': np.round(predicted).astype(int)}, index=current.index)
+    plan['필요 병상 수'] = np.ceil(used * scale).astype(int)
+    plan['병상 부족'] = np.maximum(plan['필요 병상 수'] - current['총 병상 수'], 0)
+    plan['필요 간호사 수'] = np.ceil(current['간호사 수'].to_numpy(dtype=float) * scale).astype(int)
+    plan['필요 의사 수'] = np.ceil(current['의사 수'].to_numpy(dtype=float) * scale).astype(int)
+    return plan
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# src/modeling/train.py
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import make_pipeline
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor
+from scripts.data_loader import load_data, data_fingerprint
+from src.etl.watermark import normalize_year_month
+from src.modeling.features import exposure_features, feature_columns, FEATURE_DIR
+from src.modeling.registry import save_model, load_model
+
+"""
+여러 모형 동시 학습 + 지역별 rolling-origin 백테스트 하니스
+- 학습 행렬을 한 번만 만들어 .npy로 저장하고, 작업 프로세스는 np.load(mmap_mode='r')로 읽기 전용 공유
+  (행을 월 순으로 정렬해 두므로 학습 구간은 복사 없는 앞부분 슬라이스)
+- 행: 지역×월 진료 건수 합계 (대상), 열: 노출 피처(features.py) + 연·월 + 계절/지역 원-핫
+  (노트북마다 반복하던 OneHotEncoder 파이프라인을 행렬 생성 단계에서 한 번만 수행)
+- 후보 모형: linear, rf (scikit-learn), xgb, lgbm (설치된 경우에만 — pip install -e .[models])
+- rolling-origin: 기준 월(origin)마다 그 이전 달로 학습하고 이후 horizon개월을 예측,
+  (모형 × origin) 작업을 프로세스 풀에서 동시에 실행
+- 결과: 모형별 리더보드(RMSE/MAE/R², 학습·예측 시간)와 지역별 오차 표
+- --register: 리더보드 1위 모형을 전체 기간으로 다시 학습해 모형 저장소(registry.py)에 저장
+"""
+
+# 선택 의존성: 없으면 후보에서 제외
+try:
+    import xgboost
+    _HAS_XGBOOST = True
+except ImportError:
+    _HAS_XGBOOST = False
+
+try:
+    import lightgbm
+    _HAS_LIGHTGBM = True
+except ImportError:
+    _HAS_LIGHTGBM = False
+
+RANDOM_STATE = 42
+
+# 백테스트 기본 설정: 마지막 N_ORIGINS개 기준 월을 STEP개월 간격으로, 각 HORIZON개월 예측
+N_ORIGINS = 3
+HORIZON = 12
+STEP = 12
+
+BACKTEST_DIR = BASE_DIR / 'data' / 'processed' / 'backtest'
+
+
+def _linear():
+    return make_pipeline(SimpleImputer(strategy='median'), LinearRegression())
+
+
+def _random_forest():
+    return make_pipeline(
+        SimpleImputer(strategy='median'),
+        RandomForestRegressor(
+            n_estimators=200, max_features=1 / 3, min_samples_leaf=2,
+            random_state=RANDOM_STATE, n_jobs=1,
+        ),
+    )
+
+
+def _xgboost():
+    return xgboost.XGBRegressor(
+        n_estimators=400, learning_rate=0.05, max_depth=6, subsample=0.8,
+        random_state=RANDOM_STATE, n_jobs=1,
+    )
+
+
+def _lightgbm():
+    return lightgbm.LGBMRegressor(
+        n_estimators=400, learning_rate=0.05, num_leaves=31,
+        random_state=RANDOM_STATE, n_jobs=1, verbose=-1,
+    )
+
+
+# 모형 이름 → (추정기 생성 함수, 사용 가능 여부)
+CANDIDATES = {
+    'linear': (_linear, True),
+    'rf':     (_random_forest, True),
+    'xgb':    (_xgboost, _HAS_XGBOOST),
+    'lgbm':   (_lightgbm, _HAS_LIGHTGBM),
+}
+
+
+def available_models():
+    return [name for name, (_, ok) in CANDIDATES.items() if ok]
+
+
+def make_model(name):
+    """
+    후보 이름으로 새 추정기를 만듭니다 (설치되지 않은 선택 모형이면 ImportError).
+    """
+    factory, ok = CANDIDATES[name]
+    if not ok:
+        raise ImportError(f"Model '{name}' requires an optional package (pip install -e .[models])")
+    return factory()
+
+
+def _month_ordinals(values):
+    values = pd.Series(values)
+    lookup = {v: pd.Period(normalize_year_month(v), freq='M').ordinal for v in pd.unique(values.dropna())}
+    return values.map(lookup)
+
+
+def training_frame(pollutant='pm10', disease='asthma'):
+    """
+    지역×월 진료 건수 합계에 노출 피처와 달력 피처를 붙인 학습용 표를 만듭니다 (월, 지역 순 정렬).
+    """
+    claims = load_data(f'{pollutant}_{disease}_processed_v1', section='processed', compact=True)
+    target = claims.groupby(['year_month', 'region'], as_index=False, observed=True)['visit_count'].sum()
+    target['year_month'] = target['year_month'].map(normalize_year_month)
+    target['region'] = target['region'].astype(str)
+
+    features = exposure_features()
+    features['region'] = features['region'].astype(str)
+    frame = target.merge(features, on=['region', 'year_month'], how='inner')
+
+    date_map = load_data('date_map', section='reference')
+    seasons = pd.DataFrame({
+        'year_month': date_map['date_id'].map(normalize_year_month),
+        'season': date_map['season'].astype(str),
+    }).drop_duplicates('year_month')
+    frame = frame.merge(seasons, on='year_month', how='left')
+
+    frame['month_id'] = _month_ordinals(frame['year_month']).astype(int)
+    frame['year'] = frame['year_month'].str[:4].astype(int)
+    frame['month'] = frame['year_month'].str[5:7].astype(int)
+    return frame.sort_values(['month_id', 'region']).reset_index(drop=True)
+
+
+def _matrix_dir(pollutant, disease):
+    inputs = [
+        (f'{pollutant}_{disease}_processed_v1', 'processed'),
+        ('date_map', 'reference'),
+    ] + [(f'{p}_processed_v1', 'processed') for p in ('pm10', 'pm25')]
+    spec = json.dumps([data_fingerprint(inputs), feature_columns()], sort_keys=True)
+    key = hashlib.sha1(spec.encode('utf-8')).hexdigest()[:16]
+    return FEATURE_DIR / f'matrix_{pollutant}_{disease}_{key}'
+
+
+def build_matrix(pollutant='pm10', disease='asthma'):
+    """
+    학습 행렬(X.npy, y.npy)과 메타 정보(meta.json)를 만들거나 캐시에서 찾아 디렉터리 경로를 반환합니다.
+    - X: float32 (행: 월·지역 순), 결측 피처는 NaN 그대로 (모형 쪽에서 처리)
+    """
+    path = _matrix_dir(pollutant, disease)
+    if (path / 'meta.json').exists():
+        return path
+
+    frame = training_frame(pollutant, disease)
+    numeric = feature_columns() + ['year', 'month']
+    seasons = pd.get_dummies(frame['season'], prefix='season', dtype='float32')
+    regions = pd.get_dummies(frame['region'], prefix='region', dtype='float32')
+    X = np.hstack([frame[numeric].to_numpy(dtype='float32'), seasons.to_numpy(), regions.to_numpy()])
+
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / 'X.npy', np.ascontiguousarray(X))
+    np.save(path / 'y.npy', frame['visit_count'].to_numpy(dtype='float64'))
+    np.save(path / 'month_id.npy', frame['month_id'].to_numpy(dtype='int64'))
+    meta = {
+        'pollutant': pollutant, 'disease': disease,
+        'columns': numeric + list(seasons.columns) + list(regions.columns),
+        'regions': frame['region'].tolist(),
+        'year_months': frame['year_month'].tolist(),
+    }
+    with open(path / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    # 같은 (오염물질, 질환)의 이전 행렬은 지움
+    for old in FEATURE_DIR.glob(f'matrix_{pollutant}_{disease}_*'):
+        if old != path:
+            for file in old.iterdir():
+                file.unlink(missing_ok=True)
+            old.rmdir()
+    return path
+
+
+def load_matrix(path):
+    """
+    학습 행렬을 읽기 전용 memory-map으로 엽니다.
+    - 반환: (X, y, month_id, meta)
+    """
+    path = Path(path)
+    with open(path / 'meta.json', 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    return (
+        np.load(path / 'X.npy', mmap_mode='r'),
+        np.load(path / 'y.npy', mmap_mode='r'),
+        np.load(path / 'month_id.npy', mmap_mode='r'),
+        meta,
+    )
+
+
+def matrix_fingerprint(path):
+    """
+    학습 행렬 키 (입력 파일 지문 + 피처 구성, 디렉터리 이름 끝부분)
+    """
+    return Path(path).name.rsplit('_', 1)[-1]
+
+
+def rolling_origins(month_id, n_origins=N_ORIGINS, horizon=HORIZON, step=STEP):
+    """
+    (학습 끝 행, 평가 끝 행, 기준 월 서수) 목록을 반환합니다 (행이 월 순으로 정렬되어 있다고 가정).
+    - 마지막 기준 월은 데이터 마지막 달 - horizon + 1, 그 앞으로 step개월씩
+    """
+    last = int(month_id[-1])
+    origins = []
+    for i in range(n_origins):
+        origin = last - horizon + 1 - i * step
+        train_end = int(np.searchsorted(month_id, origin, side='left'))
+        test_end = int(np.searchsorted(month_id, origin + horizon, side='left'))
+        if train_end > 0 and test_end > train_end:
+            origins.append((train_end, test_end, origin))
+    return sorted(origins)
+
+
+def _fit_predict(task):
+    """
+    프로세스 풀 작업: memory-map 행렬의 앞부분으로 학습하고 다음 구간을 예측합니다.
+    """
+    path, name, train_end, test_end = task
+    X, y, _, _ = load_matrix(path)
+    model = make_model(name)
+
+    start = time.perf_counter()
+    model.fit(X[:train_end], y[:train_end])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pred = model.predict(X[train_end:test_end])
+    predict_seconds = time.perf_counter() - start
+    return np.asarray(pred, dtype=float), fit_seconds, predict_seconds
+
+
+def _scores(actual, pred):
+    err = pred - actual
+    ss_tot = ((actual - actual.mean()) ** 2).sum()
+    return {
+        'rmse': float(np.sqrt(np.mean(err ** 2))),
+        'mae': float(np.mean(np.abs(err))),
+        'r2': float(1 - (err ** 2).sum() / ss_tot) if ss_tot > 0 else np.nan,
+    }
+
+
+def backtest(pollutant='pm10', disease='asthma', models=None, n_origins=N_ORIGINS,
+             horizon=HORIZON, step=STEP, jobs=None):
+    """
+    후보 모형들의 rolling-origin 백테스트를 실행합니다.
+    - 반환: (leaderboard, region_scores, predictions)
+      leaderboard   : 모형별 평균 RMSE/MAE/R²와 학습·예측 시간 합계 (RMSE 오름차순)
+      region_scores : 모형 × 지역 RMSE/MAE
+      predictions   : 모형 × origin × 지역 × 월 실제값/예측값
+    """
+    models = models or available_models()
+    path = build_matrix(pollutant, disease)
+    X, y, month_id, meta = load_matrix(path)
+    origins = rolling_origins(np.asarray(month_id), n_origins, horizon, step)
+    if not origins:
+        raise ValueError(f"Not enough months for {n_origins} origins with horizon {horizon}")
+
+    tasks = [(name, o) for name in models for o in origins]
+    payload = [(str(path), name, train_end, test_end) for name, (train_end, test_end, _) in tasks]
+    jobs = jobs or min(len(payload), os.cpu_count() or 1)
+    if jobs == 1:
+        results = [_fit_predict(t) for t in payload]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_fit_predict, payload))
+
+    regions = np.asarray(meta['regions'], dtype=object)
+    year_months = np.asarray(meta['year_months'], dtype=object)
+    frames, rows = [], []
+    for (name, (train_end, test_end, origin)), (pred, fit_s, pred_s) in zip(tasks, results):
+        actual = np.asarray(y[train_end:test_end])
+        origin_label = pd.Period(ordinal=origin, freq='M').strftime('%Y-%m')
+        frames.append(pd.DataFrame({
+            'model': name, 'origin': origin_label,
+            'region': regions[train_end:test_end], 'year_month': year_months[train_end:test_end],
+            'actual': actual, 'predicted': pred,
+        }))
+        rows.append({'model': name, 'origin': origin_label, 'train_rows': train_end,
+                     'fit_seconds': fit_s, 'predict_seconds': pred_s, **_scores(actual, pred)})
+    predictions = pd.concat(frames, ignore_index=True)
+    runs = pd.DataFrame(rows)
+
+    leaderboard = (
+        runs.groupby('model', as_index=False)
+        .agg(rmse=('rmse', 'mean'), mae=('mae', 'mean'), r2=('r2', 'mean'),
+             fit_seconds=('fit_seconds', 'sum'), predict_seconds=('predict_seconds', 'sum'),
+             origins=('origin', 'count'))
+        .sort_values('rmse')
+        .reset_index(drop=True)
+    )
+    err = predictions['predicted'] - predictions['actual']
+    region_scores = (
+        predictions.assign(sq=err ** 2, abs=err.abs())
+        .groupby(['model', 'region'], as_index=False)
+        .agg(rmse=('sq', 'mean'), mae=('abs', 'mean'), n=('sq', 'size'))
+    )
+    region_scores['rmse'] = np.sqrt(region_scores['rmse'])
+    return leaderboard, region_scores, predictions
+
+
+def register_model(pollutant='pm10', disease='asthma', name='rf', metrics=None):
+    """
+    후보 모형을 전체 기간 행렬로 학습해 모형 저장소에 저장하고 LazyModel을 반환합니다.
+    - 저장 이름: <오염물질>_<질환>_<모형>, 지문: 학습 행렬 키
+    """
+    path = build_matrix(pollutant, disease)
+    X, y, _, meta = load_matrix(path)
+    model = make_model(name)
+    model.fit(X, y)
+    return save_model(
+        f'{pollutant}_{disease}_{name}', model, matrix_fingerprint(path),
+        features=meta['columns'], metrics=metrics,
+        params={'pollutant': pollutant, 'disease': disease, 'model': name},
+    )
+
+
+def registered_model(pollutant='pm10', disease='asthma', name='rf'):
+    """
+    현재 데이터 지문으로 학습된 모형을 저장소에서 찾습니다 (없으면 None — 학습하지 않음).
+    """
+    path = build_matrix(pollutant, disease)
+    return load_model(f'{pollutant}_{disease}_{name}', fingerprint=matrix_fingerprint(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모형 후보 rolling-origin 백테스트")
+    parser.add_argument('--pollutant', default='pm10')
+    parser.add_argument('--disease', default='asthma')
+    parser.add_argument('--models', nargs='*', default=None, help=f"후보 (기본: {' '.join(available_models())})")
+    parser.add_argument('--origins', type=int, default=N_ORIGINS, help="기준 월 개수")
+    parser.add_argument('--horizon', type=int, default=HORIZON, help="예측 개월 수")
+    parser.add_argument('--jobs', type=int, default=None, help="프로세스 수 (기본: 작업 수와 CPU 수 중 작은 값)")
+    parser.add_argument('--register', action='store_true', help="1위 모형을 전체 기간으로 학습해 저장소에 저장")
+    args = parser.parse_args()
+
+    leaderboard, region_scores, _ = backtest(
+        args.pollutant, args.disease, args.models,
+        n_origins=args.origins, horizon=args.horizon, jobs=args.jobs,
+    )
+    BACKTEST_DIR.mkdir(parents=True, exist_ok=True)
+    name = f'{args.pollutant}_{args.disease}'
+    leaderboard.to_csv(BACKTEST_DIR / f'leaderboard_{name}.csv', index=False, encoding='utf-8-sig')
+    region_scores.to_csv(BACKTEST_DIR / f'region_scores_{name}.csv', index=False, encoding='utf-8-sig')
+    print(leaderboard.to_string(index=False))
+
+    if args.register:
+        best = leaderboard.iloc[0]
+        metrics = {k: float(best[k]) for k in ('rmse', 'mae', 'r2')}
+        saved = register_model(args.pollutant, args.disease, best['model'], metrics=metrics)
+        print(f"저장: {saved.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,386 +1,341 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import json
-import plotly.express as px
-from sklearn.linear_model import LinearRegression
-
-# ----------------------------------------
-# 1) 페이지 설정: 가장 최상단에 딱 한 번만 호출해야 합니다.
-# ----------------------------------------
-st.set_page_config(
-    page_title="환자 수 예측 대시보드",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# src/utils/db_util.py
 
-# ----------------------------------------
-# 2) 다크 테마용 CSS 적용 (글씨 흰색, 배경 어둡게)
-# ----------------------------------------
-st.markdown(
-    """
-    <style>
-    /* 전체 배경, 컨테이너 어둡게 */
-    .reportview-container, .main, .block-container {
-        background-color: #121212;
-        color: #EEEEEE;
-    }
-    /* 사이드바 어둡게 */
-    .sidebar .sidebar-content {
-        background-color: #1F1F1F;
-        color: #EEEEEE;
-    }
-    /* 제목(H1) 흰색 */
-    h1, h2, h3, h4, h5, h6 {
-        color: #FFFFFF;
-    }
-    /* Plotly 차트 배경을 투명으로 만들어, 뒤 배경이 보이도록 */
-    .plotly-graph-div .main-svg {
-        background-color: rgba(0,0,0,0) !important;
-    }
-    /* Markdown 텍스트 흰색으로 */
-    .stMarkdown p {
-        color: #FFFFFF;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+import os
+import sys
+import threading
+from pathlib import Path
 
-# ----------------------------------------
-# 3) 데이터 생성 함수 (월별 환자 수가 100명대 스케일)
-# ----------------------------------------
-@st.cache_data
-def generate_data():
-    np.random.seed(42)
-    months = pd.date_range("2023-06-01", periods=12, freq="M")
-    regions = ["서울", "부산", "대구", "광주", "대전", "울산"]
-    data = []
-    for region in regions:
-        for month in months:
-            # PM/온도/의료인력 등 랜덤 생성
-            pm10 = np.random.randint(10, 80)      # 10~79
-            pm25 = np.random.randint(5, 50)       # 5~49
-            temp = np.random.uniform(0, 25)       # 0~25도
-            nurses = np.random.randint(30, 100)   # 30~99명
-            doctors = np.random.randint(15, 60)   # 15~59명
-            beds_total = np.random.randint(200, 400)  # 전체 병상 200~399
-            # 환자 수: PM*1.5 + PM2.5*2 + (25-temp)*2 + 노이즈
-            patients = int(pm10 * 1.5 + pm25 * 2 + (25 - temp) * 2 + np.random.normal(0, 10))
-            patients = max(patients, 0)  # 음수 방지
-            # 남은 병상 = 전체 - 사용(=랜덤으로 50~100명 차감)
-            used_beds = np.random.randint(50, 100)
-            beds_left = max(beds_total - used_beds, 0)
-            fatigue = np.random.randint(30, 80)  # 피로도 30~79
-            data.append({
-                "지역": region,
-                "월": month.strftime("%Y-%m"),
-                "date": month,
-                "PM10": pm10,
-                "PM2.5": pm25,
-                "평균기온": round(temp, 1),
-                "환자 수": patients,
-                "총 병상 수": beds_total,
-                "남은 병상 수": beds_left,
-                "간호사 수": nurses,
-                "의사 수": doctors,
-                "의료진 피로도": fatigue
-            })
-    return pd.DataFrame(data)
-
-df = generate_data()
-
-# ----------------------------------------
-# 4) 사이드바: 연도, 지역, 예측용 슬라이더
-# ----------------------------------------
-st.sidebar.header("조건 선택")
-years = sorted(df["월"].str[:4].unique())
-selected_year = st.sidebar.selectbox("년도 선택", years, index=0)
-selected_region = st.sidebar.selectbox("지역 선택", sorted(df["지역"].unique()), index=0)
-
-# 예측 입력값(슬라이더)
-input_pm10 = st.sidebar.slider("예상 PM10", min_value=0, max_value=150, value=50)
-input_pm25 = st.sidebar.slider("예상 PM2.5", min_value=0, max_value=80, value=30)
-input_temp = st.sidebar.slider("예상 평균기온(°C)", min_value=-5.0, max_value=35.0, value=18.0)
-
-# ----------------------------------------
-# 5) 제목: 선택된 지역을 중앙 정렬, 흰 글씨 처리
-# ----------------------------------------
-st.markdown(
-    f"<h1 style='text-align:center;'>지역별 환자 수 예측 대시보드 [{selected_region}]</h1>",
-    unsafe_allow_html=True
-)
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR))
 
-# ----------------------------------------
-# 6) 해당 연도·지역 데이터만 필터링 & 선형회귀 모델로 예측
-# ----------------------------------------
-region_df = df[
-    (df["지역"] == selected_region) &
-    (df["월"].str.startswith(selected_year))
-].reset_index(drop=True)
-
-# X, y 세팅
-X = region_df[["PM10", "PM2.5", "평균기온"]]
-y = region_df["환자 수"]
-lr_model = LinearRegression().fit(X, y)
-predicted_base = int(lr_model.predict([[input_pm10, input_pm25, input_temp]])[0])
-
-# “가장 최근 월” 복사해서, 슬라이더 입력값으로 교체 + 예측값 대입
-latest = region_df.iloc[-1].copy()
-latest["PM10"] = input_pm10
-latest["PM2.5"] = input_pm25
-latest["평균기온"] = input_temp
-latest["환자 수"] = predicted_base
-# 남은 병상 수도 “예측치 기준으로 간이 보정”
-latest_used = (latest["총 병상 수"] - latest["남은 병상 수"])  # 실제 사용 중인 병상
-# 예측 후 사용 병상을 +5% 정도로 늘린다고 가정
-predicted_used = int(latest_used * 1.05)
-predicted_used = min(predicted_used, latest["총 병상 수"])
-latest["남은 병상 수"] = latest["총 병상 수"] - predicted_used
-
-# 예측값만 붙여 놓을 새로운 DF (실측 데이터 뒤에 한 행 추가)
-pred_row = latest[["지역","월","date","PM10","PM2.5","평균기온","환자 수",
-                   "총 병상 수","남은 병상 수","간호사 수","의사 수","의료진 피로도"]]
-region_with_pred = pd.concat([region_df, pd.DataFrame([pred_row])], ignore_index=True)
-
-# ----------------------------------------
-# 7) 상단 레이아웃: 왼쪽(생략) / 중앙(월별 환자 추이+예측) / 오른쪽(병상·의료진 현황)
-# ----------------------------------------
-col1, col2, col3 = st.columns([1, 2, 1])
-
-# (■ 왼쪽: 공기질·날씨 부분 필요 시 삽입)
-
-# ■ 중앙: “월별 환자 수 실측(파란 실선) + 예측(노란 점선)” ■
-with col2:
-    st.markdown("<h4 style='color:white;'>월별 환자 수 추이 & 예측</h4>", unsafe_allow_html=True)
-
-    # (1) 실측치만 파란 실선
-    actual_fig = px.line(
-        region_df,
-        x="월", y="환자 수",
-        labels={"환자 수": "환자 수"},
-        line_shape="linear"
-    )
-    actual_fig.update_traces(
-        line=dict(color="#1E90FF", width=3),
-        marker=dict(size=6, color="#1E90FF"),
-        showlegend=False
-    )
-
-    # (2) 예측선: 마지막 실측 월 → 한 달 뒤 예측 점선을 노란으로
-    last_month = region_df["월"].iloc[-1]  # 예: "2023-12"
-    base_date = pd.to_datetime(last_month + "-01")
-    next_month = (base_date + pd.DateOffset(months=1)).strftime("%Y-%m")  # 예: "2024-01"
-    pred_df = pd.DataFrame({
-        "월": [last_month, next_month],
-        "환자 수": [region_df["환자 수"].iloc[-1], predicted_base]
-    })
-    pred_fig = px.line(
-        pred_df,
-        x="월", y="환자 수",
-        line_shape="linear"
-    )
-    pred_fig.update_traces(
-        line=dict(color="#FFD700", dash="dash", width=2),
-        marker=dict(size=6, color="#FFD700"),
-        showlegend=False
-    )
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 
-    # (3) 두 Figure 데이터를 합쳐 하나로 보여주기
-    combined_fig = px.line()
-    combined_fig.add_traces(actual_fig.data + pred_fig.data)
-
-    # (4) “현재” 레이블(마지막 실측 월 바로 위)
-    combined_fig.add_annotation(
-        x=last_month,
-        y=region_df["환자 수"].iloc[-1],
-        text="현재",
-        showarrow=True,
-        arrowhead=2,
-        ay=-12,
-        font=dict(color="white", size=12)
-    )
-    # (5) “예측” 레이블(다음 달 점 바로 위)
-    combined_fig.add_annotation(
-        x=next_month,
-        y=predicted_base,
-        text=f"{predicted_base:,}명",
-        showarrow=True,
-        arrowhead=2,
-        ay=-12,
-        font=dict(color="#FFD700", size=12)
+from scripts.schema import (
+    CLAIMS_FACTS, DIMENSION_TABLES, DISEASE_KEYS, POLLUTANT_FACTS, LOAD_GENERATION_TABLE,
+)
+from src.etl.watermark import normalize_year_month
+from src.utils.query_cache import QueryCache, default_cache, make_key
+
+"""
+DB 조회 계층 (DustDB)
+- 같은 접속 URL의 DustDB 인스턴스는 프로세스 안에서 풀 엔진 하나를 공유 (pool_pre_ping, pool_recycle)
+- 월 범위 / 지역 / 성별 / 연령군 필터와 컬럼 선택은 바인드 파라미터로 DB에서 처리
+- 사실 테이블의 region_id는 region_dim과 조인해 지역 이름으로 반환
+- chunksize를 주면 서버 사이드 커서(stream_results)로 DataFrame chunk를 차례로 반환
+- 롤업 테이블(scripts/rollups.py)은 load_rollup()으로 조회 (지역×월 수백 행 단위)
+- chunk가 아닌 조회 결과는 QueryCache(src/utils/query_cache.py)에 저장되고,
+  load_generation 세대가 바뀌면(init_database 재적재) 자동으로 무효화
+  (세대는 조회마다 단일 행 SELECT로 확인 → 재적재 직후부터 이전 결과가 반환되지 않음)
+- 접속 정보: .env의 DB_URL, 없으면 DB_BACKEND(mysql / duckdb / sqlite)에 따라 구성
+  (DuckDB·SQLite는 서버 없이 로컬 파일 하나로 같은 스키마와 조회 API를 사용,
+   테스트는 DustDB("sqlite:///...")처럼 URL을 직접 지정)
+"""
+
+# 사실 테이블별 출력 컬럼 → SQL 식, 월 컬럼
+_POLLUTANT_COLUMNS = lambda p: {
+    "date_id":     "f.date_id",
+    "region_name": "r.region_name",
+    p:             f"f.{p}",
+}
+_CLAIMS_COLUMNS = {
+    "ym":          "f.ym",
+    "region":      "r.region_name",
+    "gender":      "f.gender",
+    "age_group":   "f.age_group",
+    "visit_count": "f.visit_count",
+}
+TABLES = {
+    **{t: {"columns": _POLLUTANT_COLUMNS(p), "month": "f.date_id"} for p, t in POLLUTANT_FACTS.items()},
+    **{t: {"columns": _CLAIMS_COLUMNS, "month": "f.ym"} for t in CLAIMS_FACTS.values()},
+}
+
+# 롤업 테이블 → 키 컬럼 (지역 키가 있으면 region_dim 조인)
+ROLLUPS = {
+    "month_region":     ["ym", "region"],
+    "month_national":   ["ym", "n_regions"],
+    "month_region_age": ["ym", "region", "age_group"],
+    "season_region":    ["season", "region", "n_months"],
+}
+_ROLLUP_VALUES = ["pm_level"] + [f"{d}_visits" for d in DISEASE_KEYS]
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _local_path(path):
+    path = Path(path)
+    return path if path.is_absolute() else BASE_DIR / path
+
+
+def database_url():
+    """
+    .env 설정으로 SQLAlchemy 접속 URL을 만듭니다.
+    - DB_URL이 있으면 그대로 사용
+    - DB_BACKEND: 'mysql'(기본, DB_USER/DB_PASSWORD/DB_HOST/DB_PORT/DB_NAME),
+      'duckdb'(DUCKDB_PATH, 기본 data/dust.duckdb), 'sqlite'(SQLITE_PATH, 기본 data/dust.sqlite)
+    """
+    load_dotenv()
+    url = os.getenv("DB_URL")
+    if url:
+        return url
+    backend = os.getenv("DB_BACKEND", "mysql").lower()
+    if backend == "duckdb":
+        return f"duckdb:///{_local_path(os.getenv('DUCKDB_PATH', 'data/dust.duckdb')).as_posix()}"
+    if backend == "sqlite":
+        return f"sqlite:///{_local_path(os.getenv('SQLITE_PATH', 'data/dust.sqlite')).as_posix()}"
+    if backend != "mysql":
+        raise ValueError(f"Unknown DB_BACKEND: {backend} (available: mysql, duckdb, sqlite)")
+    return (
+        f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+        f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
     )
 
-    # (6) 다크 모드 맞춤 레이아웃
-    combined_fig.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font_color="white",
-        xaxis=dict(showgrid=False, tickfont=dict(color="white")),
-        yaxis=dict(showgrid=True, gridcolor="gray", tickfont=dict(color="white")),
-        margin=dict(t=20, b=20, l=20, r=20)
-    )
 
-    st.plotly_chart(combined_fig, use_container_width=True, height=320)
-
-# ■ 오른쪽: 병상 & 의료진 현황 (센터 정렬)
-with col3:
-    st.markdown("<h4 style='color:white;'>병상 & 의료진 현황</h4>", unsafe_allow_html=True)
-
-    # 현재 사용 병상 = 총 병상 - 남은 병상, 다음 달 예측 사용 병상 = 총 병상 - 남은 병상(예측)
-    current_used = int(latest["총 병상 수"] - region_df["남은 병상 수"].iloc[-1])
-    predicted_used = int(latest["총 병상 수"] - latest["남은 병상 수"])
-
-    # “현재” 병상 사용, “다음 달” 예측 병상 사용을 각각 색상 구분
-    current_color = "#00FF7F"   # 연두색
-    pred_color = "#FF4136"      # 빨간
-
-    # 각 수치 출력
-    st.markdown("<div style='text-align:center;'>", unsafe_allow_html=True)
-    st.markdown(
-        f"<div style='background:#2E2E2E; padding:12px; border-radius:8px; margin-bottom:8px;'>"
-        f"<span style='font-size:16px; color:white;'>현재 사용 병상</span><br>"
-        f"<span style='font-size:28px; color:{current_color};'>{current_used:,}</span>"
-        f"<span style='font-size:14px; color:#BBBBBB;'> / {latest['총 병상 수']:,}</span>"
-        f"</div>",
-        unsafe_allow_html=True
-    )
-    st.markdown(
-        f"<div style='background:#2E2E2E; padding:12px; border-radius:8px;'>"
-        f"<span style='font-size:16px; color:white;'>다음 달 예측 병상</span><br>"
-        f"<span style='font-size:28px; color:{pred_color};'>{predicted_used:,}</span>"
-        f"<span style='font-size:14px; color:#BBBBBB;'> / {latest['총 병상 수']:,}</span>"
-        f"</div>",
-        unsafe_allow_html=True
-    )
-    st.markdown("</div>", unsafe_allow_html=True)
-
-# 상단 부분 끝
-st.markdown("<hr style='border:1px solid gray;'>", unsafe_allow_html=True)
+def get_engine(url=None, pool_size=5, max_overflow=10, pool_recycle=1800):
+    """
+    접속 URL별 풀 엔진을 한 번만 만들어 공유합니다.
+    - 메모리 SQLite처럼 커넥션 풀 크기를 지정할 수 없는 URL은 풀 옵션 없이 생성
+    """
+    url = url or database_url()
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            parsed = make_url(url)
+            options = {"pool_pre_ping": True}
+            if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+                options.update(pool_size=pool_size, max_overflow=max_overflow, pool_recycle=pool_recycle)
+            engine = _engines[url] = create_engine(url, **options)
+        return engine
+
+
+def to_ym(value):
+    """
+    '2023-01', '202301', Timestamp 등을 DB의 'YYYYMM' 형식으로 변환합니다.
+    """
+    return normalize_year_month(value).replace("-", "")
 
-# ----------------------------------------
-# 8) 하단: 의료진 피로도 버블맵 + 호흡기 질환 상태(탭)
-# ----------------------------------------
-col4, col5 = st.columns([1, 1])
 
-# ■ 좌측(Col4): 의료진 피로도 버블맵
-with col4:
-    st.markdown("<h4 style='color:white;'>의료진 피로도 버블 맵</h4>", unsafe_allow_html=True)
+class DustDB:
+    """
+    미세먼지·호흡기 질환 DB 조회 클래스
+    - 예) db = DustDB(); db.load_table("pm10_asthma_fact", start="202301", end="202312", regions=["서울특별시"])
+    - cache: True(프로세스 공용 캐시), False/None(캐시 사용 안 함), 또는 QueryCache 인스턴스
+    """
 
-    bubble_df = (
-        df[df["월"].str.startswith(selected_year)]
-        .groupby("지역")["의료진 피로도"]
-        .mean()
-        .reset_index()
-    )
-    # 대략적인 위도/경도 매핑
-    coords = {
-        "서울": (37.57, 126.98),
-        "부산": (35.18, 129.07),
-        "대구": (35.87, 128.60),
-        "광주": (35.16, 126.85),
-        "대전": (36.35, 127.38),
-        "울산": (35.54, 129.31)
-    }
-    bubble_df["lat"] = bubble_df["지역"].map(lambda x: coords[x][0])
-    bubble_df["lon"] = bubble_df["지역"].map(lambda x: coords[x][1])
-
-    fig_bubble = px.scatter_mapbox(
-        bubble_df,
-        lat="lat", lon="lon",
-        size="의료진 피로도",
-        color="의료진 피로도",
-        color_continuous_scale="OrRd",
-        size_max=40,
-        zoom=5.5,
-        mapbox_style="carto-positron",
-        hover_name="지역",
-        title=""  # 제목은 위에서 처리했으므로 빈 문자열
-    )
-    fig_bubble.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font_color="white",
-        margin=dict(t=0, b=0, l=0, r=0),
-        mapbox=dict(
-            bearing=0,
-            pitch=0,
-            style="carto-positron",
-            center=dict(lat=36.5, lon=127.8),
-            zoom=5.5
-        )
-    )
-    st.plotly_chart(fig_bubble, use_container_width=True, height=350)
-
-# ■ 우측(Col5): 호흡기 환자 질환 상태 + 연령·진단·중증도별 탭
-with col5:
-    st.markdown("<h4 style='color:white;'>호흡기 환자 질환 상태</h4>", unsafe_allow_html=True)
-    tabs = st.tabs(["연령대별", "진단별", "중증도별"])
-
-    # 예시용 랜덤 데이터 세팅 (필요 시 실제 DB/CSV에서 가져오세요)
-    age_groups = ["0-9세", "10-19세", "20-39세", "40-59세", "60세 이상"]
-    diagnoses = ["천식", "폐렴", "COPD"]
-    severities = ["경증", "중등도", "중증"]
-
-    # 탭1: 연령대별 환자 수 막대차트
-    with tabs[0]:
-        st.markdown("**연령대별 환자 수**", unsafe_allow_html=True)
-        age_counts = [np.random.randint(3, 30) for _ in age_groups]
-        df_age = pd.DataFrame({"연령대": age_groups, "환자 수": age_counts})
-        fig_age = px.bar(
-            df_age,
-            x="연령대", y="환자 수",
-            color="연령대",
-            color_discrete_sequence=px.colors.qualitative.Vivid
+    def __init__(self, url=None, pool_size=5, max_overflow=10, pool_recycle=1800, cache=True):
+        self.engine = get_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_recycle=pool_recycle)
+        if cache is True:
+            cache = default_cache()
+        self.cache = cache if isinstance(cache, QueryCache) else None
+
+    def load_generation(self):
+        """
+        현재 적재 세대를 반환합니다 (load_generation 테이블이 없으면 None).
+        """
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(text(
+                    f"SELECT generation FROM {LOAD_GENERATION_TABLE} WHERE id = 1"
+                )).scalar()
+        except DBAPIError:
+            return None
+
+    # ------------------------------------------------------------------
+    # 공용 실행
+    # ------------------------------------------------------------------
+    def query(self, sql, params=None, chunksize=None, cache=True):
+        """
+        SQL을 실행해 DataFrame을 반환합니다.
+        - sql: 문자열 또는 sqlalchemy text() 객체 (리스트 파라미터는 expanding bindparam으로 선언)
+        - chunksize: 지정하면 stream_results로 chunk 단위 DataFrame 이터레이터를 반환 (캐시하지 않음)
+        - cache: False면 이번 조회만 캐시를 건너뜀
+        """
+        stmt = text(sql) if isinstance(sql, str) else sql
+        if chunksize:
+            return self._stream(stmt, params or {}, chunksize)
+        if self.cache is None or not cache:
+            return self._read(stmt, params)
+
+        key = make_key(self.engine.url, stmt, params, self.load_generation())
+        df = self.cache.get(key)
+        if df is None:
+            df = self.cache.put(key, self._read(stmt, params))
+        return df
+
+    def _read(self, stmt, params):
+        with self.engine.connect() as conn:
+            return pd.read_sql(stmt, conn, params=params or {})
+
+    def _stream(self, stmt, params, chunksize):
+        # 이터레이션이 끝날 때까지 커넥션을 유지
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+            yield from pd.read_sql(stmt, conn, params=params, chunksize=chunksize)
+
+    # ------------------------------------------------------------------
+    # 사실 테이블 조회
+    # ------------------------------------------------------------------
+    def build_query(self, table, start=None, end=None, regions=None, genders=None,
+                    age_groups=None, columns=None):
+        """
+        load_table()이 실행할 (text 객체, 파라미터)를 만듭니다.
+        """
+        if table not in TABLES:
+            raise KeyError(f"Unknown fact table: {table} (available: {list(TABLES)})")
+        spec = TABLES[table]
+        available = spec["columns"]
+        columns = list(columns or available)
+        unknown = [c for c in columns if c not in available]
+        if unknown:
+            raise KeyError(f"{table}: unknown column(s) {unknown} (available: {list(available)})")
+
+        where, params, expanding = [], {}, []
+        if start is not None:
+            where.append(f"{spec['month']} >= :start")
+            params["start"] = to_ym(start)
+        if end is not None:
+            where.append(f"{spec['month']} <= :end")
+            params["end"] = to_ym(end)
+        for name, values, expr in (
+            ("regions",    regions,    "r.region_name"),
+            ("genders",    genders,    available.get("gender")),
+            ("age_groups", age_groups, available.get("age_group")),
+        ):
+            if values is None:
+                continue
+            if expr is None:
+                raise ValueError(f"{table} has no column to filter by {name}")
+            values = [values] if isinstance(values, (str, int)) else list(values)
+            where.append(f"{expr} IN :{name}")
+            params[name] = [int(v) for v in values] if name == "age_groups" else values
+            expanding.append(name)
+
+        select = ", ".join(f"{available[c]} AS {c}" for c in columns)
+        sql = (
+            f"SELECT {select} FROM {table} f "
+            "JOIN region_dim r ON r.region_id = f.region_id"
         )
-        fig_age.update_layout(
-            showlegend=False,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font_color="white",
-            xaxis=dict(tickfont=dict(color="white")),
-            yaxis=dict(tickfont=dict(color="white"))
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {spec['month']}, f.region_id"
+
+        stmt = text(sql)
+        if expanding:
+            stmt = stmt.bindparams(*(bindparam(n, expanding=True) for n in expanding))
+        return stmt, params
+
+    def load_table(self, table, start=None, end=None, regions=None, genders=None,
+                   age_groups=None, columns=None, chunksize=None):
+        """
+        사실 테이블을 조건에 맞게 조회합니다 (필터는 모두 DB에서 처리).
+        - start, end: 'YYYYMM' / 'YYYY-MM' 등 (양 끝 포함)
+        - regions, genders, age_groups: 값 하나 또는 리스트
+        - columns: 반환할 컬럼 (기본: 전체)
+        - chunksize: 지정하면 DataFrame chunk 이터레이터 반환
+        """
+        stmt, params = self.build_query(table, start, end, regions, genders, age_groups, columns)
+        return self.query(stmt, params, chunksize=chunksize)
+
+    def load_by_region(self, table_name, region_name, start=None, end=None, **kwargs):
+        """
+        지역 하나의 데이터를 조회합니다 (load_table의 regions 필터).
+        """
+        return self.load_table(table_name, start=start, end=end, regions=[region_name], **kwargs)
+
+    def stream_table(self, table, chunksize=50000, **filters):
+        """
+        큰 추출을 chunk 단위로 나눠 받습니다 (load_table(..., chunksize=...)와 같음).
+        """
+        return self.load_table(table, chunksize=chunksize, **filters)
+
+    def load_rollup(self, name, pollutant="pm10", start=None, end=None, regions=None,
+                    age_groups=None, seasons=None, columns=None):
+        """
+        롤업 테이블을 조회합니다 (PM 농도와 질환별 진료 건수가 미리 결합된 행).
+        - name: 'month_region', 'month_national', 'month_region_age', 'season_region'
+        - pollutant: 'pm10' 또는 'pm25'
+        - start, end: 월 범위 (월 단위 롤업만), regions / age_groups / seasons: 값 하나 또는 리스트
+        """
+        if name not in ROLLUPS:
+            raise KeyError(f"Unknown rollup: {name} (available: {list(ROLLUPS)})")
+        keys = ROLLUPS[name]
+        exprs = {k: ("r.region_name" if k == "region" else f"t.{k}") for k in keys}
+        exprs.update({v: f"t.{v}" for v in _ROLLUP_VALUES})
+        columns = list(columns or exprs)
+        unknown = [c for c in columns if c not in exprs]
+        if unknown:
+            raise KeyError(f"rollup_{name}: unknown column(s) {unknown} (available: {list(exprs)})")
+
+        where, params, expanding = ["t.pollutant = :pollutant"], {"pollutant": pollutant}, []
+        for bound, value, op in (("start", start, ">="), ("end", end, "<=")):
+            if value is None:
+                continue
+            if "ym" not in keys:
+                raise ValueError(f"rollup_{name} has no month column")
+            where.append(f"t.ym {op} :{bound}")
+            params[bound] = to_ym(value)
+        for param, values, key in (("regions", regions, "region"), ("age_groups", age_groups, "age_group"),
+                                   ("seasons", seasons, "season")):
+            if values is None:
+                continue
+            if key not in keys:
+                raise ValueError(f"rollup_{name} has no column to filter by {param}")
+            values = [values] if isinstance(values, (str, int)) else list(values)
+            where.append(f"{exprs[key]} IN :{param}")
+            params[param] = [int(v) for v in values] if param == "age_groups" else values
+            expanding.append(param)
+
+        join = " JOIN region_dim r ON r.region_id = t.region_id" if "region" in keys else ""
+        order = ", ".join(("t.region_id" if k == "region" else f"t.{k}") for k in keys if not k.startswith("n_"))
+        sql = (
+            f"SELECT {', '.join(f'{exprs[c]} AS {c}' for c in columns)} FROM rollup_{name} t{join} "
+            f"WHERE {' AND '.join(where)} ORDER BY {order}"
         )
-        st.plotly_chart(fig_age, use_container_width=True, height=250)
-
-    # 탭2: 진단별 환자 수 파이차트
-    with tabs[1]:
-        st.markdown("**진단별 환자 수**", unsafe_allow_html=True)
-        diag_counts = [np.random.randint(5, 40) for _ in diagnoses]
-        df_diag = pd.DataFrame({"진단": diagnoses, "환자 수": diag_counts})
-        fig_diag = px.pie(
-            df_diag,
-            names="진단", values="환자 수",
-            color_discrete_sequence=px.colors.sequential.Plasma_r
+        stmt = text(sql)
+        if expanding:
+            stmt = stmt.bindparams(*(bindparam(n, expanding=True) for n in expanding))
+        return self.query(stmt, params)
+
+    # ------------------------------------------------------------------
+    # 메타 정보
+    # ------------------------------------------------------------------
+    def get_regions(self, table):
+        """
+        테이블에 존재하는 고유 지역 이름 리스트를 반환합니다.
+        """
+        if table not in TABLES:
+            raise KeyError(f"Unknown fact table: {table} (available: {list(TABLES)})")
+        df = self.query(
+            "SELECT r.region_name FROM region_dim r "
+            f"WHERE EXISTS (SELECT 1 FROM {table} f WHERE f.region_id = r.region_id) "
+            "ORDER BY r.region_name"
         )
-        fig_diag.update_traces(textposition="inside", textinfo="percent+label")
-        fig_diag.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font_color="white"
-        )
-        st.plotly_chart(fig_diag, use_container_width=True, height=250)
-
-    # 탭3: 중증도별 환자 수 막대차트
-    with tabs[2]:
-        st.markdown("**중증도별 환자 수**", unsafe_allow_html=True)
-        sev_counts = [np.random.randint(1, 25) for _ in severities]
-        df_sev = pd.DataFrame({"중증도": severities, "환자 수": sev_counts})
-        fig_sev = px.bar(
-            df_sev,
-            x="중증도", y="환자 수",
-            color="중증도",
-            color_discrete_sequence=["#2ECC40", "#FF851B", "#FF4136"]
-        )
-        fig_sev.update_layout(
-            showlegend=False,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font_color="white",
-            xaxis=dict(tickfont=dict(color="white")),
-            yaxis=dict(tickfont=dict(color="white"))
-        )
-        st.plotly_chart(fig_sev, use_container_width=True, height=250)
-
-# 맨 아래에는 더 보여줄 내용이 없으므로 여백 남겨 놓습니다.
-st.markdown("", unsafe_allow_html=True)
\ No newline at end of file
+        return df["region_name"].tolist()
+
+    def get_month_range(self, table):
+        """
+        테이블의 (첫 달, 마지막 달)을 'YYYYMM' 문자열로 반환합니다.
+        """
+        if table not in TABLES:
+            raise KeyError(f"Unknown fact table: {table} (available: {list(TABLES)})")
+        month = TABLES[table]["month"]
+        row = self.query(f"SELECT MIN({month}) AS first_ym, MAX({month}) AS last_ym FROM {table} f").iloc[0]
+        return row["first_ym"], row["last_ym"]
+
+    def load_dimension(self, table):
+        """
+        차원 테이블(date_dim, age_group_dim, region_dim) 전체를 반환합니다.
+        """
+        if table not in DIMENSION_TABLES:
+            raise KeyError(f"Unknown dimension table: {table} (available: {DIMENSION_TABLES})")
+        return self.query(f"SELECT * FROM {table}")
+
+    def close(self):
+        """
+        공유 엔진의 커넥션 풀을 정리합니다.
+        """
+        self.engine.dispose()
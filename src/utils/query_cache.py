@@ -0,0 +1,178 @@
+# src/utils/query_cache.py
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+"""
+DustDB 조회 결과 캐시
+- 키: 접속 URL + 정규화된 SQL(공백 정리) + 파라미터 + 적재 세대(load generation)
+- 1단계: 프로세스 메모리 LRU (DB_QUERY_CACHE_MAX_MB, 기본 256MB)
+- 2단계(선택): DB_QUERY_CACHE_DIR 아래 Parquet 파일 — 프로세스 재시작/여러 Streamlit 워커 간 공유
+- TTL(DB_QUERY_CACHE_TTL, 기본 600초)이 지나면 다시 조회
+- init_database.py가 적재를 마칠 때마다 load_generation 테이블의 세대를 올리므로,
+  세대가 바뀐 뒤에는 이전 결과가 키에서 자동으로 제외됨 (오래된 결과가 반환되지 않음)
+"""
+
+DEFAULT_TTL = float(os.getenv("DB_QUERY_CACHE_TTL", "600"))
+DEFAULT_MAX_BYTES = int(os.getenv("DB_QUERY_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# pyarrow가 없으면 디스크 단계는 사용하지 않음
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+
+def normalize_sql(sql):
+    """
+    공백/줄바꿈 차이만 있는 SQL이 같은 키가 되도록 정리합니다.
+    """
+    return " ".join(str(sql).split())
+
+
+def make_key(url, sql, params=None, generation=None):
+    """
+    캐시 키(sha1 hex)를 만듭니다.
+    """
+    payload = json.dumps(
+        [str(url), normalize_sql(sql), params or {}, generation],
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _share(df):
+    # Copy-on-Write(pandas 3 기본)면 얕은 복사로 충분, 아니면 깊은 복사
+    cow = int(pd.__version__.split(".")[0]) >= 3 or pd.options.mode.copy_on_write is True
+    return df.copy(deep=not cow)
+
+
+class QueryCache:
+    """
+    메모리 LRU + 선택적 Parquet 디스크 단계 + TTL을 가진 조회 결과 캐시
+    - ttl: 초 단위 유효 시간 (None이면 만료 없음, 세대 변경으로만 무효화)
+    - max_bytes: 메모리 단계 상한
+    - disk_dir: 지정하면 Parquet 디스크 단계 사용
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir and _HAS_PYARROW else None
+        self._entries = OrderedDict()   # key -> (저장 시각, DataFrame, 바이트)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _disk_path(self, key):
+        return self.disk_dir / f"{key}.parquet"
+
+    def get(self, key):
+        """
+        캐시된 DataFrame 사본을 반환합니다 (없거나 만료됐으면 None).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, df, size = entry
+                if not self._expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _share(df)
+                del self._entries[key]
+                self._bytes -= size
+
+        df = self._read_disk(key)
+        with self._lock:
+            if df is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._put_memory(key, df, time.time())
+        return _share(df)
+
+    def put(self, key, df):
+        """
+        결과를 메모리(와 디스크) 단계에 저장하고, 호출자에게 넘길 사본을 반환합니다.
+        """
+        stored_at = time.time()
+        self._put_memory(key, df, stored_at)
+        self._write_disk(key, df)
+        return _share(df)
+
+    def _put_memory(self, key, df, stored_at):
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (stored_at, df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def _read_disk(self, key):
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            if self._expired(path.stat().st_mtime):
+                path.unlink(missing_ok=True)
+                return None
+            return pd.read_parquet(path)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, df):
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp = self.disk_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        except (OSError, ValueError, TypeError):
+            # 컬럼 타입이 섞여 Parquet로 쓸 수 없는 결과는 메모리 단계에만 보관
+            tmp.unlink(missing_ok=True)
+
+    def clear(self):
+        """
+        메모리와 디스크 단계를 모두 비웁니다.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.disk_dir is not None and self.disk_dir.exists():
+            for path in self.disk_dir.glob("*.parquet"):
+                path.unlink(missing_ok=True)
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """
+    프로세스 공용 QueryCache (DB_QUERY_CACHE_DIR가 있으면 디스크 단계 사용)
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = QueryCache(disk_dir=os.getenv("DB_QUERY_CACHE_DIR") or None)
+        return _default_cache
@@ -9,11 +9,12 @@ sys.path.insert(0, str(BASE_DIR))
 
 import pandas as pd
 from scripts.data_loader import load_data
+from src.analysis.coefficients import load_coefficients
+from src.modeling.forecast import load_forecasts
 
 import streamlit as st
 import plotly.express as px
 import matplotlib.pyplot as plt
-import statsmodels.formula.api as smf
 import json
 import re
 
@@ -23,7 +24,7 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 # 데이터 로드
-asthma_df = load_data('pm10_asthma_processed_v1', section='processed')
+asthma_df = load_data('pm10_asthma_processed_v1', section='processed', compact=True)
 pm10_wide  = load_data('pm10_processed_v1', section='processed')
 
 
@@ -34,30 +35,24 @@ pm10_monthly_avg = pm10_long.groupby('year_month', as_index=False)['pm10'].mean(
 # 3) 지역·월별 진료 건수 합계
 visit_monthly = (
     asthma_df
-    .groupby(['year_month','region'], as_index=False)['visit_count']
+    .groupby(['year_month','region'], as_index=False, observed=True)['visit_count']
     .sum()
 )
 
-# 4) 두 개 합치기
-df = visit_monthly.merge(pm10_long, on=['year_month','region'], how='left')
-
-# 5) 지역별 기울기 계산
-slopes = {}
-for region, sub in df.groupby('region'):
-    if len(sub) < 10:
-        continue
-    m = smf.ols('visit_count ~ pm10', data=sub).fit()
-    slopes[region] = m.params['pm10']
-
-slopes_df = pd.DataFrame({
-    'region': list(slopes.keys()),
-    'coef':   list(slopes.values())
-})
-
-# 6) 대시보드 헤더
+# 4) 지역별 기울기 (ETL 후 미리 계산된 회귀 계수 저장소에서 조회)
+try:
+    slopes_df = (
+        load_coefficients('pm10', 'asthma', lag=0)[['region', 'slope']]
+        .rename(columns={'slope': 'coef'})
+    )
+except FileNotFoundError:
+    st.info("회귀 계수 저장소가 없습니다. `python src/analysis/coefficients.py`를 실행해 계수를 계산하세요.")
+    st.stop()
+
+# 5) 대시보드 헤더
 st.title("PM10 ↔ 천식 진료 건수 대시보드")
 
-# 7) 월별 시계열 차트
+# 6) 월별 시계열 차트
 ts = (
     visit_monthly
     .groupby('year_month', as_index=False)['visit_count']
@@ -69,7 +64,7 @@ fig1 = px.line(ts, x='year_month', y='값', color='지표')
 st.subheader("전국 월별 진료 건수 vs PM10")
 st.plotly_chart(fig1, use_container_width=True)
 
-# 8) 계절별 산점도
+# 7) 계절별 산점도
 eda_df = asthma_df.merge(
     pd.read_excel(BASE_DIR/'data'/'reference'/'reference_date_mapping.xlsx')
       .assign(date_id=lambda d: d.date_id.astype(str))
@@ -86,7 +81,7 @@ fig2 = px.scatter(sub, x='pm10', y='visit_count', trendline='ols',
 st.subheader(f"{season} 계절 산점도 및 회귀선")
 st.plotly_chart(fig2, use_container_width=True)
 
-# 9) 지도 기반 시각화
+# 8) 지도 기반 시각화
 with open(BASE_DIR/'data'/'geo'/'skorea_municipalities_geo.json', encoding='utf-8') as f:
     geo  = json.load(f)
 
@@ -113,4 +108,22 @@ fig3 = px.choropleth_mapbox(
     color_continuous_scale='Viridis',
     labels={'coef':'기울기(β)'}
 )
-st.plotly_chart(fig3, use_container_width=True)
\ No newline at end of file
+st.plotly_chart(fig3, use_container_width=True)
+
+# 9) 지역별 향후 12개월 진료 건수 예측 (src/modeling/forecast.py가 미리 계산한 결과를 읽기만 함)
+try:
+    forecast_df = load_forecasts('pm10', 'asthma')
+except FileNotFoundError:
+    st.info("예측 결과가 없습니다. `python src/modeling/forecast.py`를 실행해 예측을 계산하세요.")
+    st.stop()
+st.subheader("지역별 향후 12개월 진료 건수 예측 (PM10 시나리오별)")
+forecast_region = st.selectbox("예측 지역 선택", sorted(forecast_df['region'].unique()))
+region_forecast = forecast_df[forecast_df['region'] == forecast_region]
+fig4 = px.line(region_forecast, x='year_month', y='forecast', color='scenario',
+               labels={'year_month':'월', 'forecast':'예측 진료 건수', 'scenario':'시나리오'})
+st.plotly_chart(fig4, use_container_width=True)
+st.dataframe(
+    region_forecast[region_forecast['scenario'] == 'baseline']
+    [['year_month', 'level', 'forecast', 'lower', 'upper']]
+    .rename(columns={'year_month':'월', 'level':'PM10(가정)', 'forecast':'예측값', 'lower':'하한', 'upper':'상한'})
+)
@@ -3,7 +3,15 @@ import pandas as pd
 import numpy as np
 import json
 import plotly.express as px
-from sklearn.linear_model import LinearRegression
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR))
+
+from src.analysis.dashboard_panel import load_panel, grade_breakdown
+from src.modeling.scenarios import ScenarioGrid, capacity_plan, DEFAULT_AXES
 
 # ----------------------------------------
 # 1) 페이지 설정: 가장 최상단에 딱 한 번만 호출해야 합니다.
@@ -63,60 +71,59 @@ def pm_color(value, pollutant='pm10'):
 
 
 # ----------------------------------------
-# 3) 데이터 생성 함수 (월별 환자 수가 100명대 스케일)
+# 3) 데이터 로드: 전처리 결과로 미리 만든 지역 × 월 패널 (src/analysis/dashboard_panel.py)
+#    - 환자 수 = 천식 + 비염 진료 건수, PM10/PM2.5 = 월평균 농도
+#    - 연령대·진단별 분해표도 함께 저장되어 있어 화면마다 다시 계산하지 않음
 # ----------------------------------------
 @st.cache_data
-def generate_data():
-    np.random.seed(42)
-    months = pd.date_range("2023-06-01", periods=12, freq="M")
-    regions = ["서울", "부산", "대구", "광주", "대전", "울산"]
-    data = []
-    for region in regions:
-        for month in months:
-            # PM/온도/의료인력 등 랜덤 생성
-            pm10 = np.random.randint(10, 80)      # 10~79
-            pm25 = np.random.randint(5, 50)       # 5~49
-            temp = np.random.uniform(0, 25)       # 0~25도
-            nurses = np.random.randint(30, 100)   # 30~99명
-            doctors = np.random.randint(15, 60)   # 15~59명
-            beds_total = np.random.randint(200, 400)  # 전체 병상 200~399
-            # 환자 수: PM*1.5 + PM2.5*2 + (25-temp)*2 + 노이즈
-            patients = int(pm10 * 1.5 + pm25 * 2 + (25 - temp) * 2 + np.random.normal(0, 10))
-            patients = max(patients, 0)  # 음수 방지
-            # 남은 병상 = 전체 - 사용(=랜덤으로 50~100명 차감)
-            used_beds = np.random.randint(50, 100)
-            beds_left = max(beds_total - used_beds, 0)
-            fatigue = np.random.randint(30, 80)  # 피로도 30~79
-            data.append({
-                "지역": region,
-                "월": month.strftime("%Y-%m"),
-                "date": month,
-                "PM10": pm10,
-                "PM2.5": pm25,
-                "평균기온": round(temp, 1),
-                "환자 수": patients,
-                "총 병상 수": beds_total,
-                "남은 병상 수": beds_left,
-                "간호사 수": nurses,
-                "의사 수": doctors,
-                "의료진 피로도": fatigue
-            })
-    return pd.DataFrame(data)
-
-df = generate_data()
+def load_dashboard_data():
+    panel, breakdown = load_panel()
+    df = panel.rename(columns={
+        "region": "지역", "year_month": "월", "pm10": "PM10", "pm25": "PM2.5", "visit_count": "환자 수"
+    })
+    df["date"] = pd.to_datetime(df["월"] + "-01")
+    return df, breakdown
+
+try:
+    df, breakdown = load_dashboard_data()
+except FileNotFoundError:
+    st.info("대시보드 패널이 없습니다. `python src/analysis/dashboard_panel.py`를 실행해 패널을 만드세요.")
+    st.stop()
+
+# 지역 × 연도별 선형모형의 PM10 × PM2.5 응답 곡면 (데이터가 바뀔 때만 다시 계산)
+# → 슬라이더를 움직이면 모형을 다시 적합하지 않고 곡면에서 값만 조회
+# (전처리 데이터에 기온이 없으므로 입력 변수는 PM10, PM2.5 두 가지)
+FEATURES = ["PM10", "PM2.5"]
+
+@st.cache_resource
+def get_scenario_grid():
+    frame, _ = load_dashboard_data()
+    frame = frame.dropna(subset=FEATURES).assign(연도=lambda d: d["월"].str[:4])
+    axes = {f: DEFAULT_AXES[f] for f in FEATURES}
+    return ScenarioGrid.fit(frame, FEATURES, "환자 수", by=["지역", "연도"], axes=axes)
+
+scenario_grid = get_scenario_grid()
 
 # ----------------------------------------
 # 4) 사이드바: 연도, 지역, 예측용 슬라이더
 # ----------------------------------------
 st.sidebar.header("조건 선택")
-years = sorted(df["월"].str[:4].unique())
-selected_year = st.sidebar.selectbox("년도 선택", years, index=0)
-selected_region = st.sidebar.selectbox("지역 선택", sorted(df["지역"].unique()), index=0)
+# 예측 모형이 있는(PM10·PM2.5가 모두 관측된) 연도·지역만 선택
+years = sorted(scenario_grid.keys["연도"].unique())
+selected_year = st.sidebar.selectbox("년도 선택", years, index=len(years) - 1)
+year_regions = sorted(scenario_grid.keys.loc[scenario_grid.keys["연도"] == selected_year, "지역"])
+selected_region = st.sidebar.selectbox("지역 선택", year_regions, index=0)
 
 # 예측 입력값(슬라이더)
 input_pm10 = st.sidebar.slider("예상 PM10", min_value=0, max_value=150, value=50)
 input_pm25 = st.sidebar.slider("예상 PM2.5", min_value=0, max_value=80, value=30)
-input_temp = st.sidebar.slider("예상 평균기온(°C)", min_value=-5.0, max_value=35.0, value=18.0)
+
+# 병상·의료진 현황은 전처리 데이터에 없으므로 직접 입력
+st.sidebar.header("병상 & 의료진 현황")
+beds_total = st.sidebar.number_input("총 병상 수", min_value=1, value=300, step=10)
+beds_used = st.sidebar.number_input("현재 사용 병상 수", min_value=0, max_value=int(beds_total), value=min(200, int(beds_total)), step=10)
+nurses = st.sidebar.number_input("간호사 수", min_value=0, value=60, step=5)
+doctors = st.sidebar.number_input("의사 수", min_value=0, value=30, step=5)
 
 # ----------------------------------------
 # 5) 제목: 선택된 지역을 중앙 정렬, 흰 글씨 처리
@@ -127,36 +134,25 @@ st.markdown(
 )
 
 # ----------------------------------------
-# 6) 해당 연도·지역 데이터만 필터링 & 선형회귀 모델로 예측
+# 6) 해당 연도·지역 데이터만 필터링 & 응답 곡면에서 예측값 조회
 # ----------------------------------------
 region_df = df[
     (df["지역"] == selected_region) &
     (df["월"].str.startswith(selected_year))
 ].reset_index(drop=True)
 
-# X, y 세팅
-X = region_df[["PM10", "PM2.5", "평균기온"]]
-y = region_df["환자 수"]
-lr_model = LinearRegression().fit(X, y)
-predicted_base = int(lr_model.predict([[input_pm10, input_pm25, input_temp]])[0])
-
-# “가장 최근 월” 복사해서, 슬라이더 입력값으로 교체 + 예측값 대입
-latest = region_df.iloc[-1].copy()
-latest["PM10"] = input_pm10
-latest["PM2.5"] = input_pm25
-latest["평균기온"] = input_temp
-latest["환자 수"] = predicted_base
-# 남은 병상 수도 “예측치 기준으로 간이 보정”
-latest_used = (latest["총 병상 수"] - latest["남은 병상 수"])  # 실제 사용 중인 병상
-# 예측 후 사용 병상을 +5% 정도로 늘린다고 가정
-predicted_used = int(latest_used * 1.05)
-predicted_used = min(predicted_used, latest["총 병상 수"])
-latest["남은 병상 수"] = latest["총 병상 수"] - predicted_used
-
-# 예측값만 붙여 놓을 새로운 DF (실측 데이터 뒤에 한 행 추가)
-pred_row = latest[["지역","월","date","PM10","PM2.5","평균기온","환자 수",
-                   "총 병상 수","남은 병상 수","간호사 수","의사 수","의료진 피로도"]]
-region_with_pred = pd.concat([region_df, pd.DataFrame([pred_row])], ignore_index=True)
+inputs = {"PM10": input_pm10, "PM2.5": input_pm25}
+predicted_base = int(scenario_grid.lookup((selected_region, selected_year), inputs))
+
+# 최근 월 환자 수와 입력한 병상·의료진 현황 → 예측 환자 수에 필요한 병상·의료진 (환자당 비율 유지 가정)
+current = pd.DataFrame([{
+    "환자 수": region_df["환자 수"].iloc[-1],
+    "총 병상 수": beds_total,
+    "남은 병상 수": beds_total - beds_used,
+    "간호사 수": nurses,
+    "의사 수": doctors,
+}])
+predicted_plan = capacity_plan([predicted_base], current).iloc[0]
 
 # ----------------------------------------
 # 7) 상단 레이아웃: 왼쪽(생략) / 중앙(월별 환자 추이+예측) / 오른쪽(병상·의료진 현황)
@@ -164,7 +160,7 @@ region_with_pred = pd.concat([region_df, pd.DataFrame([pred_row])], ignore_index
 col1, col2, col3 = st.columns([1, 2, 1])
 
 with col1:
-    st.markdown("#### 현재 공기질 & 날씨")
+    st.markdown("#### 예상 공기질")
     pm10_col = pm_color(input_pm10, 'pm10')
     pm25_col = pm_color(input_pm25, 'pm2.5')
     st.markdown(
@@ -178,15 +174,6 @@ with col1:
         f"align-items:center; justify-content:center; font-size:18px; border:none; border-radius:8px;'>PM2.5<br>{input_pm25}</div>",
         unsafe_allow_html=True
     )
-    # 기온 표시: 연한 회색 배경+검은 글씨, 기준치 벗어나면 짙은 회색+흰 글씨
-    temp_color = 'white' if (input_temp < 0 or input_temp > 28) else 'black'
-    bg_color = '#b0bec5' if (input_temp < 0 or input_temp > 28) else '#424242'
-    st.markdown(
-        f"<div style='background:{bg_color}; color:{temp_color}; width:100px; height:100px; "
-        f"display:flex; align-items:center; justify-content:center; font-size:18px; border:none; "
-        f"border-radius:8px;'>기온(°C)<br>{input_temp:.1f}</div>",
-        unsafe_allow_html=True
-    )
 
 # ■ 중앙: “월별 환자 수 실측(파란 실선) + 예측(노란 점선)” ■
 with col2:
@@ -265,9 +252,9 @@ with col2:
 with col3:
     st.markdown("<h4 style='color:white;'>병상 & 의료진 현황</h4>", unsafe_allow_html=True)
 
-    # 현재 사용 병상 = 총 병상 - 남은 병상, 다음 달 예측 사용 병상 = 총 병상 - 남은 병상(예측)
-    current_used = int(latest["총 병상 수"] - region_df["남은 병상 수"].iloc[-1])
-    predicted_used = int(latest["총 병상 수"] - latest["남은 병상 수"])
+    # 현재 사용 병상 = 입력값, 다음 달 예측 병상 = 예측 환자 수 기준 필요 병상 (총 병상 수로 상한)
+    current_used = int(beds_used)
+    predicted_used = int(min(predicted_plan["필요 병상 수"], beds_total))
 
     # “현재” 병상 사용, “다음 달” 예측 병상 사용을 각각 색상 구분
     current_color = "#00FF7F"   # 연두색
@@ -279,7 +266,7 @@ with col3:
         f"<div style='background:#2E2E2E; padding:12px; border-radius:8px; margin-bottom:8px;'>"
         f"<span style='font-size:16px; color:white;'>현재 사용 병상</span><br>"
         f"<span style='font-size:28px; color:{current_color};'>{current_used:,}</span>"
-        f"<span style='font-size:14px; color:#BBBBBB;'> / {latest['총 병상 수']:,}</span>"
+        f"<span style='font-size:14px; color:#BBBBBB;'> / {beds_total:,}</span>"
         f"</div>",
         unsafe_allow_html=True
     )
@@ -287,95 +274,104 @@ with col3:
         f"<div style='background:#2E2E2E; padding:12px; border-radius:8px;'>"
         f"<span style='font-size:16px; color:white;'>다음 달 예측 병상</span><br>"
         f"<span style='font-size:28px; color:{pred_color};'>{predicted_used:,}</span>"
-        f"<span style='font-size:14px; color:#BBBBBB;'> / {latest['총 병상 수']:,}</span>"
+        f"<span style='font-size:14px; color:#BBBBBB;'> / {beds_total:,}</span>"
+        f"</div>",
+        unsafe_allow_html=True
+    )
+    st.markdown(
+        f"<div style='background:#2E2E2E; padding:12px; border-radius:8px; margin-top:8px;'>"
+        f"<span style='font-size:16px; color:white;'>다음 달 필요 의료진</span><br>"
+        f"<span style='font-size:20px; color:{pred_color};'>간호사 {predicted_plan['필요 간호사 수']:,} · "
+        f"의사 {predicted_plan['필요 의사 수']:,}</span>"
+        f"<span style='font-size:14px; color:#BBBBBB;'> / {nurses:,} · {doctors:,}</span>"
         f"</div>",
         unsafe_allow_html=True
     )
     st.markdown("</div>", unsafe_allow_html=True)
 
+# 시나리오 일괄 평가: PM10만 바꾸고 나머지 입력은 슬라이더 값으로 고정
+with st.expander("PM10 시나리오별 필요 병상·의료진 (최근 월 환자당 비율 기준)"):
+    scenarios = pd.DataFrame({"PM10": np.arange(0, 151, 10)})
+    scenarios["PM2.5"] = input_pm25
+    scenarios["지역"] = selected_region
+    scenarios["연도"] = selected_year
+    plan = capacity_plan(scenario_grid.predict(scenarios), current.loc[[0] * len(scenarios)].reset_index(drop=True))
+    st.dataframe(pd.concat([scenarios[["PM10"]], plan], axis=1).set_index("PM10"), use_container_width=True)
+
 # 상단 부분 끝
 st.markdown("<hr style='border:1px solid gray;'>", unsafe_allow_html=True)
 
 # ----------------------------------------
-# 8) 하단: 의료진 피로도 버블맵 + 호흡기 질환 상태(탭)
+# 8) 하단: 지역별 환자 수 + 호흡기 질환 상태(탭)
 # ----------------------------------------
 col4, col5 = st.columns([1, 1])
 
-# ■ 좌측(Col4): 의료진 피로도 버블맵
-with col4:
-    st.markdown("<h4 style='color:white;'>의료진 피로도 버블 맵</h4>", unsafe_allow_html=True)
+year_df = df[df["월"].str.startswith(selected_year)]
+region_breakdown = breakdown[
+    (breakdown["region"] == selected_region) &
+    (breakdown["year_month"].str.startswith(selected_year))
+]
 
-    bubble_df = (
-        df[df["월"].str.startswith(selected_year)]
-        .groupby("지역")["의료진 피로도"]
-        .mean()
-        .reset_index()
-    )
-    # 대략적인 위도/경도 매핑
-    coords = {
-        "서울": (37.57, 126.98),
-        "부산": (35.18, 129.07),
-        "대구": (35.87, 128.60),
-        "광주": (35.16, 126.85),
-        "대전": (36.35, 127.38),
-        "울산": (35.54, 129.31)
-    }
-    bubble_df["lat"] = bubble_df["지역"].map(lambda x: coords[x][0])
-    bubble_df["lon"] = bubble_df["지역"].map(lambda x: coords[x][1])
-
-    fig_bubble = px.scatter_mapbox(
-        bubble_df,
-        lat="lat", lon="lon",
-        size="의료진 피로도",
-        color="의료진 피로도",
-        color_continuous_scale="OrRd",
-        size_max=40,
-        zoom=5.5,
-        mapbox_style="carto-positron",
-        hover_name="지역",
-        title=""  # 제목은 위에서 처리했으므로 빈 문자열
-    )
-    fig_bubble.update_layout(
+def dark_layout(fig, **kwargs):
+    fig.update_layout(
         paper_bgcolor="rgba(0,0,0,0)",
         plot_bgcolor="rgba(0,0,0,0)",
         font_color="white",
+        **kwargs
+    )
+    return fig
+
+# ■ 좌측(Col4): 선택 연도 지역별 환자 수 상위 20개 (선택 지역 강조)
+with col4:
+    st.markdown(f"<h4 style='color:white;'>{selected_year}년 지역별 환자 수 (상위 20)</h4>", unsafe_allow_html=True)
+
+    region_totals = (
+        year_df.groupby("지역", as_index=False)["환자 수"].sum()
+        .sort_values(["환자 수", "지역"], ascending=[False, True])
+    )
+    top = region_totals.head(20)
+    if selected_region not in set(top["지역"]):
+        top = pd.concat([top, region_totals[region_totals["지역"] == selected_region]])
+    top = top.assign(구분=np.where(top["지역"] == selected_region, "선택 지역", "기타"))
+
+    fig_regions = px.bar(
+        top.iloc[::-1],
+        x="환자 수", y="지역",
+        orientation="h",
+        color="구분",
+        color_discrete_map={"선택 지역": "#FFD700", "기타": "#1E90FF"}
+    )
+    dark_layout(
+        fig_regions,
+        showlegend=False,
         margin=dict(t=0, b=0, l=0, r=0),
-        mapbox=dict(
-            bearing=0,
-            pitch=0,
-            style="carto-positron",
-            center=dict(lat=36.5, lon=127.8),
-            zoom=5.5
-        )
+        xaxis=dict(tickfont=dict(color="white")),
+        yaxis=dict(tickfont=dict(color="white"), title="")
     )
-    st.plotly_chart(fig_bubble, use_container_width=True, height=350)
+    st.plotly_chart(fig_regions, use_container_width=True, height=350)
 
-# ■ 우측(Col5): 호흡기 환자 질환 상태 + 연령·진단·중증도별 탭
+# ■ 우측(Col5): 호흡기 환자 질환 상태 + 연령·진단·대기질 등급별 탭 (선택 지역·연도 합계)
 with col5:
     st.markdown("<h4 style='color:white;'>호흡기 환자 질환 상태</h4>", unsafe_allow_html=True)
-    tabs = st.tabs(["연령대별", "진단별", "중증도별"])
-
-    # 예시용 랜덤 데이터 세팅 (필요 시 실제 DB/CSV에서 가져오세요)
-    age_groups = ["0-9세", "10-19세", "20-39세", "40-59세", "60세 이상"]
-    diagnoses = ["천식", "폐렴", "COPD"]
-    severities = ["경증", "중등도", "중증"]
+    tabs = st.tabs(["연령대별", "진단별", "대기질 등급별"])
 
     # 탭1: 연령대별 환자 수 막대차트
     with tabs[0]:
         st.markdown("**연령대별 환자 수**", unsafe_allow_html=True)
-        age_counts = [np.random.randint(3, 30) for _ in age_groups]
-        df_age = pd.DataFrame({"연령대": age_groups, "환자 수": age_counts})
+        df_age = (
+            region_breakdown[region_breakdown["kind"] == "age"]
+            .groupby("category", as_index=False, sort=False)["visit_count"].sum()
+            .rename(columns={"category": "연령대", "visit_count": "환자 수"})
+        )
         fig_age = px.bar(
             df_age,
             x="연령대", y="환자 수",
             color="연령대",
             color_discrete_sequence=px.colors.qualitative.Vivid
         )
-        fig_age.update_layout(
+        dark_layout(
+            fig_age,
             showlegend=False,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font_color="white",
             xaxis=dict(tickfont=dict(color="white")),
             yaxis=dict(tickfont=dict(color="white"))
         )
@@ -384,41 +380,39 @@ with col5:
     # 탭2: 진단별 환자 수 파이차트
     with tabs[1]:
         st.markdown("**진단별 환자 수**", unsafe_allow_html=True)
-        diag_counts = [np.random.randint(5, 40) for _ in diagnoses]
-        df_diag = pd.DataFrame({"진단": diagnoses, "환자 수": diag_counts})
+        df_diag = (
+            region_breakdown[region_breakdown["kind"] == "diagnosis"]
+            .groupby("category", as_index=False, sort=False)["visit_count"].sum()
+            .rename(columns={"category": "진단", "visit_count": "환자 수"})
+        )
         fig_diag = px.pie(
             df_diag,
             names="진단", values="환자 수",
             color_discrete_sequence=px.colors.sequential.Plasma_r
         )
         fig_diag.update_traces(textposition="inside", textinfo="percent+label")
-        fig_diag.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font_color="white"
-        )
+        dark_layout(fig_diag)
         st.plotly_chart(fig_diag, use_container_width=True, height=250)
 
-    # 탭3: 중증도별 환자 수 막대차트
+    # 탭3: 그 달 PM10 등급별 환자 수 막대차트
     with tabs[2]:
-        st.markdown("**중증도별 환자 수**", unsafe_allow_html=True)
-        sev_counts = [np.random.randint(1, 25) for _ in severities]
-        df_sev = pd.DataFrame({"중증도": severities, "환자 수": sev_counts})
-        fig_sev = px.bar(
-            df_sev,
-            x="중증도", y="환자 수",
-            color="중증도",
-            color_discrete_sequence=["#2ECC40", "#FF851B", "#FF4136"]
+        st.markdown("**월평균 PM10 등급별 환자 수**", unsafe_allow_html=True)
+        df_grade = grade_breakdown(region_df["PM10"], region_df["환자 수"], "pm10").rename(
+            columns={"category": "PM10 등급", "visit_count": "환자 수"}
+        )
+        fig_grade = px.bar(
+            df_grade,
+            x="PM10 등급", y="환자 수",
+            color="PM10 등급",
+            color_discrete_sequence=["#4fc3f7", "#81c784", "#ffd54f", "#e57373", "#b71c1c"]
         )
-        fig_sev.update_layout(
+        dark_layout(
+            fig_grade,
             showlegend=False,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font_color="white",
             xaxis=dict(tickfont=dict(color="white")),
             yaxis=dict(tickfont=dict(color="white"))
         )
-        st.plotly_chart(fig_sev, use_container_width=True, height=250)
+        st.plotly_chart(fig_grade, use_container_width=True, height=250)
 
 # 맨 아래에는 더 보여줄 내용이 없으므로 여백 남겨 놓습니다.
 st.markdown("", unsafe_allow_html=True)
\ No newline at end of file
@@ -7,10 +7,19 @@ import streamlit as st
 import pandas as pd
 import json
 import plotly.express as px
-from prophet import Prophet
 import matplotlib.pyplot as plt
 from streamlit_plotly_events import plotly_events
-import os, requests
+import os, sys, requests
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR))
+
+# 지역별 Prophet 모형은 src/modeling/prophet_models.py가 미리 적합해 모형 저장소에 저장
+# (python src/modeling/prophet_models.py) — 화면에서는 저장된 모형을 불러와 예측만 함
+from src.modeling.prophet_models import load_prophet, prophet_frame, regressor_name
+from scripts.data_loader import load_data as load_dataset
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'Malgun Gothic'
@@ -50,6 +59,9 @@ def load_data():
     )
     # 숫자형 변환
     df_pm10_long['pm10'] = pd.to_numeric(df_pm10_long['pm10'], errors='coerce')
+    # 지역명 매핑 (avg_code -> province_name, ETL과 같은 규칙)
+    map_df = load_dataset('avgcode_map', section='reference')
+    df_pm10_long['region'] = df_pm10_long['region'].replace(dict(zip(map_df['avg_code'], map_df['province_name'])))
 
     # 천식 진료 원본
     df_asthma_raw = pd.read_excel('data/raw/respdisease_asthma_raw_20231231.xlsx')
@@ -103,38 +115,52 @@ st.title(f"한국 {year}년 지역별 평균 미세먼지(PM10)")
 st.write("지도에서 지역 클릭 또는 사이드바에서 선택하세요.")
 st.plotly_chart(fig_map, use_container_width=True)
 
-# 지도 클릭/드롭다운으로 지역 선택
+# 예측 가능한 지역: Prophet 학습 데이터(전처리 PM10 × 천식 패널)에 있는 지역
+@st.cache_data
+def prophet_regions():
+    return sorted(prophet_frame('pm10', 'asthma')['region'].unique())
+
+regions = prophet_regions()
+
+# 지도 클릭/드롭다운으로 지역 선택 (학습 데이터가 없는 지역을 클릭하면 드롭다운 선택 사용)
 sel = plotly_events(fig_map, click_event=True, hover_event=False)
-if sel:
-    region = sel[0]['location']
+clicked = sel[0]['location'] if sel else None
+if clicked in regions:
+    region = clicked
 else:
-    region = st.sidebar.selectbox('지역 선택', sorted(df_pm10['region'].unique()))
+    if clicked is not None:
+        st.sidebar.warning(f"{clicked}: 예측 학습 데이터가 없는 지역입니다.")
+    region = st.sidebar.selectbox('지역 선택', regions)
 st.sidebar.markdown(f"**선택된 지역:** {region}")
 
-# 선택 지역 데이터
-df_r_pm10 = df_pm10[df_pm10['region']==region].sort_values('date')
-df_r_asthma = df_asthma[df_asthma['region']==region].sort_values('date')
-
-# Prophet 학습
-@st.cache_resource
-def train_prophet(df):
-    m = Prophet(interval_width=0.95)
-    m.add_regressor('asthma_cases')
-    m.fit(df)
-    return m
-
-# merge 및 예측
-df_merge = pd.merge(
-    df_r_pm10.rename(columns={'date':'ds','pm10':'y'}),
-    df_r_asthma.rename(columns={'date':'ds','asthma_cases':'asthma_cases'}),
-    on='ds', how='inner'
-)
-model = train_prophet(df_merge)
-future = model.make_future_dataframe(periods=12, freq='M')
-# 외부변수 채우기
-last = df_merge['asthma_cases'].iloc[-1]
-future['asthma_cases'] = last
-forecast = model.predict(future)
+# 저장된 Prophet 모형 불러오기 (화면에서는 적합하지 않음 — 현재 데이터로 적합한 모형이 없으면 안내만 표시)
+@st.cache_resource(show_spinner="Prophet 모형 불러오는 중...")
+def get_prophet(region):
+    return load_prophet(region, 'pm10', 'asthma', fit_missing=False)
+
+lazy, df_merge = get_prophet(region)
+if lazy is None:
+    # 모형이 없다는 결과는 캐시에 남기지 않음 (CLI로 적합한 뒤 새로고침하면 바로 사용)
+    get_prophet.clear()
+    if df_merge.empty:
+        st.warning(f"{region}: Prophet 학습 데이터가 없습니다.")
+    else:
+        st.info(f"{region}: 현재 데이터로 적합한 Prophet 모형이 없습니다. "
+                "`python src/modeling/prophet_models.py`를 실행해 모형을 적합하세요.")
+    st.stop()
+model = lazy.model
+
+# 예측 (모형 버전별로 캐시)
+@st.cache_data
+def predict_prophet(region, version):
+    future = model.make_future_dataframe(periods=12, freq='MS')
+    # 외부변수 채우기: 학습 구간은 실제 값, 미래는 마지막 값
+    cases = regressor_name('asthma')
+    future = future.merge(df_merge[['ds', cases]], on='ds', how='left')
+    future[cases] = future[cases].fillna(df_merge[cases].iloc[-1])
+    return model.predict(future)
+
+forecast = predict_prophet(region, lazy.meta['version'])
 
 # 시계열 플롯 및 테이블
 st.subheader(f"{region} PM10 예측 (향후 12개월)")
@@ -0,0 +1,8 @@
+# tests/conftest.py
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 설정 (pytest를 어디서 실행해도 src, scripts를 import할 수 있도록)
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
@@ -0,0 +1,42 @@
+# tests/test_batch_ols.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modeling.batch_ols import grouped_ols, statsmodels_parity
+
+pytest.importorskip("statsmodels")
+
+"""
+grouped_ols(닫힌 형식 그룹별 OLS)가 그룹별 statsmodels OLS와 같은 값을 내는지 확인
+"""
+
+
+def _grouped_frame(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for region in [f"r{i}" for i in range(20)]:
+        for season in ["봄", "여름", "가을", "겨울"]:
+            n = int(rng.integers(5, 40))
+            # 큰 평균값(농도·진료 건수 규모)으로 자릿수 손실이 없는지도 확인
+            x = rng.uniform(20, 120, n)
+            y = 500 + rng.normal(2.0, 1.0) * x + rng.normal(0, 30, n)
+            rows.append(pd.DataFrame({"region": region, "season": season, "x": x, "y": y}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def test_grouped_ols_matches_statsmodels():
+    frame = _grouped_frame()
+    errors = statsmodels_parity(frame, "x", "y", by=["region", "season"])
+    assert max(errors.values()) < 1e-8, errors
+
+
+def test_small_or_constant_groups_are_nan():
+    frame = pd.DataFrame({
+        "g": ["a", "a", "b", "b", "b"],
+        "x": [1.0, 2.0, 3.0, 3.0, 3.0],
+        "y": [1.0, 2.0, 1.0, 2.0, 3.0],
+    })
+    result = grouped_ols(frame, "x", "y", by="g").set_index("g")
+    assert result["slope"].isna().all()
@@ -0,0 +1,64 @@
+# tests/test_scenarios.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modeling.scenarios import ScenarioGrid, fit_grouped_linear
+
+"""
+fit_grouped_linear(그룹별 정규방정식)가 그룹마다 LinearRegression을 적합한 결과와 같은지,
+그룹 키가 결측인 행이 다른 그룹의 계수에 섞이지 않는지 확인
+"""
+
+FEATURES = ["PM10", "PM2.5"]
+
+
+def _scenario_frame(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for region in ["서울", "부산", "대구"]:
+        for age in ["0-5세", "65세 이상"]:
+            n = int(rng.integers(6, 30))
+            pm10 = rng.uniform(10, 150, n)
+            pm25 = rng.uniform(5, 80, n)
+            y = 300 + rng.normal(2.0, 0.5) * pm10 + rng.normal(1.0, 0.5) * pm25 + rng.normal(0, 10, n)
+            rows.append(pd.DataFrame({"지역": region, "연령대": age, "PM10": pm10, "PM2.5": pm25, "환자 수": y}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def _reference(frame, by):
+    sklearn = pytest.importorskip("sklearn.linear_model")
+    coefs = {}
+    for key, sub in frame.groupby(by):
+        model = sklearn.LinearRegression().fit(sub[FEATURES], sub["환자 수"])
+        coefs[key if isinstance(key, tuple) else (key,)] = np.r_[model.intercept_, model.coef_]
+    return coefs
+
+
+def test_fit_grouped_linear_matches_per_group_fit():
+    frame = _scenario_frame()
+    keys, coefs = fit_grouped_linear(frame, FEATURES, "환자 수", ["지역", "연령대"])
+    expected = _reference(frame, ["지역", "연령대"])
+    assert len(keys) == len(expected)
+    for key, coef in zip(keys.itertuples(index=False, name=None), coefs):
+        np.testing.assert_allclose(coef, expected[key], rtol=1e-8)
+
+
+@pytest.mark.parametrize("column", ["지역", "연령대"])
+def test_missing_group_key_rows_are_dropped(column):
+    frame = _scenario_frame()
+    clean = frame.copy()
+    # 결측 키 행: 값이 매우 커서 어느 그룹에 섞여도 계수가 크게 달라짐
+    missing = frame.iloc[:5].assign(**{column: np.nan, "환자 수": 1e6})
+    frame = pd.concat([frame, missing], ignore_index=True)
+
+    keys, coefs = fit_grouped_linear(frame, FEATURES, "환자 수", ["지역", "연령대"])
+    expected = _reference(clean, ["지역", "연령대"])
+    assert not keys.isna().any().any()
+    assert len(keys) == len(expected)
+    for key, coef in zip(keys.itertuples(index=False, name=None), coefs):
+        np.testing.assert_allclose(coef, expected[key], rtol=1e-8)
+
+    grid = ScenarioGrid.fit(frame, FEATURES, by=["지역", "연령대"])
+    assert grid.surface.shape[0] == len(expected)